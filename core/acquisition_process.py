@@ -0,0 +1,179 @@
+import os
+import sys
+import time
+import queue
+import logging
+import multiprocessing
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from core.config import Config
+from core.shm_ring import ShmRing, ShmRingReader, ShmRingWriter
+from core.uplink_scheduler import UplinkPriority
+
+
+def acquisition_main(ring_name, config, session_dir, commands, stop_event, simulate_rate=None):
+    """Proces akwizycji: port szeregowy, dekodowanie, ProcessData i zapis CSV.
+
+    Przetworzone rekordy trafiają do pierścienia w pamięci współdzielonej.
+    Polecenia do nadajnika (abort, komendy z sieci) przychodzą kolejką
+    commands. Proces kończy się po ustawieniu stop_event.
+    """
+    from PyQt5.QtCore import QCoreApplication
+    from core.utils import Utils
+    from core.csv_handler import CsvHandler
+    from core.process_data import ProcessData
+
+    logging.basicConfig(
+        filename=os.path.join(session_dir, 'acquisition_events.log'),
+        filemode='a',
+        level=logging.DEBUG,
+        format='%(asctime)s %(levelname)-8s [%(threadName)s] %(name)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        force=True
+    )
+    logger = logging.getLogger('HORUS_FAS.acquisition')
+    Utils.session_path = session_dir
+
+    app = QCoreApplication([sys.argv[0]])
+    ring = ShmRing.attach(ring_name)
+    writer = ShmRingWriter(ring)
+
+    csv_handler = CsvHandler(filename='acquisition_data.csv')
+    processor = ProcessData(csv_handler)
+
+    def publish(data):
+        writer.append(time.time(), data)
+
+    processor.processed_data_ready.connect(publish)
+
+    serial_reader = None
+    if simulate_rate:
+        from core.headless import SimulatedRadio
+        radio = SimulatedRadio(simulate_rate)
+        logger.info(f"Simulated radio at {simulate_rate} frames/s")
+    elif config['port']:
+        from core.serial_reader import SerialReader
+        serial_reader = radio = SerialReader(port=config['port'], baudrate=config['baudrate'],
+                                             lora_config=config['lora_config'])
+        serial_reader.transmission_info_received.connect(processor.handle_transmission_info)
+    else:
+        radio = None
+        logger.warning("No serial port configured - acquisition process idle")
+
+    if radio:
+        radio.telemetry_received.connect(processor.handle_telemetry)
+        radio.auxiliary_received.connect(processor.handle_telemetry)
+        if serial_reader:
+            serial_reader.start_reading()
+        else:
+            radio.start()
+
+    def poll():
+        if stop_event.is_set():
+            app.quit()
+            return
+        while True:
+            try:
+                kind, args = commands.get_nowait()
+            except queue.Empty:
+                break
+            if not serial_reader:
+                logger.warning(f"No serial reader - dropping uplink {kind}: {args}")
+            elif kind == 'relay':
+                serial_reader.relay_command(*args)
+            else:
+                serial_reader.send_data(*args)
+
+    timer = QTimer()
+    timer.timeout.connect(poll)
+    timer.start(Config.ACQUISITION_POLL_MS)
+    logger.info(f"Acquisition process {os.getpid()} writing to ring {ring_name} ({ring.capacity} slots)")
+
+    try:
+        app.exec_()
+    finally:
+        if serial_reader:
+            serial_reader.stop_reading()
+        elif radio:
+            radio.stop()
+        csv_handler.close_file()
+        # Po rozłączeniu żaden spóźniony rekord nie trafi do odłączonej pamięci
+        processor.processed_data_ready.disconnect(publish)
+        writer.close()
+        ring.close()
+        logger.info("Acquisition process stopped")
+
+
+class AcquisitionClient(QObject):
+    """Strona GUI procesu akwizycji.
+
+    Tworzy pierścień, uruchamia proces (start 'spawn' - fork procesu z
+    wątkami Qt jest niebezpieczny) i co ACQUISITION_POLL_MS odczytuje
+    nowe rekordy. Odczyt nie blokuje pisarza: gdy GUI nie nadąża,
+    rekordy są nadpisywane, a overrun podaje liczbę pominiętych - w pliku
+    acquisition_data.csv procesu akwizycji są wszystkie. send_data() i
+    relay_command() mają sygnatury SerialReader, więc ścieżki abortu
+    i poleceń z sieci działają bez zmian.
+    """
+    processed_data_ready = pyqtSignal(dict)
+    overrun = pyqtSignal(int)
+    stopped = pyqtSignal(int)
+
+    def __init__(self, config, session_dir, simulate_rate=None, capacity=Config.ACQUISITION_RING_CAPACITY,
+                 max_batch=2000, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.acquisition')
+        self.config = config
+        self.session_dir = session_dir
+        self.simulate_rate = simulate_rate
+        self.max_batch = max_batch
+
+        self.ring = ShmRing.create(capacity)
+        self.reader = ShmRingReader(self.ring)
+        context = multiprocessing.get_context('spawn')
+        self._commands = context.Queue()
+        self._stop_event = context.Event()
+        self.process = context.Process(
+            target=acquisition_main, name="HORUS_FAS-Acquisition",
+            args=(self.ring.name, config, session_dir, self._commands, self._stop_event, simulate_rate))
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.process.start()
+        self.timer.start(Config.ACQUISITION_POLL_MS)
+        self.logger.info(f"Acquisition process started (pid {self.process.pid}, ring {self.ring.name})")
+
+    def poll(self):
+        records, lost = self.reader.read(self.max_batch)
+        if lost:
+            self.logger.warning(f"GUI fell behind acquisition - {lost} records skipped")
+            self.overrun.emit(lost)
+        for _, record in records:
+            self.processed_data_ready.emit(record)
+
+        if not records and not self.process.is_alive():
+            self.timer.stop()
+            self.logger.error(f"Acquisition process exited with code {self.process.exitcode}")
+            self.stopped.emit(self.process.exitcode)
+
+    def send_data(self, data: str, priority=UplinkPriority.COMMAND, coalesce_key=None):
+        self._commands.put(('send', (data, priority, coalesce_key)))
+
+    def relay_command(self, data):
+        self._commands.put(('relay', (data,)))
+
+    def stop_reading(self):
+        if self.ring.shm is None:
+            return
+        self.timer.stop()
+        self._stop_event.set()
+        self.process.join(timeout=3)
+        if self.process.is_alive():
+            self.logger.warning("Acquisition process did not stop - terminating")
+            self.process.terminate()
+            self.process.join(timeout=1)
+        self.ring.close()
+        self.logger.info(f"Acquisition stopped, {self.reader.lost} records skipped by the GUI in total")
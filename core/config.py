@@ -3,4 +3,27 @@ class Config:
     DEFAULT_GPIO_PIN = 14
     DEFAULT_BAUD_RATE = 9600
     DEFAULT_IP_ADDRESS = "192.168.154.1"  # Old value "192.168.236.1"
-    DEFAULT_IP_PORT = 5000
\ No newline at end of file
+    DEFAULT_IP_PORT = 5000
+    DEFAULT_OUTBOX_DRAIN_RATE = 20  # records per second replayed after reconnect
+    DEFAULT_MULTICAST_GROUP = "239.255.42.99"
+    DEFAULT_MULTICAST_PORT = 5007
+    DEFAULT_LORA_CONFIG = {
+        'frequency': '868',
+        'spread_factor': '7',
+        'bandwidth': '125',
+        'txpr': '8',
+        'crc': 'ON',
+    }
+    LORA_DUTY_CYCLE = {'433': 0.10, '868': 0.01}  # ETSI EN 300 220, brak limitu dla 915 MHz
+    LORA_DUTY_CYCLE_WINDOW = 3600  # seconds
+    DEFAULT_MAX_FPS = 30
+    TILE_URL_TEMPLATE = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+    TILE_USER_AGENT = "HORUS-FAS ground station (KNS LiK)"
+    TILE_CACHE_MAX_MB = 512
+    ACQUISITION_RING_CAPACITY = 16384  # records, about 1.8 MB of shared memory
+    ACQUISITION_POLL_MS = 20
+    METRICS_SAMPLE_MS = 1000
+    METRICS_EXPORT_S = 10  # flush of metrics.jsonl in the session directory
+    EVENT_LOOP_PROBE_MS = 100
+    STALL_HEARTBEAT_MS = 50
+    STALL_THRESHOLD_MS = 250  # GUI stack is logged when the event loop is late by more than this
@@ -7,12 +7,12 @@ from core.utils import Utils
 
 
 class CsvHandler:
-    def __init__(self):
+    def __init__(self, filename='telemetry_data.csv'):
         self.logger = logging.getLogger(
             'HORUS_FAS.csv_handler')
         self.session_dir = Utils.session_path
         self.filename = os.path.join(self.session_dir,
-                                     'telemetry_data.csv')
+                                     filename)
         self.file = None
         self.writer = None
         self.header = ['timestamp', 'velocity', 'pitch',
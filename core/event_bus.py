@@ -0,0 +1,271 @@
+import time
+import logging
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+NO_PAYLOAD = type(None)
+
+
+class Topic:
+    """Nazwany kanał zdarzeń z typem ładunku sprawdzanym przy publikacji."""
+
+    def __init__(self, name, payload_type=NO_PAYLOAD):
+        self.name = name
+        self.payload_type = payload_type
+
+    def __repr__(self):
+        return f"Topic({self.name!r})"
+
+
+# Tematy zdarzeń stacji
+PARTNER_CONNECTED = Topic('network.partner_connected')
+PARTNER_DISCONNECTED = Topic('network.partner_disconnected')
+NETWORK_DATA = Topic('network.data', dict)
+BUTTON_HELD = Topic('gpio.button_held')
+SERIAL_TELEMETRY = Topic('serial.telemetry', dict)
+SERIAL_AUXILIARY = Topic('serial.auxiliary', dict)
+SERIAL_TRANSMISSION = Topic('serial.transmission', dict)
+
+
+class RateMeter:
+    """Liczba zdarzeń w ostatniej pełnej sekundzie."""
+
+    def __init__(self):
+        self._second = int(time.monotonic())
+        self._count = 0
+        self._last = 0
+
+    def tick(self, count=1):
+        second = int(time.monotonic())
+        if second != self._second:
+            self._last = self._count if second == self._second + 1 else 0
+            self._second = second
+            self._count = 0
+        self._count += count
+
+    def rate(self):
+        second = int(time.monotonic())
+        if second == self._second:
+            return self._last
+        return self._count if second == self._second + 1 else 0
+
+
+class _QtInvoker(QObject):
+    """Wywołuje funkcje w wątku, w którym obiekt powstał (połączenie kolejkowane Qt)."""
+    call = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.call.connect(self._run)
+
+    def _run(self, function):
+        function()
+
+
+class Subscription:
+    """Subskrybent z własną, ograniczoną kolejką.
+
+    mode='thread' - osobny wątek dostarczania, wolny subskrybent nie
+    spowalnia publikującego ani innych subskrybentów;
+    mode='qt' - dostarczanie w wątku Qt, który subskrybował (np. GUI);
+    mode='sync' - wywołanie w wątku publikującym, jak dawne listy callbacków.
+    Przy batch=True callback dostaje listę wszystkich oczekujących ładunków
+    (najwyżej max_batch). Po przekroczeniu max_backlog najstarsze zdarzenia
+    są odrzucane i liczone w dropped.
+    """
+
+    def __init__(self, bus, topic, callback, mode='thread', max_backlog=1024, batch=False, max_batch=256,
+                 name=None):
+        if mode not in ('thread', 'qt', 'sync'):
+            raise ValueError(f"Unknown delivery mode {mode!r}")
+        self.bus = bus
+        self.topic = topic
+        self.callback = callback
+        self.mode = mode
+        self.batch = batch
+        self.max_batch = max_batch
+        self.max_backlog = max_backlog
+        self.name = name or getattr(callback, '__qualname__', repr(callback))
+
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.lag_max = 0.0
+        self._lag_sum = 0.0
+        self._lag_count = 0
+        self._overflow_logged = 0.0
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self._invoker = None
+        self._drain_scheduled = False
+        if mode == 'thread':
+            self._thread = threading.Thread(target=self._run, daemon=True, name=f"EventBus-{topic.name}")
+            self._thread.start()
+        elif mode == 'qt':
+            self._invoker = _QtInvoker()
+
+    @property
+    def backlog(self):
+        return len(self._queue)
+
+    def push(self, payload, published):
+        if self.mode == 'sync':
+            self._deliver([(payload, published)])
+            return
+
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) >= self.max_backlog:
+                self._queue.popleft()
+                self.dropped += 1
+                self._log_overflow()
+            self._queue.append((payload, published))
+            if self.mode == 'thread':
+                self._condition.notify()
+                return
+            schedule = not self._drain_scheduled
+            self._drain_scheduled = True
+        if schedule:
+            self._invoker.call.emit(self._drain_qt)
+
+    def _take(self):
+        count = min(len(self._queue), self.max_batch if self.batch else 1)
+        return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                items = self._take()
+            self._deliver(items)
+
+    def _drain_qt(self):
+        while True:
+            with self._condition:
+                if not self._queue or self._closed:
+                    self._drain_scheduled = False
+                    return
+                items = self._take()
+            self._deliver(items)
+
+    def _deliver(self, items):
+        now = time.monotonic()
+        for _, published in items:
+            lag = now - published
+            self._lag_sum += lag
+            self._lag_count += 1
+            if lag > self.lag_max:
+                self.lag_max = lag
+        try:
+            if self.batch:
+                self.callback([payload for payload, _ in items])
+            elif self.topic.payload_type is NO_PAYLOAD:
+                self.callback()
+            else:
+                self.callback(items[0][0])
+            self.delivered += len(items)
+        except Exception:
+            self.errors += 1
+            self.bus.logger.exception(f"Subscriber {self.name} of {self.topic.name} failed")
+
+    def _log_overflow(self):
+        now = time.monotonic()
+        if now - self._overflow_logged > 10:
+            self._overflow_logged = now
+            self.bus.logger.warning(f"Subscriber {self.name} of {self.topic.name} is falling behind - "
+                                    f"backlog {self.max_backlog} full, {self.dropped} events dropped so far")
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._condition.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+
+    def metrics(self):
+        return {
+            'name': self.name,
+            'mode': self.mode,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'backlog': self.backlog,
+            'max_backlog': self.max_backlog,
+            'lag_mean_ms': 1000 * self._lag_sum / self._lag_count if self._lag_count else 0.0,
+            'lag_max_ms': 1000 * self.lag_max,
+        }
+
+
+class EventBus:
+    """Magistrala zdarzeń publish/subscribe z routingiem po tematach.
+
+    publish() sprawdza typ ładunku i tylko wrzuca zdarzenie do kolejek
+    subskrybentów, więc wątek publikujący (gniazdo, GPIO, port szeregowy)
+    nie czeka na ich obsługę. metrics() podaje dla każdego tematu liczbę
+    i częstość publikacji oraz zaległości, odrzucenia i opóźnienia
+    dostarczania każdego subskrybenta.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger('HORUS_FAS.event_bus')
+        self._lock = threading.Lock()
+        self._subscriptions = {}  # Topic -> krotka Subscription (podmieniana w całości, publish czyta bez blokady)
+        self._published = {}
+        self._rates = {}
+
+    def subscribe(self, topic, callback, mode='thread', **options):
+        subscription = Subscription(self, topic, callback, mode, **options)
+        with self._lock:
+            self._subscriptions[topic] = self._subscriptions.get(topic, ()) + (subscription,)
+            self._published.setdefault(topic, 0)
+            self._rates.setdefault(topic, RateMeter())
+        self.logger.info(f"Added {subscription.name} as a subscriber to {topic.name} ({mode}).")
+        return subscription
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            subscriptions = self._subscriptions.get(topic, ())
+            removed = [s for s in subscriptions if s.callback == callback]
+            self._subscriptions[topic] = tuple(s for s in subscriptions if s.callback != callback)
+        for subscription in removed:
+            subscription.close()
+        return bool(removed)
+
+    def publish(self, topic, payload=None):
+        if not isinstance(payload, topic.payload_type):
+            raise TypeError(f"{topic.name} expects {topic.payload_type.__name__}, got {type(payload).__name__}")
+        published = time.monotonic()
+        with self._lock:
+            self._published[topic] = self._published.get(topic, 0) + 1
+            self._rates.setdefault(topic, RateMeter()).tick()
+        for subscription in self._subscriptions.get(topic, ()):
+            subscription.push(payload, published)
+
+    def close(self):
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+            self._subscriptions = {}
+        for subscription in subscriptions:
+            subscription.close()
+
+    def metrics(self):
+        with self._lock:
+            topics = list(self._published)
+            return {
+                topic.name: {
+                    'published': self._published[topic],
+                    'rate_per_s': self._rates[topic].rate(),
+                    'subscribers': [s.metrics() for s in self._subscriptions.get(topic, ())],
+                }
+                for topic in topics
+            }
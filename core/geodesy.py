@@ -0,0 +1,154 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# WGS84
+SEMI_MAJOR_AXIS = 6378137.0
+FLATTENING = 1 / 298.257223563
+ECCENTRICITY_SQ = FLATTENING * (2 - FLATTENING)
+SEMI_MINOR_AXIS = SEMI_MAJOR_AXIS * (1 - FLATTENING)
+SECOND_ECCENTRICITY_SQ = ECCENTRICITY_SQ / (1 - ECCENTRICITY_SQ)
+
+
+def geodetic_to_ecef(lat, lon, height=0.0):
+    lat, lon = np.radians(lat), np.radians(lon)
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+    radius = SEMI_MAJOR_AXIS / np.sqrt(1 - ECCENTRICITY_SQ * sin_lat ** 2)
+    x = (radius + height) * cos_lat * np.cos(lon)
+    y = (radius + height) * cos_lat * np.sin(lon)
+    z = (radius * (1 - ECCENTRICITY_SQ) + height) * sin_lat
+    return np.stack(np.broadcast_arrays(x, y, z), axis=-1)
+
+
+def ecef_to_geodetic(ecef):
+    """ECEF -> (lat, lon, h) metodą Bowringa - błąd poniżej milimetra przy powierzchni Ziemi."""
+    x, y, z = ecef[..., 0], ecef[..., 1], ecef[..., 2]
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * SEMI_MAJOR_AXIS, p * SEMI_MINOR_AXIS)
+    lat = np.arctan2(z + SECOND_ECCENTRICITY_SQ * SEMI_MINOR_AXIS * np.sin(theta) ** 3,
+                     p - ECCENTRICITY_SQ * SEMI_MAJOR_AXIS * np.cos(theta) ** 3)
+    lon = np.arctan2(y, x)
+    radius = SEMI_MAJOR_AXIS / np.sqrt(1 - ECCENTRICITY_SQ * np.sin(lat) ** 2)
+    height = p / np.cos(lat) - radius
+    return np.degrees(lat), np.degrees(lon), height
+
+
+class LocalFrame:
+    """Lokalny układ east-north-up o początku na wyrzutni.
+
+    Macierz obrotu i położenie początku w ECEF liczone są raz, więc
+    przeliczenie pozycji to jedno mnożenie macierzy, także dla całych
+    tablic punktów.
+    """
+
+    def __init__(self, lat, lon, height=0.0):
+        self.lat = lat
+        self.lon = lon
+        self.height = height
+        self.origin = geodetic_to_ecef(lat, lon, height)
+
+        sin_lat, cos_lat = math.sin(math.radians(lat)), math.cos(math.radians(lat))
+        sin_lon, cos_lon = math.sin(math.radians(lon)), math.cos(math.radians(lon))
+        self.rotation = np.array([
+            [-sin_lon, cos_lon, 0.0],
+            [-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat],
+            [cos_lat * cos_lon, cos_lat * sin_lon, sin_lat],
+        ])
+
+    def to_enu(self, lat, lon, height=0.0):
+        """Tablica (..., 3) współrzędnych east, north, up w metrach."""
+        return (geodetic_to_ecef(lat, lon, height) - self.origin) @ self.rotation.T
+
+    def to_geodetic(self, east, north, up=0.0):
+        enu = np.stack(np.broadcast_arrays(east, north, up), axis=-1)
+        return ecef_to_geodetic(enu @ self.rotation + self.origin)
+
+    def observe(self, lat, lon, height=0.0):
+        """Wielkości względem wyrzutni: odległość pozioma, azymut, odległość skośna i kąt elewacji."""
+        enu = self.to_enu(lat, lon, height)
+        east, north, up = enu[..., 0], enu[..., 1], enu[..., 2]
+        downrange = np.hypot(east, north)
+        return {
+            'east': east,
+            'north': north,
+            'up': up,
+            'downrange': downrange,
+            'bearing': np.degrees(np.arctan2(east, north)) % 360.0,
+            'slant_range': np.sqrt(downrange ** 2 + up ** 2),
+            'elevation': np.degrees(np.arctan2(up, downrange)),
+        }
+
+
+class LandingPredictor:
+    """Przewiduje punkt lądowania z ostatnich pozycji i prędkości opadania.
+
+    Dryf poziomy to nachylenie prostej dopasowanej metodą najmniejszych
+    kwadratów do pozycji east/north z ostatnich `window` sekund. Sumy
+    regresji są aktualizowane przy dodaniu i usunięciu punktu, więc koszt
+    jednej pozycji jest stały. Prognoza powstaje tylko w fazie opadania.
+    """
+
+    def __init__(self, frame, window=10.0, min_descent_rate=0.5, min_points=3):
+        self.frame = frame
+        self.window = window
+        self.min_descent_rate = min_descent_rate
+        self.min_points = min_points
+        self.clear()
+
+    def clear(self):
+        self._points = deque()
+        self._sums = [0.0] * 6  # t, t², e, t·e, n, t·n
+        self._reference_time = None
+        self.prediction = None
+
+    def _accumulate(self, t, east, north, sign):
+        sums = self._sums
+        sums[0] += sign * t
+        sums[1] += sign * t * t
+        sums[2] += sign * east
+        sums[3] += sign * t * east
+        sums[4] += sign * north
+        sums[5] += sign * t * north
+
+    def drift_velocity(self):
+        """(v_east, v_north) w m/s albo None, gdy za mało punktów."""
+        count = len(self._points)
+        if count < self.min_points:
+            return None
+        sum_t, sum_tt, sum_e, sum_te, sum_n, sum_tn = self._sums
+        denominator = count * sum_tt - sum_t * sum_t
+        if abs(denominator) < 1e-9:
+            return None
+        return (count * sum_te - sum_t * sum_e) / denominator, (count * sum_tn - sum_t * sum_n) / denominator
+
+    def update(self, timestamp, east, north, altitude, vertical_velocity):
+        """Dodaje pozycję, zwraca prognozę {lat, lon, east, north, time_to_landing} albo None."""
+        if self._reference_time is None:
+            self._reference_time = timestamp
+        # Czas względny - sumy kwadratów znaczników epoki traciłyby precyzję
+        t = timestamp - self._reference_time
+        self._points.append((t, east, north))
+        self._accumulate(t, east, north, 1)
+        while self._points and self._points[0][0] < t - self.window:
+            self._accumulate(*self._points.popleft(), -1)
+
+        self.prediction = None
+        drift = self.drift_velocity()
+        if drift is None or vertical_velocity > -self.min_descent_rate or altitude <= 0:
+            return None
+
+        time_to_landing = altitude / -vertical_velocity
+        landing_east = east + drift[0] * time_to_landing
+        landing_north = north + drift[1] * time_to_landing
+        lat, lon, _ = self.frame.to_geodetic(landing_east, landing_north, 0.0)
+        self.prediction = {
+            'latitude': float(lat),
+            'longitude': float(lon),
+            'east': landing_east,
+            'north': landing_north,
+            'range': math.hypot(landing_east, landing_north),
+            'bearing': math.degrees(math.atan2(landing_east, landing_north)) % 360.0,
+            'time_to_landing': time_to_landing,
+        }
+        return self.prediction
@@ -6,14 +6,16 @@ from PyQt5.QtCore import QObject, pyqtSignal
 from gpiozero import Button, GPIODeviceError
 from gpiozero.pins.mock import MockFactory
 
+from core.event_bus import EventBus, BUTTON_HELD
+
 class GpioReader(QObject):
     held = pyqtSignal()
 
 
 
-    def __init__(self, pin_number):
+    def __init__(self, pin_number, bus=None):
         super().__init__()
-        self.button_held_subscribers = []
+        self.bus = bus or EventBus()
 
         self.logger = logging.getLogger("HORUS_FAS.gpio_reader")
 
@@ -32,16 +34,14 @@ class GpioReader(QObject):
 
     def button_held(self):
         self._when_button_held_qt_callback()
-        for subscriber in self.button_held_subscribers:
-            subscriber()
+        self.bus.publish(BUTTON_HELD)
 
     def _when_button_held_qt_callback(self):
         self.logger.debug("Button held event triggered.")
         self.held.emit()
 
-    def subscribe_button_held(self, callback):
-        self.button_held_subscribers.append(callback)
+    def subscribe_button_held(self, callback, mode='thread'):
+        self.bus.subscribe(BUTTON_HELD, callback, mode)
 
     def unsubscribe_button_held(self, callback):
-        if callback in self.button_held_subscribers:
-            self.button_held_subscribers.remove(callback)
\ No newline at end of file
+        self.bus.unsubscribe(BUTTON_HELD, callback)
\ No newline at end of file
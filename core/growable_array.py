@@ -0,0 +1,50 @@
+import numpy as np
+
+
+class GrowableArray:
+    """Append-only NumPy array with amortized O(1) append.
+
+    Capacity doubles when full, and view() returns the filled part of the
+    backing array without copying. Views taken before a resize keep
+    pointing at the old storage.
+    """
+
+    def __init__(self, initial_capacity=1024, dtype=np.float64):
+        self._data = np.zeros(max(int(initial_capacity), 1), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self._grow(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self._size:end] = values
+        self._size = end
+
+    def view(self):
+        view = self._data[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def last(self, default=None):
+        return self._data[self._size - 1] if self._size else default
+
+    def clear(self):
+        self._size = 0
+
+    def _grow(self, required):
+        capacity = len(self._data)
+        while capacity < required:
+            capacity *= 2
+        data = np.zeros(capacity, dtype=self._data.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
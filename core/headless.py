@@ -0,0 +1,247 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import signal
+import logging
+import threading
+from functools import partial
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+
+from core.config import Config
+from core.utils import Utils
+from core.event_bus import EventBus
+from core.metrics import ProcessUsage
+from core.csv_handler import CsvHandler
+from core.process_data import ProcessData
+from core.network_handler import NetworkTransmitter, MulticastPublisher
+from core.outbox import Outbox
+from core.telemetry_forwarder import TelemetryForwarder
+from core.uplink_scheduler import UplinkPriority
+
+
+class SimulatedRadio(QObject):
+    """Źródło ramek A/B o zadanej częstotliwości zamiast portu szeregowego - do testów i benchmarków."""
+    telemetry_received = pyqtSignal(dict)
+    auxiliary_received = pyqtSignal(dict)
+
+    def __init__(self, rate, parent=None):
+        super().__init__(parent)
+        self.rate = rate
+        self.count = 0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._emit)
+
+    def start(self):
+        self.timer.start(max(int(1000 / self.rate), 1))
+
+    def stop(self):
+        self.timer.stop()
+
+    def _emit(self):
+        t = self.count / self.rate
+        self.count += 1
+        self.telemetry_received.emit({
+            'pitch': 5 * math.sin(t),
+            'roll': 5 * math.cos(t),
+            'yaw': (10 * t) % 360,
+            'ver_velocity': 50 * math.cos(t / 20) + random.gauss(0, 0.5),
+            'altitude': 1000 * (1 + math.sin(t / 20)) + random.gauss(0, 1),
+            'rbs': 0,
+        })
+        self.auxiliary_received.emit({
+            'latitude': 52.2549 + 0.001 * math.sin(t / 30),
+            'longitude': 20.9004 + 0.001 * math.cos(t / 30),
+            'status': 1,
+        })
+
+
+class HeadlessStation(QObject):
+    """Odbiór, przetwarzanie, zapis CSV i przekazywanie danych bez GUI.
+
+    Działa na pętli QCoreApplication - sygnały SerialThread i ProcessData
+    wymagają pętli zdarzeń, ale nie ładuje QtWidgets ani QtWebEngine. Co
+    status_interval sekund stan stacji trafia do pliku JSON (zapis
+    atomowy), który czyta `python -m tools.station_status`.
+    """
+
+    def __init__(self, config, status_path=None, simulate_rate=None, status_interval=1.0, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.headless')
+        self.config = config
+        self.status_path = status_path or Utils.get_headless_status_path()
+        self.started = time.time()
+        self.records = 0
+        self.last_record_time = None
+        self.aborts = 0
+        self.usage = ProcessUsage()
+        self._records_at_last_status = 0
+        self._last_status_time = time.monotonic()
+
+        self.bus = EventBus()
+        self.csv_handler = CsvHandler()
+        self.processor = ProcessData(self.csv_handler)
+        self.processor.processed_data_ready.connect(self.handle_processed_data)
+
+        network_config = config['network']
+        self.transmitter = NetworkTransmitter(host=network_config['ip_address'], port=int(network_config['port']),
+                                              bus=self.bus)
+        self.transmitter.subscribe_on_data_received(self.on_network_command)
+        self.outbox = Outbox(self.transmitter)
+        self.multicast = None
+        if network_config.get('multicast_enabled'):
+            try:
+                self.multicast = MulticastPublisher(group=network_config['multicast_group'],
+                                                    port=network_config['multicast_port'])
+            except OSError as e:
+                self.logger.error(f"Failed to start multicast publisher: {e}")
+        self.forwarder = TelemetryForwarder(self.transmitter, self.outbox, self.multicast)
+        self.connection_thread = threading.Thread(target=self.transmitter.connect, daemon=True,
+                                                  name="NetworkTransmitter-Connect")
+
+        self.serial_reader = None
+        self.radio = None
+        if simulate_rate:
+            self.radio = SimulatedRadio(simulate_rate, self)
+            self.logger.info(f"Simulated radio at {simulate_rate} frames/s")
+        elif config['port']:
+            from core.serial_reader import SerialReader
+            self.serial_reader = SerialReader(port=config['port'], baudrate=config['baudrate'],
+                                              transmitter=self.transmitter, lora_config=config['lora_config'],
+                                              bus=self.bus)
+            self.radio = self.serial_reader
+        else:
+            self.logger.warning("No serial port configured - running without a receiver")
+
+        if self.radio:
+            self.radio.telemetry_received.connect(self.processor.handle_telemetry)
+            self.radio.auxiliary_received.connect(self.processor.handle_telemetry)
+        if self.serial_reader:
+            self.serial_reader.transmission_info_received.connect(self.processor.handle_transmission_info)
+
+        self.gpio_reader = None
+        try:
+            from core.gpio_reader import GpioReader
+            self.gpio_reader = GpioReader(Config.DEFAULT_GPIO_PIN, bus=self.bus)
+            self.gpio_reader.subscribe_button_held(self.on_abort_button)
+        except Exception as e:
+            self.logger.error(f"GPIO abort button unavailable: {e}")
+
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.write_status)
+        self.status_interval = status_interval
+
+    def start(self):
+        self.connection_thread.start()
+        if self.serial_reader:
+            self.serial_reader.start_reading()
+        elif self.radio:
+            self.radio.start()
+        self.status_timer.start(int(self.status_interval * 1000))
+        self.write_status()
+        self.logger.info("Headless station started")
+
+    def stop(self):
+        self.status_timer.stop()
+        if self.serial_reader:
+            self.serial_reader.stop_reading()
+        elif self.radio:
+            self.radio.stop()
+        self.outbox.close()
+        if self.multicast:
+            self.multicast.close()
+        self.transmitter.shutdown()
+        self.connection_thread.join(timeout=2)
+        self.csv_handler.close_file()
+        self.write_status(state='stopped')
+        self.bus.close()
+        self.logger.info(f"Headless station stopped after {self.records} records")
+
+    def handle_processed_data(self, data):
+        try:
+            self.records += 1
+            self.last_record_time = time.time()
+            self.forwarder.forward(data)
+        except Exception as e:
+            self.logger.error(f"Błąd w handle_processed_data: {e}")
+
+    def on_network_command(self, data):
+        self.logger.debug(f"Data received from network: {data}")
+        if self.serial_reader:
+            self.serial_reader.relay_command(data)
+        else:
+            self.logger.warning("No serial reader available to send data")
+
+    def on_abort_button(self):
+        self.aborts += 1
+        self.logger.warning("Abort button held")
+        if self.serial_reader:
+            self.serial_reader.send_data("abort", UplinkPriority.ABORT)
+        else:
+            self.logger.warning("No serial reader available - abort signal not sent")
+
+    def status(self, state='running'):
+        now = time.monotonic()
+        rate = (self.records - self._records_at_last_status) / max(now - self._last_status_time, 1e-6)
+        self._records_at_last_status, self._last_status_time = self.records, now
+        return {
+            'state': state,
+            'pid': os.getpid(),
+            'updated': time.time(),
+            'interval_s': self.status_interval,
+            'uptime_s': round(time.time() - self.started, 1),
+            'session_dir': Utils.session_path,
+            'source': 'simulated' if isinstance(self.radio, SimulatedRadio) else self.config['port'] or None,
+            'serial_open': bool(self.serial_reader and self.serial_reader.ser and self.serial_reader.ser.is_open),
+            'records': self.records,
+            'records_per_s': round(rate, 1),
+            'last_record_age_s': round(time.time() - self.last_record_time, 1) if self.last_record_time else None,
+            'partner_connected': self.transmitter.is_connected(),
+            'sent': self.forwarder.sent,
+            'queued': self.forwarder.queued,
+            'outbox_pending': self.outbox.pending,
+            'multicast': self.multicast is not None,
+            'aborts': self.aborts,
+            'event_bus': self.bus.metrics(),
+            **self.usage.sample(),
+        }
+
+    def write_status(self, state='running'):
+        temporary = self.status_path + '.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(self.status(state), f, indent=2)
+            os.replace(temporary, self.status_path)
+        except OSError as e:
+            self.logger.error(f"Nie można zapisać statusu {self.status_path}: {e}")
+
+
+def run_headless(args, config):
+    """Pętla zdarzeń trybu bez GUI, zwraca kod wyjścia."""
+    logger = logging.getLogger('HORUS_FAS.headless')
+    app = QCoreApplication([sys.argv[0]])
+
+    station = HeadlessStation(config, status_path=args.status_file, simulate_rate=args.simulate)
+
+    def request_quit(signum, _frame=None):
+        logger.info(f"Signal {signum} received - stopping")
+        app.quit()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, request_quit)
+    # Python obsługuje sygnały tylko między instrukcjami interpretera - timer oddaje mu sterowanie
+    signal_timer = QTimer()
+    signal_timer.timeout.connect(lambda: None)
+    signal_timer.start(200)
+
+    if args.duration:
+        QTimer.singleShot(int(args.duration * 1000), partial(request_quit, 'duration'))
+
+    station.start()
+    print(f"HORUS_FAS headless, session {Utils.session_path}, status {station.status_path}", flush=True)
+    exit_code = app.exec_()
+    station.stop()
+    return exit_code
@@ -0,0 +1,328 @@
+import gc
+import json
+import time
+import bisect
+import logging
+import threading
+
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from core.config import Config
+
+# Granice kubełków histogramów czasu, w milisekundach
+DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class ProcessUsage:
+    """CPU i pamięć bieżącego procesu - psutil, a bez niego getrusage."""
+
+    def __init__(self):
+        self.process = psutil.Process() if psutil else None
+        self._last = (time.monotonic(), self._cpu_time())
+
+    def _cpu_time(self):
+        if self.process:
+            times = self.process.cpu_times()
+            return times.user + times.system
+        if resource:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return usage.ru_utime + usage.ru_stime
+        return time.process_time()
+
+    def sample(self):
+        now, cpu = time.monotonic(), self._cpu_time()
+        last_time, last_cpu = self._last
+        self._last = (now, cpu)
+        result = {'cpu_percent': round(100.0 * (cpu - last_cpu) / max(now - last_time, 1e-6), 1),
+                  'cpu_seconds': round(cpu, 2)}
+        if self.process:
+            result['rss_mb'] = round(self.process.memory_info().rss / 2 ** 20, 1)
+        elif resource:
+            # ru_maxrss to szczyt, w kB na Linuksie
+            result['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        return result
+
+
+class Counter:
+    """Licznik rosnący; próbka podaje wartość i przyrost na sekundę od poprzedniej próbki."""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+        self._last = (time.monotonic(), 0)
+
+    def inc(self, count=1):
+        with self._lock:
+            self.value += count
+
+    def sample(self):
+        now, value = time.monotonic(), self.value
+        last_time, last_value = self._last
+        self._last = (now, value)
+        return {self.name: value,
+                f"{self.name}.rate": round((value - last_value) / max(now - last_time, 1e-6), 1)}
+
+
+class Gauge:
+    """Wartość chwilowa - ustawiana przez set() albo odczytywana funkcją przy próbkowaniu."""
+
+    def __init__(self, name, function=None):
+        self.name = name
+        self.function = function
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+    def sample(self):
+        return {self.name: self.function() if self.function else self.value}
+
+
+class Histogram:
+    """Rozkład w stałych kubełkach.
+
+    observe() to bisect i inkrementacja, więc nadaje się do gorących
+    ścieżek. Próbka opisuje obserwacje od poprzedniej próbki (liczba,
+    p50, p95 jako górne granice kubełków, maksimum); counts() zwraca
+    liczności od początku sesji.
+    """
+
+    def __init__(self, name, bounds=DEFAULT_BOUNDS_MS):
+        self.name = name
+        self.bounds = tuple(bounds)
+        self.total = [0] * (len(self.bounds) + 1)
+        self._window = [0] * (len(self.bounds) + 1)
+        self._window_max = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        bucket = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.total[bucket] += 1
+            self._window[bucket] += 1
+            if value > self._window_max:
+                self._window_max = value
+            if value > self.max:
+                self.max = value
+
+    def _quantile(self, counts, count, q, maximum):
+        rank = q * count
+        cumulative = 0
+        for bucket, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return round(min(self.bounds[bucket], maximum) if bucket < len(self.bounds) else maximum, 2)
+        return round(maximum, 2)
+
+    def counts(self):
+        with self._lock:
+            return {('inf' if i == len(self.bounds) else self.bounds[i]): count for i, count in enumerate(self.total)}
+
+    def sample(self):
+        with self._lock:
+            window, maximum = self._window, self._window_max
+            self._window = [0] * (len(self.bounds) + 1)
+            self._window_max = 0.0
+        count = sum(window)
+        result = {f"{self.name}.count": count}
+        if count:
+            result[f"{self.name}.p50"] = self._quantile(window, count, 0.5, maximum)
+            result[f"{self.name}.p95"] = self._quantile(window, count, 0.95, maximum)
+            result[f"{self.name}.max"] = round(maximum, 2)
+        return result
+
+
+class MetricsRegistry:
+    """Rejestr liczników, wskaźników i histogramów stacji.
+
+    counter()/gauge()/histogram() zwracają istniejącą metrykę o tej nazwie
+    albo tworzą nową, więc moduły rejestrują się niezależnie od siebie.
+    Kolektory to funkcje zwracające od razu kilka wartości (np. CPU i RSS
+    z jednego odczytu). sample() zbiera wszystko w płaski słownik.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger('HORUS_FAS.metrics')
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+        self._failed = set()
+
+    def _get(self, cls, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise TypeError(f"Metric {name} is a {type(metric).__name__}, not a {cls.__name__}")
+            return metric
+
+    def counter(self, name):
+        return self._get(Counter, name)
+
+    def gauge(self, name, function=None):
+        gauge = self._get(Gauge, name)
+        if function:
+            gauge.function = function
+        return gauge
+
+    def histogram(self, name, bounds=DEFAULT_BOUNDS_MS):
+        return self._get(Histogram, name, bounds)
+
+    def add_collector(self, function):
+        self._collectors.append(function)
+
+    def sample(self):
+        with self._lock:
+            sources = [metric.sample for metric in self._metrics.values()] + list(self._collectors)
+        result = {}
+        for source in sources:
+            try:
+                result.update(source())
+            except Exception as e:
+                # Jeden zepsuty odczyt nie może zatrzymać próbkowania - logowany raz
+                if source not in self._failed:
+                    self._failed.add(source)
+                    self.logger.error(f"Metric source {source} failed: {e}")
+        return result
+
+
+def process_collector():
+    """CPU, pamięć i liczba wątków procesu."""
+    usage = ProcessUsage()
+
+    def collect():
+        sample = usage.sample()
+        return {
+            'process.cpu_percent': sample['cpu_percent'],
+            'process.rss_mb': sample.get('rss_mb', sample.get('peak_rss_mb')),
+            'process.threads': threading.active_count(),
+        }
+    return collect
+
+
+def event_bus_collector(bus):
+    """Częstość publikacji i najgorszy subskrybent każdego tematu magistrali."""
+
+    def collect():
+        result = {}
+        for topic, metrics in bus.metrics().items():
+            subscribers = metrics['subscribers']
+            result[f"bus.{topic}.rate"] = metrics['rate_per_s']
+            result[f"bus.{topic}.backlog"] = max((s['backlog'] for s in subscribers), default=0)
+            result[f"bus.{topic}.dropped"] = sum(s['dropped'] for s in subscribers)
+            result[f"bus.{topic}.lag_max_ms"] = round(max((s['lag_max_ms'] for s in subscribers), default=0.0), 2)
+        return result
+    return collect
+
+
+class GcPauseProbe:
+    """Czas pauz odśmiecacza przez gc.callbacks - histogram gc.pause_ms i liczniki kolekcji na generację."""
+
+    def __init__(self, registry):
+        self.pauses = registry.histogram('gc.pause_ms', (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100, 500))
+        self.collections = [registry.counter(f"gc.collections.gen{generation}") for generation in range(3)]
+        self._start = None
+        gc.callbacks.append(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses.observe(1000 * (time.perf_counter() - self._start))
+            self.collections[info['generation']].inc()
+            self._start = None
+
+    def close(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+
+class EventLoopLagProbe(QObject):
+    """Opóźnienie pętli zdarzeń Qt: o ile później niż zaplanowano odpala timer wątku, w którym probe powstał."""
+
+    def __init__(self, registry, interval_ms=Config.EVENT_LOOP_PROBE_MS, parent=None):
+        super().__init__(parent)
+        self.lag = registry.histogram('loop.lag_ms')
+        self.interval = interval_ms / 1000
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self._last = None
+
+    def start(self):
+        self._last = time.monotonic()
+        self.timer.start(int(self.interval * 1000))
+
+    def stop(self):
+        self.timer.stop()
+
+    def _tick(self):
+        now = time.monotonic()
+        self.lag.observe(max(0.0, 1000 * (now - self._last - self.interval)))
+        self._last = now
+
+
+class MetricsSampler(QObject):
+    """Próbkuje rejestr co sample_ms i dopisuje próbki jako szereg czasowy JSON Lines.
+
+    Każda linia pliku to jedna próbka {'time': ..., nazwa: wartość, ...}.
+    Zapis jest buforowany i opróżniany co export_s sekund, więc dysk nie
+    jest dotykany przy każdej próbce. sampled niesie ostatnią próbkę dla
+    paska stanu i okna diagnostyki.
+    """
+    sampled = pyqtSignal(dict)
+
+    def __init__(self, registry, path=None, sample_ms=Config.METRICS_SAMPLE_MS, export_s=Config.METRICS_EXPORT_S,
+                 parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.metrics')
+        self.registry = registry
+        self.path = path
+        self.export_s = export_s
+        self.latest = {}
+        self._file = None
+        self._last_flush = time.monotonic()
+        if path:
+            try:
+                self._file = open(path, 'a', encoding='utf-8')
+                self.logger.info(f"Metrics exported to {path}")
+            except OSError as e:
+                self.logger.error(f"Nie można otworzyć pliku metryk {path}: {e}")
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+        self.timer.setInterval(sample_ms)
+
+    def start(self):
+        self.timer.start()
+
+    def sample(self):
+        self.latest = {'time': round(time.time(), 3), **self.registry.sample()}
+        if self._file:
+            try:
+                self._file.write(json.dumps(self.latest) + '\n')
+                if time.monotonic() - self._last_flush >= self.export_s:
+                    self._file.flush()
+                    self._last_flush = time.monotonic()
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Błąd zapisu metryk: {e}")
+                self._file = None
+        self.sampled.emit(self.latest)
+
+    def stop(self):
+        self.timer.stop()
+        if self._file:
+            self._file.close()
+            self._file = None
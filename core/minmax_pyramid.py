@@ -0,0 +1,146 @@
+import numpy as np
+
+from core.growable_array import GrowableArray
+
+
+class _Level:
+    def __init__(self):
+        self.times = GrowableArray()
+        self.minima = GrowableArray()
+        self.maxima = GrowableArray()
+        # Niedokończony kubełek tego poziomu
+        self.count = 0
+        self.first_time = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def reset_partial(self):
+        self.count = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+
+class MinMaxPyramid:
+    """Multi-resolution min/max summary of a sorted time series.
+
+    Level k holds one (time, min, max) bucket per ``factor ** k`` raw
+    samples. Buckets are completed incrementally in append(). The raw
+    samples (level 0) stay with the caller and are passed to select().
+    """
+
+    def __init__(self, factor=4, max_levels=12):
+        self.factor = factor
+        self.max_levels = max_levels
+        self.levels = []
+
+    def clear(self):
+        self.levels = []
+
+    def append(self, timestamp, value):
+        self._push(0, timestamp, value, value)
+
+    def build(self, timestamps, values):
+        """Rebuilds all levels from complete arrays with vectorized reductions."""
+        self.clear()
+        times = np.asarray(timestamps, dtype=np.float64)
+        minima = maxima = np.asarray(values, dtype=np.float64)
+
+        for depth in range(self.max_levels):
+            if depth > 0 and not len(times):
+                break
+            level = _Level()
+            self.levels.append(level)
+
+            full = len(times) // self.factor * self.factor
+            if full:
+                level.times.extend(times[:full:self.factor])
+                level.minima.extend(minima[:full].reshape(-1, self.factor).min(axis=1))
+                level.maxima.extend(maxima[:full].reshape(-1, self.factor).max(axis=1))
+
+            remainder = len(times) - full
+            if remainder:
+                level.count = remainder
+                level.first_time = times[full]
+                level.minimum = minima[full:].min()
+                level.maximum = maxima[full:].max()
+
+            times = level.times.view()
+            minima = level.minima.view()
+            maxima = level.maxima.view()
+
+    def select(self, timestamps, values, x_min, x_max, max_points):
+        """Returns (x, y) to draw for the view range, at most about max_points long.
+
+        Raw samples are returned as views when they fit, otherwise the
+        coarsest needed level is expanded to (min, max) pairs per bucket.
+        """
+        start = max(int(np.searchsorted(timestamps, x_min, side='right')) - 1, 0)
+        end = min(int(np.searchsorted(timestamps, x_max, side='left')) + 1, len(timestamps))
+        count = end - start
+        if count <= max_points or not self.levels:
+            return timestamps[start:end], values[start:end]
+
+        buckets_allowed = max(max_points // 2, 1)
+        depth = 0
+        while depth < len(self.levels) - 1 and count / self.factor ** (depth + 1) > buckets_allowed:
+            depth += 1
+        level = self.levels[depth]
+
+        times = level.times.view()
+        first = max(int(np.searchsorted(times, x_min, side='right')) - 1, 0)
+        last = int(np.searchsorted(times, x_max, side='right'))
+        bucket_times = times[first:last]
+        bucket_minima = level.minima.view()[first:last]
+        bucket_maxima = level.maxima.view()[first:last]
+
+        if last == len(times):
+            tail = self._tail(depth)
+            if tail is not None:
+                bucket_times = np.append(bucket_times, tail[0])
+                bucket_minima = np.append(bucket_minima, tail[1])
+                bucket_maxima = np.append(bucket_maxima, tail[2])
+
+        x = np.repeat(bucket_times, 2)
+        y = np.empty(len(x))
+        y[0::2] = bucket_minima
+        y[1::2] = bucket_maxima
+        return x, y
+
+    def _push(self, depth, timestamp, minimum, maximum):
+        if depth >= self.max_levels:
+            return
+        if depth == len(self.levels):
+            self.levels.append(_Level())
+        level = self.levels[depth]
+
+        if level.count == 0:
+            level.first_time = timestamp
+        level.count += 1
+        if minimum < level.minimum:
+            level.minimum = minimum
+        if maximum > level.maximum:
+            level.maximum = maximum
+
+        if level.count == self.factor:
+            level.times.append(level.first_time)
+            level.minima.append(level.minimum)
+            level.maxima.append(level.maximum)
+            completed = (level.first_time, level.minimum, level.maximum)
+            level.reset_partial()
+            self._push(depth + 1, *completed)
+
+    def _tail(self, depth):
+        """Merges the unfinished buckets at and below depth into one bucket."""
+        first_time = None
+        minimum = np.inf
+        maximum = -np.inf
+        for level in self.levels[depth::-1]:
+            if not level.count:
+                continue
+            if first_time is None:
+                first_time = level.first_time
+            minimum = min(minimum, level.minimum)
+            maximum = max(maximum, level.maximum)
+        if first_time is None:
+            return None
+        return first_time, minimum, maximum
@@ -0,0 +1,173 @@
+"""Receiver side of the HORUS FAS UDP multicast telemetry broadcast.
+
+The module depends only on the standard library so consoles on the launch
+site LAN can use it without Qt. Every datagram carries one processed record:
+
+    magic (4s) | version (B) | session id (I) | sequence (Q) | send time (d) | JSON payload
+
+Listen from the command line with:
+    python -m core.multicast_receiver --group 239.255.42.99 --port 5007
+"""
+import json
+import socket
+import struct
+import logging
+from collections import deque
+
+MAGIC = b"HFAS"
+VERSION = 1
+HEADER = struct.Struct("!4sBIQd")
+MAX_DATAGRAM_SIZE = 65507
+
+
+def pack_datagram(session_id, sequence, send_time, payload: bytes):
+    return HEADER.pack(MAGIC, VERSION, session_id, sequence, send_time) + payload
+
+
+def unpack_datagram(datagram):
+    """Returns (session_id, sequence, send_time, payload) or None for foreign datagrams."""
+    if len(datagram) < HEADER.size:
+        return None
+    magic, version, session_id, sequence, send_time = HEADER.unpack_from(datagram)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return session_id, sequence, send_time, datagram[HEADER.size:]
+
+
+class GapTracker:
+    """Detects lost, duplicated and reordered sequence numbers of one publisher."""
+
+    def __init__(self, max_tracked_gaps=4096):
+        self.session_id = None
+        self.expected = None
+        self.received = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self._missing = set()
+        self._missing_order = deque()
+        self.max_tracked_gaps = max_tracked_gaps
+
+    def update(self, session_id, sequence):
+        """Registers a sequence number, returns the range of newly missing ones."""
+        if session_id != self.session_id:
+            # Nowa sesja nadawcy - numeracja zaczyna się od nowa
+            self.session_id = session_id
+            self.expected = sequence
+            self._missing.clear()
+            self._missing_order.clear()
+
+        self.received += 1
+        if sequence == self.expected:
+            self.expected += 1
+            return range(0)
+
+        if sequence > self.expected:
+            gap = range(self.expected, sequence)
+            self.lost += len(gap)
+            for missing in gap[-self.max_tracked_gaps:]:
+                self._track_missing(missing)
+            self.expected = sequence + 1
+            return gap
+
+        if sequence in self._missing:
+            self._missing.discard(sequence)
+            self.lost -= 1
+            self.reordered += 1
+        else:
+            self.duplicates += 1
+        return range(0)
+
+    def stats(self):
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'duplicates': self.duplicates,
+            'reordered': self.reordered,
+        }
+
+    def _track_missing(self, sequence):
+        self._missing.add(sequence)
+        self._missing_order.append(sequence)
+        if len(self._missing_order) > self.max_tracked_gaps:
+            self._missing.discard(self._missing_order.popleft())
+
+
+class MulticastReceiver:
+    def __init__(self, group, port, interface="0.0.0.0", timeout=None, on_gap=None,
+                 receive_buffer_size=4 * 1024 * 1024):
+        self.logger = logging.getLogger('HORUS_FAS.multicast_receiver')
+        self.group = group
+        self.port = port
+        self.on_gap = on_gap
+        self.tracker = GapTracker()
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Większy bufor jądra pozwala przetrwać chwilowe przestoje odbiorcy
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
+        self.sock.bind(("", port))
+        membership = socket.inet_aton(group) + socket.inet_aton(interface)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.sock.settimeout(timeout)
+        self.logger.info(f"Joined multicast group {group}:{port} on {interface}")
+
+    def receive(self):
+        """Blocks for the next record, returns (sequence, send_time, record) or None on timeout."""
+        while True:
+            try:
+                datagram = self.sock.recv(MAX_DATAGRAM_SIZE)
+            except socket.timeout:
+                return None
+
+            unpacked = unpack_datagram(datagram)
+            if unpacked is None:
+                continue
+
+            session_id, sequence, send_time, payload = unpacked
+            gap = self.tracker.update(session_id, sequence)
+            if gap:
+                self.logger.warning(f"Lost {len(gap)} datagrams before sequence {sequence}")
+                if self.on_gap:
+                    self.on_gap(gap)
+
+            try:
+                record = json.loads(payload)
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Invalid multicast payload: {e}")
+                continue
+            return sequence, send_time, record
+
+    def __iter__(self):
+        while True:
+            received = self.receive()
+            if received is None:
+                return
+            yield received
+
+    def stats(self):
+        return self.tracker.stats()
+
+    def close(self):
+        self.sock.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print HORUS FAS multicast telemetry")
+    parser.add_argument("--group", default="239.255.42.99")
+    parser.add_argument("--port", type=int, default=5007)
+    parser.add_argument("--interface", default="0.0.0.0")
+    args = parser.parse_args()
+
+    receiver = MulticastReceiver(args.group, args.port, args.interface)
+    try:
+        for seq, _, rec in receiver:
+            print(seq, rec, receiver.stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.close()
@@ -3,31 +3,122 @@ import socket
 import json
 import logging
 import threading
+import random
+import time
 from time import sleep
 
+from core.config import Config
+from core.event_bus import EventBus, PARTNER_CONNECTED, PARTNER_DISCONNECTED, NETWORK_DATA
+from core.multicast_receiver import pack_datagram
+
+
+class LineFramer:
+    """Bufor ramek rozdzielanych znakiem nowej linii.
+
+    Dane trafiają bezpośrednio do jednego, wielokrotnie używanego bytearray
+    (recv_into), a separator jest wyszukiwany tylko w nowo odebranych bajtach,
+    więc koszt przetworzenia strumienia jest liniowy względem jego długości.
+    """
+
+    def __init__(self, delimiter=b"\n", initial_size=65536, max_frame_size=16 * 1024 * 1024):
+        self.delimiter = delimiter
+        self.max_frame_size = max_frame_size
+        self.logger = logging.getLogger('HORUS_FAS.line_framer')
+        self._buffer = bytearray(initial_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._scan = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def receive_from(self, sock, size=65536):
+        """Odbiera dane z gniazda prosto do bufora, zwraca liczbę bajtów."""
+        self._reserve(size)
+        received = sock.recv_into(self._view[self._end:], len(self._buffer) - self._end)
+        self._end += received
+        return received
+
+    def feed(self, data):
+        size = len(data)
+        self._reserve(size)
+        self._view[self._end:self._end + size] = data
+        self._end += size
+
+    def frames(self):
+        """Zwraca kolejne kompletne ramki zdekodowane jako str (bez separatora)."""
+        delimiter_size = len(self.delimiter)
+        while True:
+            index = self._buffer.find(self.delimiter, self._scan, self._end)
+            if index < 0:
+                break
+            with self._view[self._start:index] as frame:
+                line = str(frame, "utf-8", "replace")
+            self._start = index + delimiter_size
+            self._scan = self._start
+            yield line
+
+        # Kolejne wyszukiwanie zaczyna się od niesprawdzonych bajtów
+        self._scan = max(self._start, self._end - delimiter_size + 1)
+        if self._start == self._end:
+            self._start = self._end = self._scan = 0
+        elif self._end - self._start > self.max_frame_size:
+            self.logger.error(
+                f"Ramka przekroczyła {self.max_frame_size} bajtów bez separatora – odrzucam bufor")
+            self._start = self._end = self._scan = 0
+
+    def _reserve(self, size):
+        if len(self._buffer) - self._end >= size:
+            return
+
+        pending = self._end - self._start
+        if self._start > 0:
+            # Przesunięcie niekompletnej ramki na początek bufora
+            self._view[:pending] = self._view[self._start:self._end]
+            self._scan -= self._start
+            self._start = 0
+            self._end = pending
+
+        if len(self._buffer) - self._end < size:
+            new_size = len(self._buffer)
+            while new_size - self._end < size:
+                new_size *= 2
+            self._view.release()
+            self._buffer.extend(bytes(new_size - len(self._buffer)))
+            self._view = memoryview(self._buffer)
+
+
 class NetworkTransmitter(QObject):
     data_received_signal = pyqtSignal()
 
-    def __init__(self, host='192.168.154.1', port=65432):
+    def __init__(self, host='192.168.154.1', port=65432, bus=None):
         super().__init__()
         self.host = host
         self.port = port
         self.sock = None
         self.logger = logging.getLogger('HORUS_FAS.network_transmitter')
-        self.on_partner_connected = []
-        self.on_partner_disconnected = []
-        self.on_data_received = []
+        # Zdarzenia połączenia i dane od partnera idą przez magistralę - wątki gniazda nie czekają na odbiorców
+        self.bus = bus or EventBus()
 
         self._stop_event = threading.Event()
+        self._shutdown_event = threading.Event()
+        self._send_lock = threading.Lock()
         self._receive_thread = None
         self._heartbeat_thread = None
 
     def connect(self):
         """Łączy się z serwerem TCP (na Ubuntu)"""
-        while not self.sock:
+        while not self.sock and not self._shutdown_event.is_set():
             try:
-                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.connect((self.host, self.port))
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                try:
+                    sock.connect((self.host, self.port))
+                except OSError:
+                    sock.close()
+                    raise
+                self.sock = sock
+                self._stop_event.clear()
                 self.logger.info(f"Połączono z serwerem {self.host}:{self.port}")
 
                 self._receive_thread = threading.Thread(target=self._receive_loop, daemon=True)
@@ -36,25 +127,30 @@ class NetworkTransmitter(QObject):
                 self._heartbeat_thread = threading.Thread(target=self._heartbeat_check, daemon=True)
                 self._heartbeat_thread.start()
 
-                for on_connected in self.on_partner_connected:
-                    on_connected()
+                self.bus.publish(PARTNER_CONNECTED)
             except (ConnectionRefusedError, socket.timeout, OSError) as e:
                 self.logger.error(f"Błąd łączenia z serwerem: {e}")
-                sleep(2)
+                self._shutdown_event.wait(2)
 
     def send_data(self, data: dict):
-        """Wysyła dane JSON do serwera"""
+        """Wysyła dane JSON do serwera, zwraca True po udanym wysłaniu"""
         if not self.sock:
             self.logger.warning("Brak połączenia z serwerem – nie wysyłam")
-            return
+            return False
         try:
             json_data = json.dumps(data).encode("utf-8") + b"\n"
-            self.sock.sendall(json_data)
+            with self._send_lock:
+                self.sock.sendall(json_data)
             self.logger.debug(f"Wysłano dane: {data}")
+            return True
         except Exception as e:
             self.logger.error(f"Błąd wysyłania danych: {e}")
             self.close_connection()
             self.connect()
+            return False
+
+    def is_connected(self):
+        return self.sock is not None
 
     def _heartbeat_check(self):
         while self.sock:
@@ -67,28 +163,27 @@ class NetworkTransmitter(QObject):
         self.connect()
 
     def _receive_loop(self):
-        buffer = b""
+        framer = LineFramer()
         while self.sock and not self._stop_event.is_set():
-            self.logger.debug("I exist")
             try:
-                chunk = self.sock.recv(4096)
-                self.logger.debug(f"Raw received chunk: {chunk}")
-                if not chunk:
+                received = framer.receive_from(self.sock)
+                self.logger.debug(f"Odebrano {received} bajtów")
+                if not received:
                     self.logger.warning("Serwer zamknął połączenie")
                     self.close_connection()
                     break
 
-                buffer += chunk
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
+                for line in framer.frames():
                     if not line.strip():
                         continue
                     try:
-                        data = json.loads(line.decode("utf-8"))
+                        data = json.loads(line)
                         self.logger.debug(f"Odebrano dane: {data}")
                         self.data_received_signal.emit()
-                        for cb in self.on_data_received:
-                            cb(data)
+                        if isinstance(data, dict):
+                            self.bus.publish(NETWORK_DATA, data)
+                        else:
+                            self.logger.warning(f"Pomijam dane spoza obiektu JSON: {data}")
                     except json.JSONDecodeError as e:
                         self.logger.error(f"Błąd dekodowania JSON: {e}")
                         continue
@@ -98,28 +193,28 @@ class NetworkTransmitter(QObject):
                 self.close_connection()
                 break
 
-    def subscribe_on_partner_connected(self,callback):
-        self.on_partner_connected.append(callback)
-        self.logger.info(f"Added {callback} as a subscriber to on_partner_connected.")
+    def subscribe_on_partner_connected(self, callback, mode='thread'):
+        self.bus.subscribe(PARTNER_CONNECTED, callback, mode)
 
-    def subscribe_on_partner_disconnected(self,callback):
-        self.on_partner_disconnected.append(callback)
-        self.logger.info(f"Added {callback} as a subscriber to on_partner_disconnected.")
+    def subscribe_on_partner_disconnected(self, callback, mode='thread'):
+        self.bus.subscribe(PARTNER_DISCONNECTED, callback, mode)
 
-    def subscribe_on_data_received(self, callback):
-        self.on_data_received.append(callback)
+    def subscribe_on_data_received(self, callback, mode='thread'):
+        self.bus.subscribe(NETWORK_DATA, callback, mode)
 
     def unsubscribe_on_partner_connected(self, callback):
-        if callback in self.on_partner_connected:
-            self.on_partner_connected.remove(callback)
+        self.bus.unsubscribe(PARTNER_CONNECTED, callback)
 
     def unsubscribe_on_partner_disconnected(self, callback):
-        if callback in self.on_partner_disconnected:
-            self.on_partner_disconnected.remove(callback)
+        self.bus.unsubscribe(PARTNER_DISCONNECTED, callback)
 
     def unsubscribe_on_data_received(self, callback):
-        if callback in self.on_data_received:
-            self.on_data_received.remove(callback)
+        self.bus.unsubscribe(NETWORK_DATA, callback)
+
+    def shutdown(self):
+        """Zamyka połączenie i wyłącza ponowne łączenie"""
+        self._shutdown_event.set()
+        self.close_connection()
 
     def close_connection(self):
         self._stop_event.set()
@@ -131,11 +226,53 @@ class NetworkTransmitter(QObject):
             self.sock.close()
             self.sock = None
             self.logger.info("Closed server connection")
-            for callback in self.on_partner_disconnected:
-                callback()
+            self.bus.publish(PARTNER_DISCONNECTED)
 
         current_thread = threading.current_thread()
         if self._receive_thread and self._receive_thread != current_thread:
             self._receive_thread.join(timeout=1)
         if self._heartbeat_thread and self._heartbeat_thread != current_thread:
-            self._heartbeat_thread.join(timeout=1)
\ No newline at end of file
+            self._heartbeat_thread.join(timeout=1)
+
+
+class MulticastPublisher:
+    """Rozgłasza przetworzone rekordy jako pojedyncze datagramy UDP multicast.
+
+    Koszt po stronie stacji jest stały niezależnie od liczby odbiorców.
+    Gniazdo jest nieblokujące - rekord, którego nie da się wysłać, jest
+    pomijany, a luka w numeracji jest widoczna u odbiorców.
+    """
+
+    def __init__(self, group=Config.DEFAULT_MULTICAST_GROUP, port=Config.DEFAULT_MULTICAST_PORT,
+                 ttl=1, interface=None, loopback=True):
+        self.group = group
+        self.port = port
+        self.logger = logging.getLogger('HORUS_FAS.multicast_publisher')
+        self.session_id = random.getrandbits(32)
+        self.sequence = 0
+        self.dropped = 0
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if loopback else 0)
+        if interface:
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+        self.sock.connect((group, port))
+        self.sock.setblocking(False)
+        self.logger.info(f"Multicast publisher na {group}:{port} (TTL {ttl})")
+
+    def publish(self, data: dict):
+        payload = json.dumps(data, separators=(',', ':')).encode("utf-8")
+        datagram = pack_datagram(self.session_id, self.sequence, time.time(), payload)
+        self.sequence += 1
+        try:
+            self.sock.send(datagram)
+            return True
+        except (BlockingIOError, OSError) as e:
+            self.dropped += 1
+            self.logger.debug(f"Pominięto datagram {self.sequence - 1}: {e}")
+            return False
+
+    def close(self):
+        self.sock.close()
+        self.logger.info(f"Multicast publisher zamknięty po {self.sequence} rekordach ({self.dropped} pominiętych)")
@@ -0,0 +1,116 @@
+import os
+import json
+import logging
+import threading
+import time
+
+from core.config import Config
+from core.utils import Utils
+
+
+class Outbox:
+    """Store-and-forward journal for records that could not reach the partner.
+
+    Unsent records are appended to a JSON-lines journal in the session
+    directory. After the partner reconnects a background thread replays the
+    journal at ``drain_rate`` records per second. Live records are sent by the
+    caller directly and never wait behind the backlog. Only file offsets are
+    kept in memory, so memory use does not depend on the outage length.
+    """
+
+    def __init__(self, transmitter, directory=None, drain_rate=Config.DEFAULT_OUTBOX_DRAIN_RATE,
+                 filename='outbox.jsonl'):
+        self.logger = logging.getLogger('HORUS_FAS.outbox')
+        self.transmitter = transmitter
+        self.drain_rate = drain_rate
+        self.path = os.path.join(directory or Utils.session_path, filename)
+
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._write_file = open(self.path, 'ab')
+        self._read_offset = 0
+        self._write_offset = self._write_file.tell()
+        self._pending = 0
+        self._outage_logged = False
+
+        self.transmitter.subscribe_on_partner_connected(self._on_partner_connected)
+
+        self._drain_thread = threading.Thread(target=self._drain_loop, daemon=True, name="Outbox-Drain")
+        self._drain_thread.start()
+        self.logger.info(f"Outbox journal: {self.path}")
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def append(self, record: dict):
+        line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b"\n"
+        with self._lock:
+            self._write_file.write(line)
+            self._write_file.flush()
+            self._write_offset += len(line)
+            self._pending += 1
+
+        if not self._outage_logged:
+            self.logger.warning("Partner unavailable – storing records in outbox")
+            self._outage_logged = True
+
+    def close(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self.transmitter.unsubscribe_on_partner_connected(self._on_partner_connected)
+        if self._drain_thread is not threading.current_thread():
+            self._drain_thread.join(timeout=1)
+        with self._lock:
+            self._write_file.close()
+        self.logger.info(f"Outbox closed with {self._pending} pending records")
+
+    def _on_partner_connected(self):
+        self._wake_event.set()
+
+    def _drain_loop(self):
+        interval = 1.0 / self.drain_rate if self.drain_rate > 0 else 0.0
+
+        with open(self.path, 'rb') as read_file:
+            while not self._stop_event.is_set():
+                if not self._pending or not self.transmitter.is_connected():
+                    self._wake_event.wait(timeout=1.0)
+                    self._wake_event.clear()
+                    continue
+
+                read_file.seek(self._read_offset)
+                line = read_file.readline()
+                if not line.endswith(b"\n"):
+                    # Rekord jeszcze niezapisany w całości
+                    time.sleep(interval)
+                    continue
+
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Skipping corrupted outbox record: {e}")
+                    self._advance(len(line))
+                    continue
+
+                record['replayed'] = True
+                if not self.transmitter.send_data(record):
+                    continue
+
+                self._advance(len(line))
+                if not self._pending:
+                    self.logger.info("Outbox backlog delivered")
+
+                time.sleep(interval)
+
+    def _advance(self, size):
+        with self._lock:
+            self._read_offset += size
+            self._pending -= 1
+            if self._read_offset >= self._write_offset:
+                # Cały dziennik wysłany – zwolnij miejsce na dysku
+                self._write_file.truncate(0)
+                self._write_file.seek(0)
+                self._read_offset = 0
+                self._write_offset = 0
+                self._outage_logged = False
@@ -6,10 +6,12 @@ from PyQt5.QtWidgets import (QApplication, QDialog,
                              QVBoxLayout, QHBoxLayout,
                              QLabel,
                              QComboBox, QPushButton,
-                             QGroupBox, QLineEdit, QGridLayout)
+                             QGroupBox, QLineEdit, QGridLayout, QCheckBox)
 from PyQt5.QtGui import QIcon
 import serial.tools.list_ports
 
+from core.config import Config
+
 
 class SerialConfigDialog(QDialog):
     def __init__(self, parent=None, default_ip_address="192.168.154.1"):
@@ -17,7 +19,7 @@ class SerialConfigDialog(QDialog):
         self.logger = logging.getLogger('HORUS_FAS.serial_config')
         self.setWindowTitle(
             "Okno konfiguracyjne HORUS FAS")
-        self.setFixedSize(490, 600)
+        self.setFixedSize(490, 660)
         self.setStyleSheet("""
             QDialog { background-color: #2c3e50; }
             QLabel { color: #ecf0f1; font-size: 12px; }
@@ -106,6 +108,17 @@ class SerialConfigDialog(QDialog):
         self.port_input.setFixedWidth(220)
         server_layout.addWidget(self.port_input, 1, 1,  alignment=Qt.AlignRight)
 
+        server_layout.addWidget(QLabel("Multicast UDP (LAN):"), 2, 0)
+        self.multicast_check = QCheckBox("Włączony")
+        self.multicast_check.setStyleSheet("color: #ecf0f1; font-size: 12px;")
+        server_layout.addWidget(self.multicast_check, 2, 1, alignment=Qt.AlignRight)
+
+        server_layout.addWidget(QLabel("Grupa multicast:"), 3, 0)
+        self.multicast_input = QLineEdit()
+        self.multicast_input.setText(f"{Config.DEFAULT_MULTICAST_GROUP}:{Config.DEFAULT_MULTICAST_PORT}")
+        self.multicast_input.setFixedWidth(220)
+        server_layout.addWidget(self.multicast_input, 3, 1, alignment=Qt.AlignRight)
+
         server_group.setLayout(server_layout)
         layout.addWidget(server_group)
 
@@ -193,6 +206,8 @@ class SerialConfigDialog(QDialog):
 
         self.ip_input.setWhatsThis("Sprawdź adres IP komputera używając 'ipconfig' (Windows) lub 'ifconfig' / 'ip addr' (Linux/Mac) w terminalu.")
         self.port_input.setWhatsThis("Ustaw wysoką wartość, aby nic nie kolidowało.")
+        self.multicast_check.setWhatsThis("Rozgłaszaj każdy rekord jako datagram UDP multicast w sieci lokalnej.")
+        self.multicast_input.setWhatsThis("Adres grupy multicast i port w formacie adres:port.")
         self.port_combo.setWhatsThis("Wybierz port COM, do którego podłączony jest moduł.")
         refresh_btn.setWhatsThis("Kliknij, aby odświeżyć listę dostępnych portów szeregowych.")
         self.baud_combo.setWhatsThis("Wybierz prędkość transmisji (baud rate) dla komunikacji szeregowej.")
@@ -243,9 +258,14 @@ class SerialConfigDialog(QDialog):
         else:
             self.port_name = self.port_combo.currentText()
         self.baud_rate = int(self.baud_combo.currentText())
+        multicast_group, _, multicast_port = self.multicast_input.text().partition(":")
         self.network_config = {
             'ip_address': self.ip_input.text(),
-            'port': self.port_input.text()
+            'port': self.port_input.text(),
+            'multicast_enabled': self.multicast_check.isChecked(),
+            'multicast_group': multicast_group.strip() or Config.DEFAULT_MULTICAST_GROUP,
+            'multicast_port': int(multicast_port) if multicast_port.strip().isdigit()
+            else Config.DEFAULT_MULTICAST_PORT
         }
         if self.lora_config is not None:
             self.lora_config = {
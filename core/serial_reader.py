@@ -1,9 +1,13 @@
+import json
 import serial
 import time
 import re
 import logging
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 
+from core.uplink_scheduler import UplinkScheduler, UplinkPriority
+from core.event_bus import EventBus, SERIAL_TELEMETRY, SERIAL_AUXILIARY, SERIAL_TRANSMISSION
+
 
 # ======================================
 # Klasa wątku: QThread do odczytu LoRa
@@ -13,10 +17,11 @@ class SerialThread(QThread):
     auxiliary_received = pyqtSignal(dict)
     transmission_info_received = pyqtSignal(dict)
 
-    def __init__(self, ser, logger):
+    def __init__(self, ser, logger, bus=None):
         super().__init__()
         self.ser = ser
         self.logger = logger
+        self.bus = bus or EventBus()
         self.running = True
 
     def run(self):
@@ -50,6 +55,7 @@ class SerialThread(QThread):
                     'snr': int(match.group(3))
                 }
                 self.transmission_info_received.emit(transmission)
+                self.bus.publish(SERIAL_TRANSMISSION, transmission)
             return
 
         match = re.search(r'"([0-9A-Fa-f]+)"', line)
@@ -74,14 +80,16 @@ class SerialThread(QThread):
                     'rbs': float(data[5])
                 }
                 self.telemetry_received.emit(telemetry)
+                self.bus.publish(SERIAL_TELEMETRY, telemetry)
 
             elif prefix == "B" and len(data) >= 3:
                 auxiliary = {
-                    'latitude': data[0],
-                    'longitude': data[1],
+                    'latitude': float(data[0]),
+                    'longitude': float(data[1]),
                     'status': int(data[2])
                 }
                 self.auxiliary_received.emit(auxiliary)
+                self.bus.publish(SERIAL_AUXILIARY, auxiliary)
 
         except Exception as e:
             self.logger.error(f"Błąd dekodowania w wątku: {e}")
@@ -97,9 +105,11 @@ class SerialReader(QObject):
     auxiliary_received = pyqtSignal(dict)
     transmission_info_received = pyqtSignal(dict)
 
-    def __init__(self, port="COM7", baudrate=9600, transmitter=None):
+    def __init__(self, port="COM7", baudrate=9600, transmitter=None, lora_config=None, bus=None):
         super().__init__()
         self.logger = logging.getLogger('HORUS_FAS.serial_reader')
+        # Zdekodowane ramki trafiają też na magistralę - odbiorcy spoza GUI nie muszą łączyć sygnałów Qt
+        self.bus = bus or EventBus()
         self.port = port
         self.baudrate = baudrate
         self.transmitter = transmitter
@@ -108,9 +118,13 @@ class SerialReader(QObject):
         self.thread = None
         self.running = False  # 🔹 to musi być!
 
+        # Wszystkie zapisy do UART przechodzą przez jeden wątek nadawczy
+        self.uplink = UplinkScheduler(self._write, lora_config=lora_config)
+
         try:
             self.ser = serial.Serial(self.port, self.baudrate, timeout=0.5)
             self.logger.info(f"Otworzono port {self.port} z baudrate {self.baudrate}")
+            self.uplink.start()
         except serial.SerialException as e:
             self.logger.error(f"Błąd otwierania portu {self.port}: {e}")
 
@@ -123,7 +137,7 @@ class SerialReader(QObject):
             return
 
         self.running = True
-        self.thread = SerialThread(self.ser, self.logger)
+        self.thread = SerialThread(self.ser, self.logger, self.bus)
 
         # 🔹 połącz sygnały z GUI
         self.thread.telemetry_received.connect(self.telemetry_received)
@@ -143,6 +157,8 @@ class SerialReader(QObject):
             self.thread.wait(1000)
             self.thread = None
 
+        self.uplink.stop()
+
         if self.ser and self.ser.is_open:
             try:
                 self.ser.close()
@@ -193,8 +209,8 @@ class SerialReader(QObject):
                             self.logger.warning(f"Niewystarczająca liczba danych B: {data}")
                             return
                         auxiliary = {
-                            'latitude': data[0],
-                            'longitude': data[1],
+                            'latitude': float(data[0]),
+                            'longitude': float(data[1]),
                             'status': int(data[2])
                         }
                         self.logger.info(
@@ -231,7 +247,25 @@ class SerialReader(QObject):
             else:
                 self.logger.debug("Nie rozpoznano formatu linii transmisyjnej")
 
-    def send_data(self, data: str):
+    def send_data(self, data: str, priority=UplinkPriority.COMMAND, coalesce_key=None):
+        """Kolejkuje dane do wysłania przez wątek nadawczy UART."""
+        if self.ser is None or not self.ser.is_open:
+            self.logger.warning("Port szeregowy nie jest dostępny – nie wysyłam")
+            return
+
+        self.uplink.submit(data, priority, coalesce_key)
+
+    def relay_command(self, data):
+        """Polecenie od partnera z sieci - abort z najwyższym priorytetem, pozostałe scalane w kolejce."""
+        command = str(data.get('command', '')) if isinstance(data, dict) else ''
+        payload = json.dumps(data)
+        if command.lower() == 'abort':
+            self.send_data(payload, UplinkPriority.ABORT)
+        else:
+            # Powtórzone polecenia z sieci zastępują oczekujące w kolejce
+            self.send_data(payload, UplinkPriority.COMMAND, coalesce_key=('network', command or payload))
+
+    def _write(self, data: str):
         if self.ser is None or not self.ser.is_open:
             self.logger.warning("Port szeregowy nie jest dostępny – nie wysyłam")
             return
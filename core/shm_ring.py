@@ -0,0 +1,191 @@
+import os
+import math
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Pola rekordu po ProcessData; brakujące pola nie trafiają do odczytanego słownika
+FIELDS = ('pitch', 'roll', 'yaw', 'ver_velocity', 'altitude', 'rbs',
+          'latitude', 'longitude', 'status', 'len', 'rssi', 'snr')
+INTEGER_FIELDS = {'status', 'len', 'rssi', 'snr'}
+
+MAGIC = 0x48525347  # "HRSG"
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'),
+    ('version', '<u4'),
+    ('capacity', '<u8'),
+    ('write_index', '<u8'),
+    ('writer_pid', '<u8'),
+])
+HEADER_SIZE = 64
+SLOT_DTYPE = np.dtype([
+    ('sequence', '<u8'),
+    ('timestamp', '<f8'),
+    ('present', '<u8'),
+    ('values', '<f8', (len(FIELDS),)),
+])
+
+
+class ShmRing:
+    """Pierścień rekordów telemetrii w multiprocessing.shared_memory.
+
+    Jeden pisarz (proces akwizycji), dowolnie wielu czytelników (GUI).
+    Pisarz nigdy nie czeka na czytelnika - nadpisuje najstarsze sloty.
+    Każdy slot ma licznik sekwencji (seqlock): przed zapisem rekordu n
+    ustawiany na 2n+1, po zapisie na 2n+2, a dopiero potem rośnie
+    write_index w nagłówku. Czytelnik sprawdza licznik przed i po
+    skopiowaniu slotu, więc rozpoznaje slot nadpisany w trakcie odczytu
+    i liczy go jako utracony (overrun).
+
+    Procesy zapisują liczby 64-bitowe wyrównane do 8 bajtów - na x86 i
+    ARMv8 takie zapisy są niepodzielne, a podwójne sprawdzenie licznika
+    odrzuca rozdarte sloty.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        if self.header['magic'] != MAGIC or self.header['version'] != VERSION:
+            self.header = None
+            raise ValueError(f"Shared memory {shm.name} is not a telemetry ring")
+        self.capacity = int(self.header['capacity'])
+        self.slots = np.ndarray((self.capacity,), dtype=SLOT_DTYPE, buffer=shm.buf, offset=HEADER_SIZE)
+        self._sequence = self.slots['sequence']
+        self._timestamp = self.slots['timestamp']
+        self._present = self.slots['present']
+        self._values = self.slots['values']
+
+    @classmethod
+    def create(cls, capacity, name=None):
+        size = HEADER_SIZE + capacity * SLOT_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['capacity'] = capacity
+        header['write_index'] = 0
+        del header
+        np.ndarray((capacity,), dtype=SLOT_DTYPE, buffer=shm.buf, offset=HEADER_SIZE)['sequence'] = 0
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def write_index(self):
+        return int(self.header['write_index'])
+
+    def close(self):
+        """Odłącza pamięć; właściciel dodatkowo ją usuwa."""
+        if self.shm is None:
+            return
+        # Widoki numpy trzymają bufor - bez ich usunięcia SharedMemory.close() zgłasza BufferError
+        self.header = self.slots = self._sequence = self._timestamp = self._present = self._values = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+
+class ShmRingWriter:
+    """Strona pisarza - proces akwizycji. Indeks zapisu trzymany lokalnie, nagłówek tylko go publikuje."""
+
+    def __init__(self, ring):
+        self.ring = ring
+        self._index = ring.write_index
+        self._scratch = np.zeros(len(FIELDS))
+        ring.header['writer_pid'] = os.getpid()
+
+    def close(self):
+        """Odłącza pisarza od pierścienia - kolejne append() są ignorowane."""
+        self.ring = None
+
+    def append(self, timestamp, record: dict):
+        ring = self.ring
+        if ring is None:
+            return None
+        index = self._index
+        slot = index % ring.capacity
+
+        present = 0
+        values = self._scratch
+        for bit, field in enumerate(FIELDS):
+            value = record.get(field)
+            if value is None or value == '':
+                continue
+            try:
+                values[bit] = float(value)
+            except (TypeError, ValueError):
+                continue
+            present |= 1 << bit
+
+        # Kolejność zapisów: licznik nieparzysty, dane, licznik parzysty, indeks w nagłówku
+        ring._sequence[slot] = 2 * index + 1
+        ring._timestamp[slot] = timestamp
+        ring._present[slot] = present
+        ring._values[slot] = values
+        ring._sequence[slot] = 2 * index + 2
+        ring.header['write_index'] = index + 1
+        self._index = index + 1
+        return index
+
+
+class ShmRingReader:
+    """Strona czytelnika. read() zwraca rekordy od ostatniego odczytu i liczbę utraconych."""
+
+    def __init__(self, ring, from_start=False):
+        self.ring = ring
+        self.next_index = 0 if from_start else ring.write_index
+        self.lost = 0
+
+    @property
+    def backlog(self):
+        return self.ring.write_index - self.next_index
+
+    def read(self, max_count=None):
+        ring = self.ring
+        capacity = ring.capacity
+        write_index = ring.write_index
+
+        lost = 0
+        if write_index - self.next_index > capacity:
+            # Pisarz okrążył czytelnika - rekordy sprzed okna pierścienia są już nadpisane
+            lost = write_index - capacity - self.next_index
+            self.next_index = write_index - capacity
+        end = write_index if max_count is None else min(write_index, self.next_index + max_count)
+        if end <= self.next_index:
+            self.lost += lost
+            return [], lost
+
+        indices = np.arange(self.next_index, end, dtype=np.uint64)
+        slots = (indices % capacity).astype(np.intp)
+        sequence_before = ring._sequence[slots]
+        timestamps = ring._timestamp[slots]
+        present = ring._present[slots]
+        values = ring._values[slots]
+        sequence_after = ring._sequence[slots]
+
+        expected = 2 * indices + 2
+        valid = (sequence_before == expected) & (sequence_after == expected)
+        lost += int(len(indices) - np.count_nonzero(valid))
+        self.next_index = end
+        self.lost += lost
+
+        records = []
+        for timestamp, mask, row in zip(timestamps[valid], present[valid], values[valid]):
+            mask = int(mask)
+            record = {}
+            for bit, field in enumerate(FIELDS):
+                if mask >> bit & 1:
+                    value = float(row[bit])
+                    record[field] = int(value) if field in INTEGER_FIELDS and math.isfinite(value) else value
+            records.append((float(timestamp), record))
+        return records, lost
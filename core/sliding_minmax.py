@@ -0,0 +1,71 @@
+from collections import deque
+
+import numpy as np
+
+
+class SlidingMinMax:
+    """Minimum and maximum over a sliding time window in O(1) amortized time.
+
+    Two monotonic deques of (index, timestamp, value) are kept: the minimum
+    deque has increasing values, the maximum deque decreasing ones, so the
+    current extremes are always at their fronts. Samples must arrive with
+    non-decreasing timestamps.
+    """
+
+    def __init__(self):
+        self._min = deque()
+        self._max = deque()
+        self._count = 0
+
+    def __bool__(self):
+        return bool(self._min)
+
+    def append(self, timestamp, value):
+        entry = (self._count, timestamp, value)
+        self._count += 1
+
+        while self._min and self._min[-1][2] >= value:
+            self._min.pop()
+        self._min.append(entry)
+
+        while self._max and self._max[-1][2] <= value:
+            self._max.pop()
+        self._max.append(entry)
+
+    def expire(self, min_time, keep_last=None):
+        """Drops samples older than min_time or outside the last keep_last samples."""
+        min_index = self._count - keep_last if keep_last is not None else 0
+        for window in (self._min, self._max):
+            while window and (window[0][1] < min_time or window[0][0] < min_index):
+                window.popleft()
+
+    def minimum(self):
+        return self._min[0][2] if self._min else None
+
+    def maximum(self):
+        return self._max[0][2] if self._max else None
+
+    def clear(self):
+        self._min.clear()
+        self._max.clear()
+
+    def rebuild(self, timestamps, values, min_time):
+        """Rebuilds the deques from sorted buffers, starting at min_time."""
+        self.clear()
+        self._count = len(values)
+        start = int(np.searchsorted(timestamps, min_time, side='left'))
+        window_values = np.asarray(values[start:])
+        if not len(window_values):
+            return
+
+        # Zostają tylko próbki mniejsze (większe) od wszystkich późniejszych
+        reversed_values = window_values[::-1]
+        later_min = np.append(np.minimum.accumulate(reversed_values)[::-1][1:], np.inf)
+        later_max = np.append(np.maximum.accumulate(reversed_values)[::-1][1:], -np.inf)
+
+        for position in np.flatnonzero(window_values < later_min):
+            index = start + int(position)
+            self._min.append((index, timestamps[index], window_values[position]))
+        for position in np.flatnonzero(window_values > later_max):
+            index = start + int(position)
+            self._max.append((index, timestamps[index], window_values[position]))
@@ -0,0 +1,109 @@
+import sys
+import time
+import logging
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+from core.config import Config
+from core.metrics import MetricsRegistry
+
+# Kubełki histogramu czasu zawieszeń, w milisekundach
+STALL_BOUNDS_MS = (250, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class StallWatchdog(QObject):
+    """Wykrywa zawieszenia pętli zdarzeń Qt i zapisuje, co wtedy robił wątek GUI.
+
+    Timer w wątku GUI co heartbeat_ms zapisuje znacznik czasu. Osobny
+    wątek sprawdza go kilka razy na okres; gdy bicie spóźnia się ponad
+    threshold_ms, pobiera stos wątku GUI przez sys._current_frames() i
+    loguje go. Przy dłuższym zawieszeniu stos jest pobierany ponownie po
+    2x, 4x, ... progu - zmiana stosu pokazuje, przez co przechodził wątek
+    (np. setHtml, eksport, synchroniczne wysyłanie). Po wznowieniu pętli
+    czas zawieszenia trafia do histogramu loop.stall_ms rejestru metryk
+    i do logu razem z dotychczasowym rozkładem.
+    """
+
+    def __init__(self, registry=None, threshold_ms=Config.STALL_THRESHOLD_MS,
+                 heartbeat_ms=Config.STALL_HEARTBEAT_MS, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.stall_watchdog')
+        self.threshold = threshold_ms / 1000
+        self.interval = heartbeat_ms / 1000
+        # Obserwowany jest wątek, w którym powstał watchdog - wątek GUI
+        self.thread_id = threading.get_ident()
+
+        registry = registry or MetricsRegistry()
+        self.stalls = registry.counter('loop.stalls')
+        self.durations = registry.histogram('loop.stall_ms', STALL_BOUNDS_MS)
+        self.longest = 0.0
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setTimerType(Qt.PreciseTimer)
+        self.heartbeat.timeout.connect(self._beat)
+        self._last_beat = time.monotonic()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def start(self):
+        self._last_beat = time.monotonic()
+        self.heartbeat.start(int(self.interval * 1000))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="StallWatchdog")
+        self._thread.start()
+        self.logger.info(f"Stall watchdog started (heartbeat {self.interval * 1000:.0f} ms, "
+                         f"threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self):
+        self.heartbeat.stop()
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self):
+        stalled_beat = None  # znacznik ostatniego bicia przed trwającym zawieszeniem
+        next_capture = self.threshold
+        last_stack = None
+        while not self._stop_event.wait(self.interval / 4):
+            last_beat = self._last_beat
+            if stalled_beat is not None and last_beat != stalled_beat:
+                self._stall_ended(last_beat - stalled_beat - self.interval)
+                stalled_beat, last_stack = None, None
+                continue
+
+            overdue = time.monotonic() - last_beat - self.interval
+            if overdue < (self.threshold if stalled_beat is None else next_capture):
+                continue
+
+            if stalled_beat is None:
+                stalled_beat = last_beat
+                next_capture = self.threshold
+            stack = self._capture_stack()
+            if stack == last_stack:
+                self.logger.warning(f"UI still stalled after {overdue * 1000:.0f} ms, same main thread stack")
+            else:
+                self.logger.warning(f"UI stalled for {overdue * 1000:.0f} ms, main thread stack:\n{stack}")
+            last_stack = stack
+            next_capture *= 2
+
+    def _capture_stack(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return "(main thread not found)"
+        return ''.join(traceback.format_stack(frame))
+
+    def _stall_ended(self, duration):
+        milliseconds = 1000 * duration
+        self.stalls.inc()
+        self.durations.observe(milliseconds)
+        self.longest = max(self.longest, milliseconds)
+        histogram = ", ".join(f"{'>' + str(STALL_BOUNDS_MS[-1]) if bound == 'inf' else '≤' + str(bound)} ms: {count}"
+                              for bound, count in self.durations.counts().items() if count)
+        self.logger.warning(f"UI stall ended after {milliseconds:.0f} ms - {self.stalls.value} stalls this session, "
+                            f"longest {self.longest:.0f} ms; durations {histogram}")
@@ -0,0 +1,103 @@
+import sys
+import time
+import logging
+import builtins
+import importlib.util
+import threading
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Czasy etapów startu aplikacji i importów modułów.
+
+    Hak na builtins.__import__ działa jak `python -X importtime`: dla każdej
+    instrukcji import, która załadowała nowe moduły, zapisuje czas własny
+    i łączny (z importami zagnieżdżonymi). Liczone są tylko importy wątku,
+    który zainstalował hak. Etapy mierzy phase(); etapy interaktywne
+    (okno konfiguracji czekające na użytkownika) nie wliczają się do czasu
+    do pierwszego okna. report() zapisuje wszystko do logu sesji.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger('HORUS_FAS.startup')
+        self.started = time.perf_counter()
+        self.phases = []  # (nazwa, początek, czas trwania, interaktywny)
+        self.marks = []  # (nazwa, czas od startu)
+        self.imports = []  # (moduł, czas własny, czas łączny, zagłębienie)
+        self._original_import = None
+        self._thread = None
+        self._children = []
+
+    def install_import_hook(self):
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        self._thread = threading.get_ident()
+        builtins.__import__ = self._timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if threading.get_ident() != self._thread:
+            return original(name, globals, locals, fromlist, level)
+
+        loaded = len(sys.modules)
+        self._children.append(0.0)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - started
+            children = self._children.pop()
+            if len(sys.modules) > loaded:
+                if level and globals and globals.get('__package__'):
+                    name = importlib.util.resolve_name('.' * level + name, globals['__package__'])
+                if fromlist and fromlist != ('*',):
+                    name = f"{name} ({', '.join(fromlist)})"
+                self.imports.append((name, cumulative - children, cumulative, len(self._children)))
+                if self._children:
+                    self._children[-1] += cumulative
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name, interactive=False):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, started - self.started, time.perf_counter() - started, interactive))
+
+    def mark(self, name):
+        self.marks.append((name, self.elapsed()))
+        self.logger.info(f"{name}: {self.elapsed() * 1000:.0f} ms od startu "
+                         f"({self.active_elapsed() * 1000:.0f} ms bez oczekiwania na użytkownika)")
+
+    def active_elapsed(self):
+        """Czas od startu bez etapów interaktywnych, które już się zakończyły."""
+        return self.elapsed() - sum(duration for _, _, duration, interactive in self.phases if interactive)
+
+    def report(self, min_import_ms=5.0, top=25):
+        self.logger.info("Raport startu - etapy:")
+        for name, start, duration, interactive in self.phases:
+            suffix = " (interaktywny)" if interactive else ""
+            self.logger.info(f"  {start * 1000:8.1f} ms  +{duration * 1000:8.1f} ms  {name}{suffix}")
+        for name, at in self.marks:
+            self.logger.info(f"  {at * 1000:8.1f} ms  {name}")
+
+        if not self.imports:
+            return
+        total = sum(cumulative for _, _, cumulative, depth in self.imports if depth == 0)
+        self.logger.info(f"Raport startu - importy ({len(self.imports)} instrukcji, łącznie {total * 1000:.1f} ms), "
+                         f"najwolniejsze [czas własny | łączny]:")
+        slowest = sorted(self.imports, key=lambda item: item[2], reverse=True)[:top]
+        for name, own, cumulative, depth in slowest:
+            if cumulative * 1000 < min_import_ms:
+                break
+            self.logger.info(f"  {own * 1000:8.1f} | {cumulative * 1000:8.1f} ms  {'  ' * depth}{name}")
@@ -0,0 +1,217 @@
+import math
+import logging
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative error guarantee (DDSketch).
+
+    Values are counted in logarithmic buckets of width gamma, so any
+    reported quantile is within relative_accuracy of an actual value from
+    the stream. Memory grows with the logarithm of the value range, not
+    with the number of samples. Negative values use a mirrored set of
+    buckets and values close to zero share one bucket.
+    """
+
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._positive = {}
+        self._negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, magnitude):
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value):
+        if value > self.MIN_VALUE:
+            key = self._key(value)
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value < -self.MIN_VALUE:
+            key = self._key(-value)
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        for buckets, magnitudes in ((self._positive, values[values > self.MIN_VALUE]),
+                                    (self._negative, -values[values < -self.MIN_VALUE])):
+            if not len(magnitudes):
+                continue
+            keys, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                buckets[key] = buckets.get(key, 0) + count
+        self.zero_count += int(np.count_nonzero(np.abs(values) <= self.MIN_VALUE))
+        self.count += len(values)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for buckets, other_buckets in ((self._positive, other._positive), (self._negative, other._negative)):
+            for key, count in other_buckets.items():
+                buckets[key] = buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self._positive)) if self._positive else 0.0
+
+    def clear(self):
+        self._positive.clear()
+        self._negative.clear()
+        self.zero_count = 0
+        self.count = 0
+
+
+class RunningStats:
+    """Statystyki jednego kanału liczone przyrostowo (Welford) dla całej sesji."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.minimum_time = None
+        self.maximum_time = None
+        self.sketch.clear()
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def add(self, timestamp, value):
+        if not math.isfinite(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.minimum is None or value < self.minimum:
+            self.minimum, self.minimum_time = value, timestamp
+        if self.maximum is None or value > self.maximum:
+            self.maximum, self.maximum_time = value, timestamp
+        self.sketch.add(value)
+
+    def extend(self, timestamps, values):
+        """Dodaje całą serię naraz - wektorowo, łącząc momenty wzorem Chana."""
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        finite = np.isfinite(values)
+        values, timestamps = values[finite], timestamps[finite]
+        if not len(values):
+            return
+
+        batch = RunningStats(self.sketch.relative_accuracy)
+        batch.count = len(values)
+        batch.mean = float(np.mean(values))
+        batch._m2 = float(np.sum((values - batch.mean) ** 2))
+        low, high = int(np.argmin(values)), int(np.argmax(values))
+        batch.minimum, batch.minimum_time = float(values[low]), float(timestamps[low])
+        batch.maximum, batch.maximum_time = float(values[high]), float(timestamps[high])
+        batch.sketch.extend(values)
+        self.merge(batch)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum, self.minimum_time = other.minimum, other.minimum_time
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum, self.maximum_time = other.maximum, other.maximum_time
+        self.sketch.merge(other.sketch)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'min': self.minimum,
+            'min_time': self.minimum_time,
+            'max': self.maximum,
+            'max_time': self.maximum_time,
+            'mean': self.mean,
+            'std': self.std,
+            'p5': self.sketch.quantile(0.05),
+            'p50': self.sketch.quantile(0.50),
+            'p95': self.sketch.quantile(0.95),
+        }
+
+
+class StreamingStatistics:
+    """Whole-session statistics of every TelemetryStore channel.
+
+    Subscribes to the store, so each appended row costs O(1) per channel and
+    reading the statistics never scans the data. When the store content is
+    replaced the statistics are rebuilt from the columns in one pass.
+    """
+
+    def __init__(self, store, relative_accuracy=0.01):
+        self.logger = logging.getLogger('HORUS_FAS.streaming_stats')
+        self.store = store
+        self.channels = {name: RunningStats(relative_accuracy) for name in store.all_channels}
+        self.rebuild()
+        store.subscribe(self._on_row_appended)
+
+    def __getitem__(self, channel):
+        return self.channels[channel]
+
+    def _on_row_appended(self, index):
+        if index is None:
+            self.rebuild()
+            return
+        timestamp = float(self.store.times()[index])
+        for name, stats in self.channels.items():
+            stats.add(timestamp, float(self.store.column(name)[index]))
+
+    def rebuild(self):
+        times = self.store.times()
+        for name, stats in self.channels.items():
+            stats.clear()
+            stats.extend(times, self.store.column(name))
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self.channels.items()}
+
+    def close(self):
+        self.store.unsubscribe(self._on_row_appended)
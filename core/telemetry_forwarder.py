@@ -0,0 +1,62 @@
+import logging
+from datetime import datetime
+
+
+def build_transmit_data(data: dict):
+    """Rekord w formacie, którego oczekuje partner (HORUS CSS)."""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'telemetry': {
+            'velocity': data.get('ver_velocity', 0),
+            'altitude': data.get('altitude', 0),
+            'latitude': data.get('latitude', 0),
+            'longitude': data.get('longitude', 0),
+            'pitch': data.get('pitch', 0),
+            'roll': data.get('roll', 0),
+            'yaw': data.get('yaw', 0),
+            'status': data.get('status', 0),
+            'rbs': data.get('bcs', 0)
+            # 'bay_pressure': data.get('bay_pressure',0.0),
+            # 'bay_temperature': data.get('bay_temperature',0.0)
+        },
+        'transmission': {
+            'rssi': data.get('rssi', 0),
+            'snr': data.get('snr', 0)
+        }
+    }
+
+
+class TelemetryForwarder:
+    """Przekazuje przetworzone rekordy dalej: multicast, partner TCP albo outbox.
+
+    Wspólne dla okna głównego i trybu bez GUI. Gdy partner jest
+    niedostępny, rekord trafia do outboxa i zostanie odtworzony po
+    ponownym połączeniu.
+    """
+
+    def __init__(self, transmitter=None, outbox=None, multicast=None):
+        self.logger = logging.getLogger('HORUS_FAS.telemetry_forwarder')
+        self.transmitter = transmitter
+        self.outbox = outbox
+        self.multicast = multicast
+        self.sent = 0
+        self.queued = 0
+        self.dropped = 0
+
+    def forward(self, data: dict):
+        transmit_data = build_transmit_data(data)
+
+        if self.multicast:
+            self.multicast.publish(transmit_data)
+
+        if self.transmitter and self.transmitter.is_connected() and self.transmitter.send_data(transmit_data):
+            self.sent += 1
+            self.logger.debug(f"The following data has been send to partner: {transmit_data}")
+        elif self.outbox:
+            self.outbox.append(transmit_data)
+            self.queued += 1
+            self.logger.debug("No partner connected - record stored in outbox")
+        else:
+            self.dropped += 1
+            self.logger.error("No partner connected")
+        return transmit_data
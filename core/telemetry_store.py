@@ -0,0 +1,135 @@
+import logging
+
+import numpy as np
+
+from core.growable_array import GrowableArray
+from core.minmax_pyramid import MinMaxPyramid
+
+
+class TelemetryStore:
+    """Columnar, time-indexed store of the whole session.
+
+    All channels share one time column. Plots, statistics and exports read
+    zero-copy views of the columns instead of keeping their own copies.
+    Derived channels (time derivatives of another channel) are computed
+    incrementally on append. Every channel also has a MinMaxPyramid for
+    level-of-detail rendering.
+    """
+
+    TELEMETRY_CHANNELS = ('altitude', 'ver_velocity', 'pitch', 'roll', 'yaw')
+    DERIVATIVES = {'ver_accel': 'ver_velocity'}
+
+    def __init__(self, channels=TELEMETRY_CHANNELS, derivatives=None):
+        self.logger = logging.getLogger('HORUS_FAS.telemetry_store')
+        self.channels = tuple(channels)
+        self.derivatives = dict(self.DERIVATIVES if derivatives is None else derivatives)
+        self.all_channels = self.channels + tuple(self.derivatives)
+
+        self._times = GrowableArray()
+        self._columns = {name: GrowableArray() for name in self.all_channels}
+        self._pyramids = {name: MinMaxPyramid() for name in self.all_channels}
+        self._subscribers = []
+
+    def __len__(self):
+        return len(self._times)
+
+    def times(self):
+        return self._times.view()
+
+    def column(self, channel):
+        return self._columns[channel].view()
+
+    def pyramid(self, channel):
+        return self._pyramids[channel]
+
+    def row(self, index):
+        return {name: float(self._columns[name].view()[index]) for name in self.all_channels}
+
+    def nearest_index(self, timestamp):
+        """Index of the sample closest in time, found by bisection."""
+        times = self._times.view()
+        if not len(times):
+            return None
+        index = int(np.searchsorted(times, timestamp))
+        if index == len(times):
+            return index - 1
+        if index > 0 and timestamp - times[index - 1] <= times[index] - timestamp:
+            return index - 1
+        return index
+
+    def subscribe(self, callback):
+        """callback(index) is called after every appended row."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def append(self, timestamp, record: dict):
+        """Appends one row, returns its index or None when the record has no channel values."""
+        if not any(name in record for name in self.channels):
+            return None
+
+        previous = len(self._times) - 1
+        previous_time = self._times.last()
+        self._times.append(timestamp)
+
+        for name in self.channels:
+            column = self._columns[name]
+            # Brakujące wartości są przenoszone z poprzedniego wiersza
+            value = float(record.get(name, column.last(0.0)))
+            column.append(value)
+            self._pyramids[name].append(timestamp, value)
+
+        for name, source in self.derivatives.items():
+            value = 0.0
+            if previous >= 0:
+                dt = timestamp - previous_time
+                if dt > 0:
+                    source_column = self._columns[source].view()
+                    value = (source_column[-1] - source_column[previous]) / dt
+            self._columns[name].append(value)
+            self._pyramids[name].append(timestamp, value)
+
+        index = len(self._times) - 1
+        for callback in self._subscribers:
+            callback(index)
+        return index
+
+    def set_data(self, timestamps, columns: dict):
+        """Replaces the whole store content, derivatives are recomputed."""
+        self._times.clear()
+        self._times.extend(timestamps)
+        times = self._times.view()
+
+        for name in self.channels:
+            column = self._columns[name]
+            column.clear()
+            column.extend(columns.get(name, np.zeros(len(times))))
+
+        for name, source in self.derivatives.items():
+            values = self._columns[source].view()
+            derivative = np.zeros(len(times))
+            if len(times) > 1:
+                dt = np.diff(times)
+                dv = np.diff(values)
+                np.divide(dv, dt, out=derivative[1:], where=dt > 0)
+            column = self._columns[name]
+            column.clear()
+            column.extend(derivative)
+
+        for name in self.all_channels:
+            self._pyramids[name].build(times, self._columns[name].view())
+
+        for callback in self._subscribers:
+            callback(None)
+
+    def clear(self):
+        self.set_data([], {})
+
+    def snapshot(self):
+        """Copies of all columns, safe to hand to another thread."""
+        data = {'timestamp': self._times.view().copy()}
+        for name in self.all_channels:
+            data[name] = self._columns[name].view().copy()
+        return data
@@ -0,0 +1,147 @@
+import os
+import math
+import logging
+import threading
+import urllib.request
+from collections import OrderedDict
+
+from core.config import Config
+from core.utils import Utils
+
+
+def tile_for(lat, lon, zoom):
+    """Numer kafelka (x, y) w siatce Web Mercator dla danego punktu."""
+    lat = max(min(lat, 85.0511), -85.0511)
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_in_bbox(south, west, north, east, zoom):
+    x_min, y_min = tile_for(north, west, zoom)
+    x_max, y_max = tile_for(south, east, zoom)
+    for x in range(x_min, x_max + 1):
+        for y in range(y_min, y_max + 1):
+            yield zoom, x, y
+
+
+def bbox_around(lat, lon, radius_km):
+    """(south, west, north, east) kwadratu o połowie boku radius_km."""
+    dlat = radius_km / 111.32
+    dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+class TileCache:
+    """Dyskowa pamięć kafelków mapy z limitem rozmiaru (LRU).
+
+    Kafelki leżą w directory/z/x/y.png. Kolejność użycia jest odtwarzana
+    z czasów modyfikacji plików przy starcie i aktualizowana przy każdym
+    odczycie, a po przekroczeniu max_bytes usuwane są najdawniej używane.
+    """
+
+    def __init__(self, directory=None, max_bytes=Config.TILE_CACHE_MAX_MB * 2 ** 20,
+                 url_template=Config.TILE_URL_TEMPLATE, user_agent=Config.TILE_USER_AGENT, online=True, timeout=10):
+        self.logger = logging.getLogger('HORUS_FAS.tile_cache')
+        self.directory = directory or os.path.join(Utils.get_appdata_path(), 'tile_cache')
+        self.max_bytes = max_bytes
+        self.url_template = url_template
+        self.user_agent = user_agent
+        self.online = online
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._index = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, tile):
+        return self.path(*tile) in self._index
+
+    def path(self, z, x, y):
+        return os.path.join(self.directory, str(z), str(x), f"{y}.png")
+
+    def _load_index(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.png'):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self._index[path] = size
+            self.size_bytes += size
+        self.logger.info(f"Tile cache {self.directory}: {len(self._index)} tiles, "
+                         f"{self.size_bytes / 2 ** 20:.1f} MB")
+        with self._lock:
+            self._evict()
+
+    def get(self, z, x, y):
+        path = self.path(z, x, y)
+        with self._lock:
+            if path not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(path)
+            self.hits += 1
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError as e:
+            self.logger.warning(f"Cannot read tile {path}: {e}")
+            with self._lock:
+                self.size_bytes -= self._index.pop(path, 0)
+            return None
+
+    def put(self, z, x, y, data):
+        path = self.path(z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+        with self._lock:
+            self.size_bytes += len(data) - self._index.pop(path, 0)
+            self._index[path] = len(data)
+            self._evict()
+
+    def fetch(self, z, x, y):
+        """Pobiera kafelek z serwera i zapisuje go w pamięci podręcznej."""
+        url = self.url_template.format(z=z, x=x, y=y)
+        request = urllib.request.Request(url, headers={'User-Agent': self.user_agent})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            data = response.read()
+        self.put(z, x, y, data)
+        return data
+
+    def get_or_fetch(self, z, x, y):
+        data = self.get(z, x, y)
+        if data is not None or not self.online:
+            return data
+        try:
+            return self.fetch(z, x, y)
+        except OSError as e:
+            self.logger.debug(f"Tile {z}/{x}/{y} unavailable: {e}")
+            return None
+
+    def _evict(self):
+        """Usuwa najdawniej używane kafelki (wywoływane z zablokowanym _lock)."""
+        while self.size_bytes > self.max_bytes and self._index:
+            path, size = self._index.popitem(last=False)
+            self.size_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
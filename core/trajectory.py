@@ -0,0 +1,164 @@
+import math
+import logging
+
+import numpy as np
+
+from core.growable_array import GrowableArray
+
+EARTH_RADIUS = 6371008.8
+WEB_MERCATOR_RESOLUTION = 156543.03392  # m/px na równiku przy zoomie 0
+
+
+def meters_per_pixel(lat, zoom):
+    return WEB_MERCATOR_RESOLUTION * math.cos(math.radians(lat)) / 2 ** zoom
+
+
+def segment_distances(x, y, x0, y0, x1, y1):
+    """Odległości punktów (x, y) od odcinka (x0, y0)-(x1, y1)."""
+    dx, dy = x1 - x0, y1 - y0
+    length = dx * dx + dy * dy
+    if length == 0:
+        return np.hypot(x - x0, y - y0)
+    t = np.clip(((x - x0) * dx + (y - y0) * dy) / length, 0.0, 1.0)
+    return np.hypot(x - (x0 + t * dx), y - (y0 + t * dy))
+
+
+def douglas_peucker(x, y, tolerance):
+    """Indeksy punktów zachowanych przez Douglasa-Peuckera (iteracyjnie, bez rekurencji)."""
+    count = len(x)
+    if count < 3:
+        return np.arange(count)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = segment_distances(x[start + 1:end], y[start + 1:end], x[start], y[start], x[end], y[end])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = start + 1 + farthest
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return np.flatnonzero(keep)
+
+
+class Trajectory:
+    """Pełny ślad GPS w tablicach liczbowych i jego uproszczenie dla mapy.
+
+    Nowe punkty są upraszczane strumieniowo metodą otwieranego okna: punkt
+    staje się wierzchołkiem, gdy odcinek od ostatniego wierzchołka do
+    bieżącej pozycji odchodzi od któregoś z pominiętych punktów o więcej
+    niż tolerancja. Tolerancja to tolerance_px pikseli przy aktualnym
+    zoomie mapy. Po zmianie zoomu cały ślad upraszczany jest od nowa
+    algorytmem Douglasa-Peuckera. take_delta() zwraca tylko to, co zmieniło
+    się od poprzedniego wywołania.
+    """
+
+    def __init__(self, tolerance_px=1.5, zoom=15, max_window=256):
+        self.logger = logging.getLogger('HORUS_FAS.trajectory')
+        self.tolerance_px = tolerance_px
+        self.zoom = zoom
+        self.max_window = max_window
+
+        self.times = GrowableArray()
+        self.latitudes = GrowableArray()
+        self.longitudes = GrowableArray()
+        self._x = GrowableArray()
+        self._y = GrowableArray()
+        self.clear()
+
+    def __len__(self):
+        return len(self.times)
+
+    def clear(self):
+        for array in (self.times, self.latitudes, self.longitudes, self._x, self._y):
+            array.clear()
+        self._origin = None
+        self.tolerance = 0.0
+        self.vertices = []
+        self._anchor = None
+        self._window_start = None
+        self._new_vertices = []
+        self._reset = True
+
+    def _project(self, lat, lon):
+        """Rzut równoodległościowy wokół pierwszego punktu - wystarczający w skali lotu."""
+        lat0, lon0, scale = self._origin
+        return (lon - lon0) * scale, (lat - lat0) * (math.pi / 180 * EARTH_RADIUS)
+
+    def append(self, timestamp, lat, lon):
+        lat, lon = float(lat), float(lon)
+        if not (math.isfinite(lat) and math.isfinite(lon)) or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            self.logger.warning(f"Pomijam niepoprawną pozycję GPS: {lat}, {lon}")
+            return False
+        if len(self) and lat == self.latitudes.last() and lon == self.longitudes.last():
+            return False
+
+        if self._origin is None:
+            self._origin = (lat, lon, math.cos(math.radians(lat)) * math.pi / 180 * EARTH_RADIUS)
+            self.tolerance = self.tolerance_px * meters_per_pixel(lat, self.zoom)
+        x, y = self._project(lat, lon)
+
+        index = len(self)
+        self.times.append(timestamp)
+        self.latitudes.append(lat)
+        self.longitudes.append(lon)
+        self._x.append(x)
+        self._y.append(y)
+
+        if self._anchor is None:
+            self._commit(index)
+        elif index - self._anchor > 1:
+            self._extend_window(index)
+        return True
+
+    def _extend_window(self, index):
+        """Poprzedni ogon zostaje wierzchołkiem, jeśli odcinek kotwica-nowy punkt go nie pokrywa."""
+        tail = index - 1
+        x, y = self._x.view(), self._y.view()
+        start = self._anchor + 1
+        distances = segment_distances(x[start:index], y[start:index],
+                                      x[self._anchor], y[self._anchor], x[index], y[index])
+        if distances.max() > self.tolerance or index - self._anchor > self.max_window:
+            self._commit(tail)
+
+    def _commit(self, index):
+        self._anchor = index
+        self.vertices.append(index)
+        self._new_vertices.append(index)
+
+    def set_zoom(self, zoom):
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
+        if self._origin is None:
+            return
+        self.tolerance = self.tolerance_px * meters_per_pixel(self._origin[0], zoom)
+
+        count = len(self)
+        if count == 0:
+            return
+        # Ogon (bieżąca pozycja) nie jest wierzchołkiem - upraszczamy do ostatniej kotwicy włącznie
+        kept = douglas_peucker(self._x.view()[:count - 1], self._y.view()[:count - 1], self.tolerance) \
+            if count > 1 else np.array([0])
+        self.vertices = kept.tolist()
+        self._anchor = self.vertices[-1]
+        self._new_vertices = list(self.vertices)
+        self._reset = True
+        self.logger.debug(f"Zoom {zoom}: ślad {count} punktów -> {len(self.vertices)} wierzchołków")
+
+    def take_delta(self):
+        """(reset, nowe wierzchołki [[lat, lon], ...], ogon [lat, lon] lub None)."""
+        lat, lon = self.latitudes.view(), self.longitudes.view()
+        vertices = [[round(float(lat[i]), 7), round(float(lon[i]), 7)] for i in self._new_vertices]
+        tail = None
+        if len(self) and self._anchor != len(self) - 1:
+            tail = [round(float(lat[-1]), 7), round(float(lon[-1]), 7)]
+        reset = self._reset
+        self._new_vertices = []
+        self._reset = False
+        return reset, vertices, tail
@@ -0,0 +1,195 @@
+import math
+import time
+import logging
+import threading
+from collections import deque
+
+from core.config import Config
+
+
+class UplinkPriority:
+    ABORT = 0
+    COMMAND = 1
+    BULK = 2
+
+
+def lora_time_on_air(payload_size, spread_factor=7, bandwidth_khz=125, preamble=8,
+                     coding_rate=1, crc=True, explicit_header=True):
+    """Czas nadawania ramki LoRa w sekundach (Semtech AN1200.13)."""
+    symbol_time = (2 ** spread_factor) / (bandwidth_khz * 1000.0)
+    low_data_rate = 1 if symbol_time > 0.016 else 0
+    header = 0 if explicit_header else 1
+
+    preamble_time = (preamble + 4.25) * symbol_time
+    numerator = 8 * payload_size - 4 * spread_factor + 28 + 16 * int(crc) - 20 * header
+    payload_symbols = 8 + max(
+        math.ceil(numerator / (4.0 * (spread_factor - 2 * low_data_rate))) * (coding_rate + 4), 0)
+    return preamble_time + payload_symbols * symbol_time
+
+
+class DutyCycleBudget:
+    """Okno przesuwne czasu nadawania dla limitu duty cycle."""
+
+    def __init__(self, duty_cycle, window=Config.LORA_DUTY_CYCLE_WINDOW):
+        self.duty_cycle = duty_cycle
+        self.window = window
+        self.used = 0.0
+        self._transmissions = deque()
+
+    @property
+    def limit(self):
+        return self.duty_cycle * self.window if self.duty_cycle else float('inf')
+
+    def wait_time(self, airtime, now):
+        """Ile sekund trzeba odczekać, aby zmieścić się w budżecie."""
+        self._expire(now)
+        if self.used + airtime <= self.limit:
+            return 0.0
+
+        released = self.used
+        for sent_at, sent_airtime in self._transmissions:
+            released -= sent_airtime
+            if released + airtime <= self.limit:
+                return sent_at + self.window - now
+        return self.window
+
+    def record(self, airtime, now):
+        self._transmissions.append((now, airtime))
+        self.used += airtime
+
+    def _expire(self, now):
+        while self._transmissions and self._transmissions[0][0] + self.window <= now:
+            self.used -= self._transmissions.popleft()[1]
+
+
+class UplinkScheduler:
+    """Jedyny wątek nadawczy UART z klasami priorytetu.
+
+    Kolejność: ABORT > COMMAND > BULK. Przed wysłaniem liczony jest czas
+    nadawania ramki dla bieżących SF/BW, a kolejne ramki czekają aż radio
+    skończy nadawać i aż zmieszczą się w budżecie duty cycle. Abort pomija
+    budżet. Polecenia z tym samym kluczem są scalane - w kolejce zostaje
+    tylko najnowsza treść, na pozycji pierwszego zgłoszenia.
+    """
+
+    def __init__(self, write, lora_config=None, bulk_queue_size=256):
+        self.logger = logging.getLogger('HORUS_FAS.uplink_scheduler')
+        self._write = write
+        self._queues = {
+            UplinkPriority.ABORT: deque(),
+            UplinkPriority.COMMAND: deque(),
+            UplinkPriority.BULK: deque(maxlen=bulk_queue_size),
+        }
+        self._coalesced = {}
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._radio_busy_until = 0.0
+
+        self.sent = 0
+        self.coalesced = 0
+        self.airtime_total = 0.0
+        self.configure(lora_config)
+
+    def configure(self, lora_config):
+        lora_config = {**Config.DEFAULT_LORA_CONFIG, **(lora_config or {})}
+        self.spread_factor = int(lora_config['spread_factor'])
+        self.bandwidth_khz = float(lora_config['bandwidth'])
+        self.preamble = int(lora_config['txpr'])
+        self.crc = lora_config['crc'] == 'ON'
+        duty_cycle = Config.LORA_DUTY_CYCLE.get(str(lora_config['frequency']))
+        self.budget = DutyCycleBudget(duty_cycle)
+        self.logger.info(
+            f"Uplink: SF{self.spread_factor}, BW {self.bandwidth_khz:g} kHz, "
+            f"duty cycle {duty_cycle if duty_cycle else 'bez limitu'}")
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="UplinkScheduler")
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, data: str, priority=UplinkPriority.COMMAND, coalesce_key=None):
+        with self._condition:
+            if coalesce_key is not None and coalesce_key in self._coalesced:
+                self._coalesced[coalesce_key][1] = data
+                self.coalesced += 1
+                self.logger.debug(f"Scalono polecenie {coalesce_key}")
+                return
+
+            entry = [coalesce_key, data]
+            queue = self._queues[priority]
+            if queue.maxlen is not None and len(queue) == queue.maxlen:
+                self.logger.warning("Kolejka BULK pełna – odrzucam najstarszy wpis")
+                self._forget(queue[0])
+            queue.append(entry)
+            if coalesce_key is not None:
+                self._coalesced[coalesce_key] = entry
+            self._condition.notify()
+
+    def pending(self):
+        with self._condition:
+            return {priority: len(queue) for priority, queue in self._queues.items()}
+
+    def airtime(self, data: str):
+        return lora_time_on_air(len(data.encode("utf-8")), self.spread_factor, self.bandwidth_khz,
+                                self.preamble, crc=self.crc)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                entry, priority, airtime = self._next_ready()
+                if not self._running:
+                    return
+                if entry is None:
+                    continue
+
+            self._write(entry[1])
+            now = time.monotonic()
+            self._radio_busy_until = now + airtime
+            self.budget.record(airtime, now)
+            self.sent += 1
+            self.airtime_total += airtime
+
+    def _next_ready(self):
+        """Czeka na wpis gotowy do wysłania (wywoływane z zablokowanym warunkiem)."""
+        while self._running:
+            priority = next((p for p, queue in self._queues.items() if queue), None)
+            if priority is None:
+                self._condition.wait()
+                continue
+
+            entry = self._queues[priority][0]
+            airtime = self.airtime(entry[1])
+            now = time.monotonic()
+            wait = max(self._radio_busy_until - now, 0.0)
+            if priority != UplinkPriority.ABORT:
+                budget_wait = self.budget.wait_time(airtime, now)
+                if budget_wait > 0 and wait == 0:
+                    self.logger.debug(f"Budżet duty cycle wyczerpany – czekam {budget_wait:.1f} s")
+                wait = max(wait, budget_wait)
+            elif self.budget.wait_time(airtime, now) > 0:
+                self.logger.warning("Abort wysyłany ponad budżet duty cycle")
+
+            if wait > 0:
+                # Nowy wpis o wyższym priorytecie przerywa oczekiwanie
+                self._condition.wait(wait)
+                continue
+
+            self._queues[priority].popleft()
+            self._forget(entry)
+            return entry, priority, airtime
+        return None, None, 0.0
+
+    def _forget(self, entry):
+        if entry[0] is not None and self._coalesced.get(entry[0]) is entry:
+            del self._coalesced[entry[0]]
@@ -19,6 +19,10 @@ class Utils:
         os.makedirs(horus_dir, exist_ok=True)
         return horus_dir
 
+    @staticmethod
+    def get_headless_status_path():
+        return os.path.join(Utils.get_appdata_path(), 'headless_status.json')
+
     @staticmethod
     def create_session_directory():
         base_dir = Utils.get_appdata_path()
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QDialogButtonBox, QAbstractItemView)
+
+
+class DiagnosticsDialog(QDialog):
+    """Okno diagnostyki - ostatnia próbka MetricsSampler jako tabela nazwa/wartość.
+
+    Okno nie jest modalne i odświeża się przy każdej próbce, więc można
+    je zostawić otwarte w trakcie lotu. Wiersze są tworzone tylko dla
+    nowych metryk, istniejące dostają nowy tekst.
+    """
+
+    def __init__(self, sampler, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        self.setWindowTitle("Diagnostics")
+        self.resize(460, 640)
+        self._rows = {}
+
+        layout = QVBoxLayout()
+        self.header_label = QLabel()
+        layout.addWidget(self.header_label)
+
+        self.table = QTableWidget(0, 2)
+        self.table.setHorizontalHeaderLabels(["Metric", "Value"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+        path_label = QLabel(f"Time series: {sampler.path}" if sampler.path else "Time series export disabled")
+        path_label.setWordWrap(True)
+        layout.addWidget(path_label)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        self.setLayout(layout)
+
+        sampler.sampled.connect(self.update_metrics)
+        self.finished.connect(self._disconnect)
+        if sampler.latest:
+            self.update_metrics(sampler.latest)
+
+    def update_metrics(self, sample):
+        self.header_label.setText(f"Sampled at {datetime.fromtimestamp(sample['time']):%H:%M:%S}")
+        for name in sorted(sample):
+            if name == 'time':
+                continue
+            value = sample[name]
+            text = "—" if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+            item = self._rows.get(name)
+            if item is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                self.table.setItem(row, 0, QTableWidgetItem(name))
+                item = self._rows[name] = QTableWidgetItem()
+                self.table.setItem(row, 1, item)
+            item.setText(text)
+
+    def _disconnect(self):
+        self.sampler.sampled.disconnect(self.update_metrics)
@@ -0,0 +1,219 @@
+import os
+import logging
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal, QPointF, QRectF, Qt
+from PyQt5.QtGui import QImage, QPainter, QColor, QPen, QPolygonF, QFont
+
+BACKGROUND = QColor(32, 36, 44)
+GRID = QColor(255, 255, 255, 60)
+TEXT = QColor(220, 220, 220)
+MARGINS = (120, 50, 50, 70)  # lewy, górny, prawy, dolny - z miejscem na opisy osi
+
+
+def decimate_minmax(times, values, buckets):
+    """Min i max w każdym z `buckets` równych przedziałów czasu - kształt przebiegu bez utraty szczytów."""
+    if len(times) <= 2 * buckets:
+        return times, values
+
+    edges = np.linspace(times[0], times[-1], buckets + 1)
+    starts = np.unique(np.searchsorted(times, edges[:-1], side='left'))
+    starts = starts[starts < len(times)]
+    minimum = np.minimum.reduceat(values, starts)
+    maximum = np.maximum.reduceat(values, starts)
+    bucket_times = times[starts]
+    return np.repeat(bucket_times, 2), np.column_stack((minimum, maximum)).ravel()
+
+
+def _value_range(values):
+    low, high = float(np.min(values)), float(np.max(values))
+    padding = (high - low) * 0.1 if high > low else max(abs(low) * 0.1, 1.0)
+    return low - padding, high + padding
+
+
+def _time_label(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+
+
+def _project(times, values, width, height, x_range, y_range):
+    left, top, right, bottom = MARGINS
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+    x_span = (x_range[1] - x_range[0]) or 1.0
+    y_span = (y_range[1] - y_range[0]) or 1.0
+    x = left + (times - x_range[0]) / x_span * plot_width
+    y = top + (y_range[1] - values) / y_span * plot_height
+    return x, y
+
+
+def render_png(path, times, values, spec, width=1920, height=1080):
+    """Rysuje wykres na QImage - bezpieczne poza wątkiem GUI, w przeciwieństwie do eksporterów pyqtgraph."""
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(BACKGROUND)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setFont(QFont("Sans", 12))
+    left, top, right, bottom = MARGINS
+    plot_rect = QRectF(left, top, width - left - right, height - top - bottom)
+
+    painter.setPen(TEXT)
+    painter.drawText(QRectF(0, 0, width, top), Qt.AlignCenter, spec['title'])
+    painter.drawText(QRectF(left, height - bottom / 2, plot_rect.width(), bottom / 2), Qt.AlignCenter,
+                     spec.get('x_label', "Time"))
+    # Opis osi Y obrócony wzdłuż lewej krawędzi, jak w LivePlot
+    painter.save()
+    painter.translate(20, plot_rect.center().y())
+    painter.rotate(-90)
+    painter.drawText(QRectF(-plot_rect.height() / 2, -12, plot_rect.height(), 24), Qt.AlignCenter,
+                     spec.get('y_label', ""))
+    painter.restore()
+
+    if len(times):
+        x_range = (float(times[0]), float(times[-1]))
+        y_range = _value_range(values)
+        grid_pen = QPen(GRID)
+        for i in range(6):
+            fraction = i / 5
+            x = plot_rect.left() + fraction * plot_rect.width()
+            y = plot_rect.top() + fraction * plot_rect.height()
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(x, plot_rect.top()), QPointF(x, plot_rect.bottom()))
+            painter.drawLine(QPointF(plot_rect.left(), y), QPointF(plot_rect.right(), y))
+            painter.setPen(TEXT)
+            timestamp = x_range[0] + fraction * (x_range[1] - x_range[0])
+            painter.drawText(QRectF(x - 50, plot_rect.bottom() + 5, 100, 20), Qt.AlignCenter,
+                             _time_label(timestamp))
+            value = y_range[1] - fraction * (y_range[1] - y_range[0])
+            painter.drawText(QRectF(40, y - 10, left - 50, 20), Qt.AlignRight | Qt.AlignVCenter, f"{value:.2f}")
+
+        plot_times, plot_values = decimate_minmax(times, values, int(plot_rect.width()))
+        x, y = _project(plot_times, plot_values, width, height, x_range, y_range)
+        polygon = QPolygonF([QPointF(px, py) for px, py in zip(x.tolist(), y.tolist())])
+        painter.setClipRect(plot_rect)
+        painter.setPen(QPen(QColor(spec['color']), 2))
+        painter.drawPolyline(polygon)
+
+    painter.end()
+    if not image.save(path, "PNG"):
+        raise IOError(f"Cannot write {path}")
+
+
+def render_svg(path, times, values, spec, width=1920, height=1080):
+    left, top, right, bottom = MARGINS
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="14">',
+        f'<rect width="100%" height="100%" fill="{BACKGROUND.name()}"/>',
+        f'<text x="{width / 2}" y="{top / 2}" fill="{TEXT.name()}" '
+        f'text-anchor="middle">{escape(spec["title"])}</text>',
+        f'<text x="{left + plot_width / 2}" y="{height - bottom / 4}" fill="{TEXT.name()}" '
+        f'text-anchor="middle">{escape(spec.get("x_label", "Time"))}</text>',
+        f'<text x="20" y="{top + plot_height / 2}" fill="{TEXT.name()}" text-anchor="middle" '
+        f'dominant-baseline="middle" transform="rotate(-90 20 {top + plot_height / 2})">'
+        f'{escape(spec.get("y_label", ""))}</text>',
+    ]
+
+    if len(times):
+        x_range = (float(times[0]), float(times[-1]))
+        y_range = _value_range(values)
+        for i in range(6):
+            fraction = i / 5
+            x = left + fraction * plot_width
+            y = top + fraction * plot_height
+            parts.append(f'<line x1="{x:.1f}" y1="{top}" x2="{x:.1f}" y2="{top + plot_height}" '
+                         f'stroke="white" stroke-opacity="0.25"/>')
+            parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_width}" y2="{y:.1f}" '
+                         f'stroke="white" stroke-opacity="0.25"/>')
+            timestamp = x_range[0] + fraction * (x_range[1] - x_range[0])
+            parts.append(f'<text x="{x:.1f}" y="{top + plot_height + 20}" fill="{TEXT.name()}" '
+                         f'text-anchor="middle">{_time_label(timestamp)}</text>')
+            value = y_range[1] - fraction * (y_range[1] - y_range[0])
+            parts.append(f'<text x="{left - 10}" y="{y + 5:.1f}" fill="{TEXT.name()}" '
+                         f'text-anchor="end">{value:.2f}</text>')
+
+        plot_times, plot_values = decimate_minmax(times, values, plot_width)
+        x, y = _project(plot_times, plot_values, width, height, x_range, y_range)
+        points = " ".join(f"{px:.1f},{py:.1f}" for px, py in zip(x.tolist(), y.tolist()))
+        parts.append(f'<polyline points="{points}" fill="none" stroke="{spec["color"]}" stroke-width="2"/>')
+
+    parts.append('</svg>')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(parts))
+
+
+def write_csv(path, snapshot, progress=None, chunk_size=100000):
+    columns = list(snapshot)
+    data = np.column_stack([snapshot[name] for name in columns])
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(";".join(columns) + "\n")
+        for start in range(0, len(data), chunk_size):
+            np.savetxt(f, data[start:start + chunk_size], delimiter=';', fmt='%.6f')
+            if progress:
+                progress(min(start + chunk_size, len(data)) / len(data))
+
+
+class ExportJob(QThread):
+    """Eksport wykresów (PNG/SVG) i pełnych danych sesji (CSV/NPZ) w osobnym wątku.
+
+    Dane są kopiowane z magazynu przy tworzeniu zadania, więc dalsze
+    pakiety nie wpływają na eksport, a wyświetlanie na żywo nie jest
+    blokowane.
+    """
+    progress = pyqtSignal(int, str)
+    completed = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, store, plot_specs, formats, directory, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.export_jobs')
+        self.snapshot = store.snapshot()
+        self.plot_specs = list(plot_specs)
+        self.formats = list(formats)
+        self.directory = directory
+        self.stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def _tasks(self):
+        for format in self.formats:
+            if format in ('png', 'svg'):
+                for spec in self.plot_specs:
+                    yield format, spec
+            else:
+                yield format, None
+
+    def run(self):
+        tasks = list(self._tasks())
+        written = []
+        try:
+            for number, (format, spec) in enumerate(tasks):
+                def report(fraction, label=None):
+                    percent = int((number + fraction) / len(tasks) * 100)
+                    self.progress.emit(percent, label or f"Exporting {format.upper()}")
+
+                if spec is not None:
+                    path = os.path.join(self.directory, f"{spec['name']}_plot_{self.stamp}.{format}")
+                    report(0, f"Exporting {spec['title']} ({format.upper()})")
+                    render = render_png if format == 'png' else render_svg
+                    render(path, self.snapshot['timestamp'], self.snapshot[spec['channel']], spec)
+                elif format == 'csv':
+                    path = os.path.join(self.directory, f"session_data_{self.stamp}.csv")
+                    write_csv(path, self.snapshot, report)
+                elif format == 'npz':
+                    path = os.path.join(self.directory, f"session_data_{self.stamp}.npz")
+                    report(0)
+                    np.savez_compressed(path, **self.snapshot)
+                else:
+                    raise ValueError(f"Unknown export format: {format}")
+
+                written.append(path)
+                report(1)
+        except Exception as e:
+            self.logger.error(f"Export failed: {e}")
+            self.failed.emit(str(e))
+            return
+
+        self.logger.info(f"Exported {len(written)} files to {self.directory}")
+        self.completed.emit(written)
@@ -1,15 +1,26 @@
 import numpy as np
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QVBoxLayout, QWidget
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QColor, QPen
 from datetime import datetime
 
-from pyqtgraph.exporters import ImageExporter, SVGExporter
+from core.sliding_minmax import SlidingMinMax
+from core.telemetry_store import TelemetryStore
 
 
 class LivePlot(QWidget):
-	def __init__(self, title="Plot", timespan=30, parent=None, color='#1f77b4'):
+	crosshair_moved = pyqtSignal(float)
+
+	def __init__(self, title="Plot", timespan=30, parent=None, color='#1f77b4', render_scheduler=None,
+				 store=None, channel='value'):
 		super().__init__(parent)
+		self.render_scheduler = render_scheduler
+
+		# Bez wspólnego magazynu wykres trzyma dane we własnym, jednokanałowym
+		self.store = store if store is not None else TelemetryStore(channels=(channel,), derivatives={})
+		self.channel = channel
+		self.store.subscribe(self._on_row_appended)
 
 		self.plot_widget = pg.PlotWidget(title=title)
 		self.plot_widget.setBackground(QColor(32, 36, 44))
@@ -39,8 +50,12 @@ class LivePlot(QWidget):
 		if self.legend_visible:
 			self.plot_widget.addLegend()
 
-		self.timestamps = np.array([], dtype=np.float64)
-		self.values = np.array([], dtype=np.float64)
+		self._window = SlidingMinMax()
+		self._rendering = False
+		self._curve_dirty = True
+		self._pending_mouse_pos = None
+		self._pending_crosshair_time = None
+		self._crosshair_index = None
 
 		self.min_time = None
 		self.min_value = float('inf')
@@ -61,6 +76,16 @@ class LivePlot(QWidget):
 		self.toggle_crosshair(False)
 
 		self.plot_widget.scene().sigMouseMoved.connect(self.mouse_moved)
+		self.plot_widget.plotItem.vb.sigXRangeChanged.connect(self._on_view_changed)
+		self.plot_widget.plotItem.vb.sigResized.connect(self._on_view_changed)
+
+	@property
+	def timestamps(self):
+		return self.store.times()
+
+	@property
+	def values(self):
+		return self.store.column(self.channel)
 
 	def create_pen(self):
 		return pg.mkPen(
@@ -87,8 +112,15 @@ class LivePlot(QWidget):
 
 	def update_timespan(self, timespan):
 		self.timespan = timespan
+		self._rebuild_window()
 		self.zoom_to_data()
 
+	def _rebuild_window(self):
+		self._window.rebuild(self.timestamps, self.values, datetime.now().timestamp() - self.timespan)
+		values = self.values
+		self.min_value = float(np.min(values)) if len(values) else float('inf')
+		self.max_value = float(np.max(values)) if len(values) else float('-inf')
+
 	def set_x_label(self, label):
 		self.plot_widget.setLabel('bottom', label)
 
@@ -103,21 +135,68 @@ class LivePlot(QWidget):
 		else:
 			ts = timestamp
 
-		self.timestamps = np.append(self.timestamps, ts)
-		self.values = np.append(self.values, value)
+		self.store.append(ts, {self.channel: value})
+
+	def _on_row_appended(self, index):
+		if index is None:
+			# Cała zawartość magazynu została podmieniona
+			self._window.clear()
+			self._rebuild_window()
+			self._crosshair_index = None
+			self._curve_dirty = True
+			self.request_render()
+			return
+
+		ts = self.store.times()[index]
+		value = self.store.column(self.channel)[index]
+		self._window.append(ts, value)
+		self._window.expire(ts - self.timespan)
 
 		if value < self.min_value:
 			self.min_value = value
 		if value > self.max_value:
 			self.max_value = value
 
-		if len(self.timestamps) > 1000:
-			self.timestamps = self.timestamps[-1000:]
-			self.values = self.values[-1000:]
+		self._curve_dirty = True
+		self.request_render()
 
-		self.curve.setData(self.timestamps, self.values)
-		if self.auto_zoom_enabled:
-			self.zoom_to_data()
+	def request_render(self):
+		if self.render_scheduler:
+			self.render_scheduler.mark_dirty(self)
+		else:
+			self.render()
+
+	def render(self):
+		self._rendering = True
+		try:
+			if self._pending_mouse_pos is not None or self._pending_crosshair_time is not None:
+				self._update_crosshair()
+			if not self._curve_dirty:
+				return
+			self._curve_dirty = False
+
+			if self.auto_zoom_enabled:
+				self.zoom_to_data()
+
+			history_t = self.timestamps
+			view_box = self.plot_widget.plotItem.vb
+			if view_box.autoRangeEnabled()[0] and len(history_t):
+				x_min, x_max = history_t[0], history_t[-1]
+			else:
+				x_min, x_max = view_box.viewRange()[0]
+
+			# Około jednego kubełka min/max na piksel szerokości
+			max_points = 2 * max(int(view_box.width()), 100)
+			pyramid = self.store.pyramid(self.channel)
+			x, y = pyramid.select(history_t, self.values, x_min, x_max, max_points)
+			self.curve.setData(x, y)
+		finally:
+			self._rendering = False
+
+	def _on_view_changed(self, *args):
+		if not self._rendering:
+			self._curve_dirty = True
+			self.request_render()
 
 	def zoom_to_data(self):
 		if len(self.timestamps) == 0:
@@ -127,14 +206,12 @@ class LivePlot(QWidget):
 		min_time = current_time - self.timespan
 		max_time = current_time
 
-		visible_indices = (self.timestamps >= min_time) & (self.timestamps <= max_time)
-		visible_values = self.values[visible_indices]
-
-		if len(visible_values) == 0:
+		self._window.expire(min_time)
+		if not self._window:
 			return
 
-		min_value = np.min(visible_values)
-		max_value = np.max(visible_values)
+		min_value = self._window.minimum()
+		max_value = self._window.maximum()
 		value_range = max_value - min_value
 		padding = value_range * 0.1 if value_range > 0 else 1.0
 
@@ -148,38 +225,27 @@ class LivePlot(QWidget):
 			self.auto_zoom_enabled = enable
 
 	def set_data(self, timestamps, values):
-		if isinstance(timestamps[0], datetime):
-			self.timestamps = np.array([t.timestamp() for t in timestamps])
-		else:
-			self.timestamps = np.array(timestamps)
-
-		self.values = np.array(values)
+		if len(timestamps) > 0 and isinstance(timestamps[0], datetime):
+			timestamps = [t.timestamp() for t in timestamps]
 
-		if len(self.timestamps) > 0:
-			self.min_time = np.min(self.timestamps)
-			self.max_value = np.max(self.values)
-			self.min_value = np.min(self.values)
-		else:
-			self.min_time = None
-			self.min_value = float('inf')
-			self.max_value = float('-inf')
-
-		self.curve.setData(self.timestamps, self.values)
-		self.zoom_to_data()
+		self.store.set_data(timestamps, {self.channel: values})
+		self.min_time = self.timestamps[0] if len(self.timestamps) else None
 
 	def update_plot(self):
-		self.curve.setData(self.timestamps, self.values)
-		self.zoom_to_data()
+		self._curve_dirty = True
+		self.request_render()
 
 	def get_data_points(self):
 		return self.timestamps.copy(), self.values.copy()
 
 	def reset_view(self):
-		if len(self.timestamps) == 0:
+		"""Pokazuje cały zapisany lot."""
+		history_t = self.timestamps
+		if len(history_t) == 0:
 			return
 
-		min_time = np.min(self.timestamps)
-		max_time = np.max(self.timestamps)
+		min_time = history_t[0]
+		max_time = history_t[-1]
 		time_span = max_time - min_time
 		padding = time_span * 0.05
 
@@ -193,24 +259,45 @@ class LivePlot(QWidget):
 		if not self.crosshair_visible:
 			return
 
+		# Zdarzenia myszy są tylko zapamiętywane - obsługa odbywa się raz na klatkę
 		if self.plot_widget.sceneBoundingRect().contains(pos):
-			mouse_point = self.plot_widget.plotItem.vb.mapSceneToView(pos)
-			x_val = mouse_point.x()
-			y_val = mouse_point.y()
-
-			self.crosshair_v.setPos(x_val)
-			self.crosshair_h.setPos(y_val)
-
-			if len(self.timestamps) > 0:
-				dt = datetime.fromtimestamp(x_val)
-				ms = int(dt.microsecond / 1000)
-				self.coord_label.setText(
-					f"Time: {dt.strftime('%H:%M:%S')}.{ms:03d}\nValue: {y_val:.4f}"
-				)
-				view_range = self.plot_widget.viewRange()
-				x_pos = view_range[0][0] + (view_range[0][1] - view_range[0][0]) * 0.01
-				y_pos = view_range[1][0] - (view_range[1][0] - view_range[1][1]) * 0.7
-				self.coord_label.setPos(x_pos, y_pos)
+			self._pending_mouse_pos = pos
+			self.request_render()
+
+	def show_crosshair_at(self, timestamp):
+		"""Ustawia krzyż na próbce najbliższej podanej chwili (sprzężenie z innymi wykresami)."""
+		if not self.crosshair_visible:
+			return
+		self._pending_crosshair_time = timestamp
+		self.request_render()
+
+	def _update_crosshair(self):
+		pos, self._pending_mouse_pos = self._pending_mouse_pos, None
+		timestamp, self._pending_crosshair_time = self._pending_crosshair_time, None
+		if pos is not None:
+			timestamp = self.plot_widget.plotItem.vb.mapSceneToView(pos).x()
+
+		index = self.store.nearest_index(timestamp)
+		if index is None:
+			return
+		self._crosshair_index = index
+		sample_time = float(self.timestamps[index])
+		self.crosshair_v.setPos(sample_time)
+		self.crosshair_h.setPos(float(self.values[index]))
+
+		dt = datetime.fromtimestamp(sample_time)
+		ms = int(dt.microsecond / 1000)
+		lines = [f"Time: {dt.strftime('%H:%M:%S')}.{ms:03d}"]
+		lines += [f"{name}: {value:.4f}" for name, value in self.store.row(index).items()]
+		self.coord_label.setText("\n".join(lines))
+
+		view_range = self.plot_widget.viewRange()
+		x_pos = view_range[0][0] + (view_range[0][1] - view_range[0][0]) * 0.01
+		y_pos = view_range[1][0] - (view_range[1][0] - view_range[1][1]) * 0.7
+		self.coord_label.setPos(x_pos, y_pos)
+
+		if pos is not None:
+			self.crosshair_moved.emit(sample_time)
 
 	def toggle_crosshair(self, visible=None):
 		if visible is None:
@@ -228,11 +315,7 @@ class LivePlot(QWidget):
 			self.plot_widget.removeItem(self.coord_label)
 
 	def clear_data(self):
-		self.timestamps = np.array([], dtype=np.float64)
-		self.values = np.array([], dtype=np.float64)
-		self.min_value = float('inf')
-		self.max_value = float('-inf')
-		self.curve.setData([], [])
+		self.store.clear()
 
 	def toggle_data_markers(self, visible):
 		self.data_markers_visible = visible
@@ -264,12 +347,31 @@ class LivePlot(QWidget):
 			self.plot_widget.plotItem.legend.setParent(None)
 			self.plot_widget.plotItem.legend = None
 
+	def export_spec(self, name):
+		"""Opis wykresu dla ExportJob - rysowanie odbywa się poza wątkiem GUI."""
+		return {
+			'name': name,
+			'title': self.plot_widget.plotItem.titleLabel.text,
+			'channel': self.channel,
+			'color': pg.mkColor(self.line_color).name(),
+			'x_label': self._axis_label('bottom'),
+			'y_label': self._axis_label('left'),
+		}
+
+	def _axis_label(self, name):
+		"""Opis osi razem z jednostką, tak jak pokazuje go pyqtgraph."""
+		axis = self.plot_widget.getAxis(name)
+		return f"{axis.labelText} ({axis.labelUnits})" if axis.labelUnits else axis.labelText
+
 	def export_to_png(self, filename):
+		# Eksportery pyqtgraph ładowane przy pierwszym eksporcie, nie przy starcie
+		from pyqtgraph.exporters import ImageExporter
 		exporter = ImageExporter(self.plot_widget.plotItem)
 		exporter.parameters()['width'] = 1920
 		exporter.export(filename)
 
 	def export_to_svg(self, filename):
+		from pyqtgraph.exporters import SVGExporter
 		exporter = SVGExporter(self.plot_widget.plotItem)
 		exporter.export(filename)
 
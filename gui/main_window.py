@@ -1,32 +1,42 @@
-import io
 import os
 import platform
 import subprocess
 import logging
 
-import numpy as np
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtWidgets import (QMainWindow,
                              QWidget, QSizePolicy,
                              QHBoxLayout, QLabel,
                              QGridLayout, QVBoxLayout, QMessageBox, QInputDialog, QColorDialog, QDialog, QTextBrowser,
-                             QDialogButtonBox, QTableWidget, QTableWidgetItem, QHeaderView)
-from PyQt5.QtCore import Qt, QTimer, QUrl
+                             QDialogButtonBox, QTableView, QHeaderView, QProgressBar)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap, QColor
-from gpiozero.pins.mock import MockFactory
 from PyQt5 import QtCore
-from serial.tools import list_ports
-import folium
 from core.serial_reader import SerialReader
 from gui.live_plot import LivePlot
+from gui.render_scheduler import RenderScheduler
+from gui.telemetry_table_model import TelemetryTableModel
+from gui.export_jobs import ExportJob
+from gui.diagnostics_dialog import DiagnosticsDialog
+from core.geodesy import LocalFrame, LandingPredictor
+from core.config import Config
 from datetime import datetime
 from core.process_data import ProcessData
 from core.csv_handler import CsvHandler
+from core.telemetry_store import TelemetryStore
+from core.streaming_stats import StreamingStatistics
+from core.outbox import Outbox
+from core.network_handler import MulticastPublisher
+from core.telemetry_forwarder import TelemetryForwarder
+from core.metrics import MetricsRegistry
 import random
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, config, transmitter, gpio_reader, csv_handler, serial_reader):
+    # Emitowany po drugim etapie startu (load_map), argument mówi, czy mapa powstała
+    map_ready = pyqtSignal(bool)
+
+    def __init__(self, config, transmitter, gpio_reader, csv_handler, serial_reader, acquisition=None,
+                 metrics_sampler=None):
         super().__init__()
         self.transmitter = transmitter
         self.is_partner_connected = False
@@ -54,7 +64,6 @@ class MainWindow(QMainWindow):
         self.default_lng = 20.9004
         self.current_lat = self.current_data['latitude']
         self.current_lng = self.current_data['longitude']
-        self.map = None
         self.map_view = None
         self.mission_aborted = False
 
@@ -70,7 +79,11 @@ class MainWindow(QMainWindow):
 
         # Use the passed serial_reader reference instead of creating new one
         self.serial = serial_reader
-        if self.serial:
+        # Port szeregowy obsługuje osobny proces, rekordy przychodzą przez pamięć współdzieloną
+        self.acquisition = acquisition
+        if self.acquisition:
+            self.logger.info("Receiving records from the acquisition process")
+        elif self.serial:
             self.logger.info(f"Using existing SerialReader on port {config['port']}")
         else:
             self.logger.warning("No SerialReader provided - creating fallback")
@@ -79,7 +92,8 @@ class MainWindow(QMainWindow):
                 self.serial = SerialReader(
                     port=config['port'],
                     baudrate=config.get('baudrate', 9600),
-                    transmitter=transmitter
+                    transmitter=transmitter,
+                    lora_config=config.get('lora_config')
                 )
                 self.logger.info(f"Created fallback SerialReader on port {config['port']}")
             else:
@@ -98,14 +112,40 @@ class MainWindow(QMainWindow):
             self.logger.warning("Cannot connect SerialReader signals - no SerialReader available")
 
         self.processor.processed_data_ready.connect(self.handle_processed_data)
+        if self.acquisition:
+            self.acquisition.processed_data_ready.connect(self.handle_processed_data)
+            self.acquisition.overrun.connect(self.on_acquisition_overrun)
+            self.acquisition.stopped.connect(self.on_acquisition_stopped)
 
         # Network and GPIO connections
+        self.outbox = None
         if self.transmitter:
             self.transmitter.data_received_signal.connect(self.abort_mission_pressed)
             self.logger.debug("Transmitter abort signal connected")
+            self.outbox = Outbox(self.transmitter)
         else:
             self.logger.warning("No transmitter available for abort signal")
 
+        self.multicast = None
+        network_config = config.get('network', {})
+        if network_config.get('multicast_enabled'):
+            try:
+                self.multicast = MulticastPublisher(
+                    group=network_config['multicast_group'],
+                    port=network_config['multicast_port']
+                )
+            except OSError as e:
+                self.logger.error(f"Failed to start multicast publisher: {e}")
+
+        self.forwarder = TelemetryForwarder(self.transmitter, self.outbox, self.multicast)
+
+        # Metryki stanu - rejestr próbkuje MetricsSampler utworzony w main.py
+        self.metrics_sampler = metrics_sampler
+        self.metrics = metrics_sampler.registry if metrics_sampler else MetricsRegistry()
+        self.records_counter = self.metrics.counter('records')
+        self.skipped_counter = self.metrics.counter('records.skipped')
+        self.diagnostics_dialog = None
+
         self.gpio_reader = gpio_reader
         if self.gpio_reader:
             self.gpio_reader.held.connect(self.abort_mission_pressed)
@@ -114,12 +154,31 @@ class MainWindow(QMainWindow):
             self.logger.warning("No GPIO reader available for abort signal")
 
         # Wykresy
-        self.alt_plot = LivePlot(title="Altitude", color='b', timespan=30)
-        self.ver_velocity_plot = LivePlot(title="Vertical Velocity", color='r', timespan=30)
-        self.ver_accel_plot = LivePlot(title="Vertical Acceleration", color='c', timespan=30)
-        self.pitch_plot = LivePlot(title="Pitch", color='y', timespan=30)
-        self.roll_plot = LivePlot(title="Roll", color='g', timespan=30)
-        self.yaw_plot = LivePlot(title="Yaw", color='w', timespan=30)
+        self.render_scheduler = RenderScheduler(Config.DEFAULT_MAX_FPS, self)
+        self.store = TelemetryStore()
+        self.statistics = StreamingStatistics(self.store)
+        self.alt_plot = LivePlot(title="Altitude", color='b', timespan=30, render_scheduler=self.render_scheduler,
+                                 store=self.store, channel='altitude')
+        self.ver_velocity_plot = LivePlot(title="Vertical Velocity", color='r', timespan=30,
+                                          render_scheduler=self.render_scheduler,
+                                          store=self.store, channel='ver_velocity')
+        self.ver_accel_plot = LivePlot(title="Vertical Acceleration", color='c', timespan=30,
+                                       render_scheduler=self.render_scheduler,
+                                       store=self.store, channel='ver_accel')
+        self.pitch_plot = LivePlot(title="Pitch", color='y', timespan=30, render_scheduler=self.render_scheduler,
+                                   store=self.store, channel='pitch')
+        self.roll_plot = LivePlot(title="Roll", color='g', timespan=30, render_scheduler=self.render_scheduler,
+                                  store=self.store, channel='roll')
+        self.yaw_plot = LivePlot(title="Yaw", color='w', timespan=30, render_scheduler=self.render_scheduler,
+                                 store=self.store, channel='yaw')
+
+        # Krzyże celownicze wszystkich wykresów wskazują tę samą próbkę
+        plots = [self.alt_plot, self.ver_velocity_plot, self.ver_accel_plot,
+                 self.pitch_plot, self.roll_plot, self.yaw_plot]
+        for plot in plots:
+            for other in plots:
+                if other is not plot:
+                    plot.crosshair_moved.connect(other.show_crosshair_at)
 
         self.alt_plot.set_x_label("Time [s]")
         self.alt_plot.set_y_label("Height [m]")
@@ -139,15 +198,18 @@ class MainWindow(QMainWindow):
         self.yaw_plot.set_x_label("Time [s]")
         self.yaw_plot.set_y_label("Yaw [°]")
 
-        # Mapa
-        self.map_view = QWebEngineView()
-        self.map_view.setSizePolicy(
-            QSizePolicy.Expanding,
-            QSizePolicy.Expanding
-        )
+        # Mapa powstaje w load_map, po pokazaniu okna - folium i QtWebEngine nie opóźniają startu
+        self.map_bridge = None
+        self.map_scheme_handler = None
+        self.map_page_builder = None
+        self.map_placeholder = QLabel("Loading map...")
+        self.map_placeholder.setAlignment(Qt.AlignCenter)
+        self.map_placeholder.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        self.set_map(lat=self.default_lat, lng=self.default_lng)
-        self.update_map_view()
+        # Układ ENU o początku na wyrzutni
+        self.local_frame = LocalFrame(self.default_lat, self.default_lng)
+        self.landing_predictor = LandingPredictor(self.local_frame)
+        self.last_fix = None
 
         # Główny układ (QGridLayout)
         central = QWidget()
@@ -183,10 +245,55 @@ class MainWindow(QMainWindow):
         # Don't start reading here - it's already started in main.py
         # self.serial.start_reading()
 
+        self.register_metrics()
         self.setup_status_bar()
         self.declare_menus()
+        QTimer.singleShot(0, self.load_map)
         self.logger.info("MainWindow initialization completed successfully")
 
+    def load_map(self):
+        """Drugi etap startu: HTML mapy budowany w tle, widok WebEngine tworzony, gdy będzie gotowy."""
+        from core.tile_cache import TileCache
+        from gui.map_bridge import MapPageBuilder
+
+        # Kafelki i biblioteki JS z dysku - mapa działa bez internetu
+        self.tile_cache = TileCache()
+        self.map_page_builder = MapPageBuilder(self.default_lat, self.default_lng, offline=True, parent=self)
+        self.map_page_builder.built.connect(self.on_map_page_built)
+        self.map_page_builder.failed.connect(self.on_map_page_failed)
+        self.map_page_builder.start()
+
+    def on_map_page_built(self, html):
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+        from gui.map_bridge import MapBridge
+        from gui.offline_map import OfflineMapSchemeHandler
+
+        self.map_scheme_handler = OfflineMapSchemeHandler(self.tile_cache, self)
+        self.map_scheme_handler.install()
+
+        self.map_view = QWebEngineView()
+        self.map_view.setSizePolicy(
+            QSizePolicy.Expanding,
+            QSizePolicy.Expanding
+        )
+        # Strona mapy ładowana jest raz, pozycje trafiają do niej przez JS
+        self.map_bridge = MapBridge(self.map_view, self.default_lat, self.default_lng, self.render_scheduler,
+                                    offline=True, parent=self, html=html)
+        self.map_layout.replaceWidget(self.map_placeholder, self.map_view)
+        self.map_placeholder.deleteLater()
+
+        # Stan zebrany, zanim mapa była gotowa
+        self.map_bridge.update_position(self.current_lat, self.current_lng)
+        prediction = self.landing_predictor.prediction
+        if prediction:
+            self.map_bridge.set_landing(prediction['latitude'], prediction['longitude'])
+        self.logger.info("Map loaded")
+        self.map_ready.emit(True)
+
+    def on_map_page_failed(self, message):
+        self.map_placeholder.setText(f"Map unavailable: {message}")
+        self.map_ready.emit(False)
+
     def create_right_panel(self):
         """Tworzy dolny panel z danymi i mapą"""
         panel = QWidget()
@@ -204,30 +311,16 @@ class MainWindow(QMainWindow):
         map_layout = QVBoxLayout()
         map_layout.setContentsMargins(0, 0, 0, 0)
 
-        map_layout.addWidget(self.map_view)
+        map_layout.addWidget(self.map_placeholder)
+        self.map_layout = map_layout
         map_widget.setLayout(map_layout)
 
-        self.table = QTableWidget()
-        self.table.setRowCount(7)
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Parameter", "Value"])
-
-        parameters = ["Altitude", "Velocity", "Acceleration", "Pitch", "Roll", "Yaw", "Latitude", "Longitude"]
-        values = [
-            f"{self.current_data['altitude']:.2f} m",
-            f"{self.current_data['ver_velocity']:.2f} m/s",
-            #f"{self.current_data['ver_accel']:.2f} m/s²",
-            f"{self.current_data['pitch']:.2f}°",
-            f"{self.current_data['roll']:.2f}°",
-            f"{self.current_data['yaw']:.2f}°",
-            f"{self.current_data['latitude']:.6f}° N",
-            f"{self.current_data['longitude']:.6f}° E"
-        ]
-
-        for i, (param, value) in enumerate(zip(parameters, values)):
-            self.table.setItem(i, 0, QTableWidgetItem(param))
-            self.table.setItem(i, 1, QTableWidgetItem(value))
+        # Wartości są odświeżane razem z wykresami, raz na klatkę
+        self.table_model = TelemetryTableModel(self.render_scheduler, self)
+        self.table_model.update(self.current_data)
 
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.setStyleSheet("font-size: 20px;")
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -285,6 +378,12 @@ class MainWindow(QMainWindow):
         right_layout.setSpacing(10)
         right_container.setLayout(right_layout)
 
+        self.metrics_label = QLabel()
+        self.metrics_label.setStyleSheet("font-size: 12px;")
+        right_layout.addWidget(self.metrics_label)
+        if self.metrics_sampler:
+            self.metrics_sampler.sampled.connect(self.on_metrics_sampled)
+
         self.connection_label = QLabel("HORUS CSS disconnected")
         self.connection_label.setStyleSheet("font-size: 14px; font-weight: bold; color: red;")
         right_layout.addWidget(self.connection_label)
@@ -297,6 +396,13 @@ class MainWindow(QMainWindow):
 
         self.statusBar().addWidget(status_container, 1)
 
+        self.export_progress = QProgressBar()
+        self.export_progress.setFixedWidth(260)
+        self.export_progress.setRange(0, 100)
+        self.export_progress.hide()
+        self.statusBar().addPermanentWidget(self.export_progress)
+        self.export_job = None
+
         self.setup_heartbeat()
 
     def setup_heartbeat(self):
@@ -316,86 +422,16 @@ class MainWindow(QMainWindow):
 
 
     def set_map(self, lat, lng):
-        figure = folium.Figure(width="100%", height="100%")
-
-        self.map = folium.Map(
-            location=[lat, lng],
-            zoom_start=15,
-            control_scale=True,
-            tiles='OpenStreetMap'
-        )
-
-        figure.add_child(self.map)
-
-        folium.Marker(
-            [lat, lng],
-            popup=f"LOTUS: {lat:.6f}, {lng:.6f}",
-            icon=folium.Icon(color="green", icon="flag", prefix='fa')
-        ).add_to(self.map)
-
-        data = io.BytesIO()
-        self.map.save(data, close_file=False)
-        html = data.getvalue().decode()
-
-        responsive_meta = '''
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                html, body {
-                    width: 100%;
-                    height: 100%;
-                    margin: 0;
-                    padding: 0;
-                }
-                #map {
-                    width: 100%;
-                    height: 100%;
-                }
-                .folium-map {
-                    width: 100% !important;
-                    height: 100% !important;
-                }
-            </style>
-            '''
-
-        html = html.replace('</head>', responsive_meta + '</head>')
-        self.map_view.setHtml(html, QUrl(''))
+        self.current_lat = lat
+        self.current_lng = lng
+        if self.map_bridge:
+            self.map_bridge.update_position(lat, lng)
 
     def resizeEvent(self, event):
         """Obsługa zmiany rozmiaru okna"""
         super().resizeEvent(event)
-        QTimer.singleShot(100, self.update_map_view)
-
-    def update_map_view(self):
-        """Update the map view with current HTML"""
-        if hasattr(self, 'map') and self.map:
-            # Regenerate the HTML with current dimensions
-            data = io.BytesIO()
-            self.map.save(data, close_file=False)
-            html = data.getvalue().decode()
-
-            # Add responsive styling
-            responsive_meta = '''
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                html, body {
-                    width: 100%;
-                    height: 100%;
-                    margin: 0;
-                    padding: 0;
-                }
-                #map {
-                    width: 100%;
-                    height: 100%;
-                }
-                .folium-map {
-                    width: 100% !important;
-                    height: 100% !important;
-                }
-            </style>
-            '''
-
-            html = html.replace('</head>', responsive_meta + '</head>')
-            self.map_view.setHtml(html, QUrl(''))
+        if getattr(self, 'map_bridge', None):
+            QTimer.singleShot(100, self.map_bridge.invalidate_size)
 
     def declare_menus(self):
         self.menu = self.menuBar()
@@ -432,6 +468,7 @@ class MainWindow(QMainWindow):
         self.view_menu = self.menu.addMenu("View")
         self.theme_menu = self.view_menu.addMenu("Themes")
         self.timespan_menu = self.view_menu.addMenu("Timespan")
+        self.frame_rate_menu = self.view_menu.addMenu("Max Frame Rate")
         self.tools_menu = self.menu.addMenu("Tools")
         self.test_menu = self.menu.addMenu("Test")
         self.help_menu = self.menu.addMenu("Help")
@@ -442,6 +479,8 @@ class MainWindow(QMainWindow):
         self.file_menu.addSeparator()
         self.file_menu.addAction("Export Plots as PNG", lambda: self.export_plots("png"))
         self.file_menu.addAction("Export Plots as SVG", lambda: self.export_plots("svg"))
+        self.file_menu.addAction("Export Session Data as CSV", lambda: self.export_session_data("csv"))
+        self.file_menu.addAction("Export Session Data as NPZ", lambda: self.export_session_data("npz"))
 
         self.view_menu.addAction("Toggle Fullscreen", self.toggle_fullscreen)
 
@@ -520,6 +559,9 @@ class MainWindow(QMainWindow):
         self.timespan_menu.addAction("90 seconds", lambda: self.change_plot_timespans(90))
         self.timespan_menu.addAction("120 seconds", lambda: self.change_plot_timespans(120))
 
+        for fps in (10, 15, 30, 60):
+            self.frame_rate_menu.addAction(f"{fps} FPS", lambda fps=fps: self.render_scheduler.set_max_fps(fps))
+
         serial_menu = self.tools_menu.addMenu("Serial Configuration")
         serial_menu.addAction("Scan Ports", self.scan_serial_ports)
         serial_menu.addAction("Change Baud Rate", self.change_baud_rate)
@@ -527,6 +569,7 @@ class MainWindow(QMainWindow):
         self.tools_menu.addAction("Configure Filters", self.configure_filters)
         self.tools_menu.addSeparator()
         self.tools_menu.addAction("Calculate Statistics", self.calculate_statistics)
+        self.tools_menu.addAction("Diagnostics", self.show_diagnostics)
 
 
     def toggle_crosshairs(self):
@@ -641,31 +684,20 @@ class MainWindow(QMainWindow):
             self.logger.info(f"Plot '{plot_name}' line color changed to {color.name()}")
 
     def clear_plots(self):
-        plots = [
-            self.alt_plot,
-            self.ver_velocity_plot,
-            self.ver_accel_plot,
-            self.pitch_plot,
-            self.roll_plot,
-            self.yaw_plot
-        ]
+        # Wszystkie wykresy czytają ze wspólnego magazynu
+        self.store.clear()
 
-        for plot in plots:
-            plot.clear_data()
-
-        self.altitude_label.setText("Altitude: 0.00 m")
-        self.velocity_label.setText("Velocity: 0.00 m/s")
-        self.accel_label.setText("Acceleration: 0.00 m/s²")
-        self.pitch_label.setText("Pitch: 0.00°")
-        self.roll_label.setText("Roll: 0.00°")
-        self.yaw_label.setText("Yaw: 0.00°")
-        self.position_label.setText("Pos: 0.000000° N, 0.000000° E")
+        self.table_model.clear()
 
         self.logger.info("Plots cleared")
 
     def clear_all(self):
         self.clear_plots()
-        self.set_map(self.default_lat, self.default_lng)
+        self.landing_predictor.clear()
+        self.last_fix = None
+        if self.map_bridge:
+            self.map_bridge.reset(self.default_lat, self.default_lng)
+            self.map_bridge.set_landing(None, None)
         self.logger.debug(f"Cleared all")
 
     def apply_theme(self, theme_file):
@@ -690,30 +722,49 @@ class MainWindow(QMainWindow):
         self.logger.info(f"Status bar toggled to {status}")
 
     def export_plots(self, format):
-        try:
-            session_dir = self.csv_handler.session_dir
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            plots = {
-                "altitude": self.alt_plot,
-                "vertical_velocity": self.ver_velocity_plot,
-                "vertical_acceleration": self.ver_accel_plot,
-                "pitch_plot": self.pitch_plot,
-                "roll_plot": self.roll_plot,
-                "yaw_plot": self.yaw_plot
-            }
+        plots = {
+            "altitude": self.alt_plot,
+            "vertical_velocity": self.ver_velocity_plot,
+            "vertical_acceleration": self.ver_accel_plot,
+            "pitch_plot": self.pitch_plot,
+            "roll_plot": self.roll_plot,
+            "yaw_plot": self.yaw_plot
+        }
+        self.start_export([format], [plot.export_spec(name) for name, plot in plots.items()])
 
-            for name, plot in plots.items():
-                filename = os.path.join(session_dir, f"{name}_plot_{timestamp}.{format}")
-                if format == "png":
-                    plot.export_to_png(filename)
-                elif format == "svg":
-                    plot.export_to_svg(filename)
+    def export_session_data(self, format):
+        self.start_export([format], [])
 
-            self.logger.info(f"Exported plots as {format.upper()} files")
-        except Exception as e:
-            self.logger.error(f"Error exporting plots: {str(e)}")
-            QMessageBox.critical(self, "Export Error", f"Failed to export plots: {str(e)}")
+    def start_export(self, formats, plot_specs):
+        """Eksport w tle - GUI tylko pokazuje postęp na pasku stanu"""
+        if self.export_job and self.export_job.isRunning():
+            QMessageBox.information(self, "Export", "Another export is still in progress")
+            return
+
+        self.export_job = ExportJob(self.store, plot_specs, formats, self.csv_handler.session_dir, self)
+        self.export_job.progress.connect(self.on_export_progress)
+        self.export_job.completed.connect(self.on_export_completed)
+        self.export_job.failed.connect(self.on_export_failed)
+        self.export_progress.setValue(0)
+        self.export_progress.show()
+        self.export_job.start()
+        self.logger.info(f"Started export: {', '.join(format.upper() for format in formats)}")
+
+    def on_export_progress(self, percent, label):
+        self.export_progress.setValue(percent)
+        self.export_progress.setFormat(f"{label} %p%")
+
+    def on_export_completed(self, paths):
+        self.export_progress.hide()
+        current_time = datetime.now().strftime("%H:%M:%S")
+        self.terminal_output.append(
+            f">{current_time}: <span style='color: lightgreen;'>Exported {len(paths)} files</span>")
+        self.logger.info(f"Exported files: {', '.join(paths)}")
+
+    def on_export_failed(self, message):
+        self.export_progress.hide()
+        self.logger.error(f"Error exporting: {message}")
+        QMessageBox.critical(self, "Export Error", f"Failed to export: {message}")
 
     def abort_mission_pressed(self):
         current_time = datetime.now().strftime("%H:%M:%S")
@@ -726,6 +777,8 @@ class MainWindow(QMainWindow):
 
     def simulate_button_held(self):
         try:
+            from gpiozero.pins.mock import MockFactory
+
             pin_factory = type(self.gpio_reader.button.pin.factory)
             if pin_factory is not MockFactory:
                 self.logger.warning("Cannot simulate button press: real GPIO backend in use.")
@@ -743,17 +796,10 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.logger.error(f"Failed to simulate button press: {e}")
 
-    def update_map_view(self):
-        pass
-        """Aktualizuje widok mapy z uwzględnieniem skalowania"""
-        with open('map.html', 'r') as f:
-            html = f.read()
-            html = html.replace('<head>',
-                                '<head><meta name="viewport" content="width=device-width, initial-scale=1.0">')
-            self.map_view.setHtml(html,)
-
     def scan_serial_ports(self):
         try:
+            from serial.tools import list_ports
+
             ports = [port.device for port in list_ports.comports()]
 
             if not ports:
@@ -828,23 +874,30 @@ class MainWindow(QMainWindow):
         try:
             stats = []
 
-            plots = {
-                "Altitude": self.alt_plot,
-                "Vertical velocity": self.ver_velocity_plot,
-                "Vertical acceleration": self.ver_accel_plot,
-                "Pitch plot": self.pitch_plot,
-                "Roll plot": self.roll_plot,
-                "Yaw plot": self.yaw_plot
+            channels = {
+                "Altitude": 'altitude',
+                "Vertical velocity": 'ver_velocity',
+                "Vertical acceleration": 'ver_accel',
+                "Pitch plot": 'pitch',
+                "Roll plot": 'roll',
+                "Yaw plot": 'yaw'
             }
 
-            for name, plot in plots.items():
-                if plot.values.any():
-                    values = np.array(plot.values)
+            def at(timestamp):
+                return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+
+            # Statystyki całego lotu są liczone na bieżąco, tu tylko je odczytujemy
+            for name, channel in channels.items():
+                summary = self.statistics[channel].summary()
+                if summary['count']:
                     stats.append(f"<b>{name}:</b>")
-                    stats.append(f"  Min: {np.min(values):.2f}")
-                    stats.append(f"  Max: {np.max(values):.2f}")
-                    stats.append(f"  Mean: {np.mean(values):.2f}")
-                    stats.append(f"  Std Dev: {np.std(values):.2f}")
+                    stats.append(f"  Samples: {summary['count']}")
+                    stats.append(f"  Min: {summary['min']:.2f} ({at(summary['min_time'])})")
+                    stats.append(f"  Max: {summary['max']:.2f} ({at(summary['max_time'])})")
+                    stats.append(f"  Mean: {summary['mean']:.2f}")
+                    stats.append(f"  Std Dev: {summary['std']:.2f}")
+                    stats.append(f"  P5 / P50 / P95: {summary['p5']:.2f} / {summary['p50']:.2f} / "
+                                 f"{summary['p95']:.2f}")
                     stats.append("")
 
             if not stats:
@@ -855,7 +908,7 @@ class MainWindow(QMainWindow):
             # Show in dialog
             dialog = QDialog(self)
             dialog.setWindowTitle("Data Statistics")
-            dialog.resize(200, 400)
+            dialog.resize(260, 480)
             layout = QVBoxLayout()
 
             text_browser = QTextBrowser()
@@ -892,37 +945,13 @@ class MainWindow(QMainWindow):
                 self.logger.warning("Brak pola 'status' w pakiecie – ustawiam domyślny.")
                 data['status'] = self.current_data.get('status', 'OK')
 
+            self.records_counter.inc()
             self.current_data = data
             self.update_data()
             self.csv_handler.write_row(data)
             self.logger.debug(f"Przetworzono dane do wysłania: {data}")
 
-            transmit_data = {
-                'timestamp': datetime.now().isoformat(),
-                'telemetry': {
-                    'velocity': data.get('ver_velocity', 0),
-                    'altitude': data.get('altitude', 0),
-                    'latitude': data.get('latitude', 0),
-                    'longitude': data.get('longitude', 0),
-                    'pitch': data.get('pitch', 0),
-                    'roll': data.get('roll', 0),
-                    'yaw': data.get('yaw', 0),
-                    'status': data.get('status', 0),
-                    'rbs': data.get('bcs', 0)
-                    # 'bay_pressure': data.get('bay_pressure',0.0),
-                    # 'bay_temperature': data.get('bay_temperature',0.0)
-                },
-                'transmission': {
-                    'rssi': data.get('rssi', 0),
-                    'snr': data.get('snr', 0)
-                }
-            }
-
-            if self.is_partner_connected:
-                self.transmitter.send_data(transmit_data) # To powinno być w process_data
-                self.logger.debug(f"The following data has been send to partner: {transmit_data}")
-            else:
-                self.logger.error("No partner connected")
+            self.forwarder.forward(data)
 
         except Exception as e:
             self.logger.error(f"Błąd w handle_processed_data: {e}")
@@ -1024,56 +1053,16 @@ class MainWindow(QMainWindow):
 
     def update_data(self):
         """Aktualizacja danych na interfejsie"""
-        timestamp = datetime.now()
-
-        if not hasattr(self, 'previous_data'):
-            self.previous_data = {}
-
-        if self.current_data['altitude'] != self.previous_data.get('altitude'):
-            self.alt_plot.add_point(timestamp, self.current_data['altitude'])
-
-        if self.current_data['ver_velocity'] != self.previous_data.get('ver_velocity'):
-            self.ver_velocity_plot.add_point(timestamp, self.current_data['ver_velocity'])
-            ts, vel = self.ver_velocity_plot.get_data_points()
-            if len(ts) < 2:
-                acc = 0.0
-            else:
-                dt = ts[-1] - ts[-2]
-                if dt == 0:
-                    acc = 0.0
-                else:
-                    acc = (vel[-1] - vel[-2]) / dt
-                self.ver_accel_plot.add_point(timestamp,acc)
-
-        if self.current_data['pitch'] != self.previous_data.get('pitch'):
-            self.pitch_plot.add_point(timestamp, self.current_data['pitch'])
-
-        if self.current_data['roll'] != self.previous_data.get('roll'):
-            self.roll_plot.add_point(timestamp, self.current_data['roll'])
-
-        if self.current_data['yaw'] != self.previous_data.get('yaw'):
-            self.yaw_plot.add_point(timestamp, self.current_data['yaw'])
-
-        values = [
-            f"{self.current_data['altitude']:.2f} m",
-            f"{self.current_data['ver_velocity']:.2f} m/s",
-            f"{self.current_data['pitch']:.2f}°",
-            f"{self.current_data['roll']:.2f}°",
-            f"{self.current_data['yaw']:.2f}°",
-            f"{self.current_data['latitude']:.6f}° N",
-            f"{self.current_data['longitude']:.6f}° E"
-        ]
-
-        parameters = ["Altitude", "Velocity", "Pitch", "Roll", "Yaw", "Latitude", "Longitude"]
-
-        for i, (param, value) in enumerate(zip(parameters, values)):
-            current_value_item = self.table.item(i, 1)
-
-            if current_value_item is None or current_value_item.text() != value:
-                self.table.setItem(i, 0, QTableWidgetItem(param))
-                self.table.setItem(i, 1, QTableWidgetItem(value))
-
+        # Jeden wiersz na rekord - wykresy dostają go przez subskrypcję magazynu
+        timestamp = datetime.now().timestamp()
+        index = self.store.append(timestamp, self.current_data)
 
+        # Wiersz z kanałami pochodnymi (np. ver_accel) tylko, gdy rekord trafił do magazynu
+        record = self.store.row(index) if index is not None else {}
+        record.update(self.current_data)
+        record.update(self.update_ground_track(timestamp, record))
+        self.table_model.update(record)
+        self.set_map(self.current_data['latitude'], self.current_data['longitude'])
 
         self.now_str = datetime.now().strftime("%H:%M:%S")
         msg = (
@@ -1083,7 +1072,33 @@ class MainWindow(QMainWindow):
             f"{self.current_data['longitude']}"
         )
 
-        self.previous_data = self.current_data.copy()
+    def update_ground_track(self, timestamp, record):
+        """Położenie względem wyrzutni i prognoza lądowania dla bieżącego rekordu"""
+        lat, lng = record['latitude'], record['longitude']
+        altitude = record.get('altitude', 0.0)
+        observation = self.local_frame.observe(lat, lng, altitude)
+
+        # Prognoza tylko dla nowych pozycji GPS - powtórzona pozycja zaniżałaby dryf
+        if (lat, lng) != self.last_fix:
+            self.last_fix = (lat, lng)
+            prediction = self.landing_predictor.update(
+                timestamp, float(observation['east']), float(observation['north']),
+                altitude, record.get('ver_velocity', 0.0))
+            if self.map_bridge:
+                if prediction:
+                    self.map_bridge.set_landing(prediction['latitude'], prediction['longitude'])
+                else:
+                    self.map_bridge.set_landing(None, None)
+
+        prediction = self.landing_predictor.prediction
+        return {
+            'downrange': float(observation['downrange']),
+            'bearing': float(observation['bearing']),
+            'slant_range': float(observation['slant_range']),
+            'elevation': float(observation['elevation']),
+            'landing_range': prediction['range'] if prediction else float('nan'),
+            'landing_bearing': prediction['bearing'] if prediction else float('nan'),
+        }
 
     def start_random_test(self, duration=120):
         """Rozpoczyna test z losowymi wartościami na wszystkich wykresach"""
@@ -1134,8 +1149,6 @@ class MainWindow(QMainWindow):
             'rbs': random.randint(0, 1)
         }
         self.handle_processed_data(test_data)
-        self.current_data = test_data
-        self.update_data()
 
     def start_map_simulation(self, duration=120):
         if hasattr(self, 'test_map_timer') and self.test_map_timer:
@@ -1167,6 +1180,55 @@ class MainWindow(QMainWindow):
         self.test_lng += random.uniform(0, 0.001)
         self.set_map(self.test_lat,self.test_lng)
 
+    def on_acquisition_overrun(self, lost):
+        self.skipped_counter.inc(lost)
+        self.statusBar().showMessage(f"Display fell behind - {lost} records skipped (all are logged)", 5000)
+
+    def register_metrics(self):
+        """Wskaźniki odczytywane przy próbkowaniu - liczniki, które komponenty już prowadzą"""
+        metrics = self.metrics
+        metrics.gauge('store.rows', lambda: len(self.store))
+        metrics.gauge('network.sent', lambda: self.forwarder.sent)
+        metrics.gauge('network.queued', lambda: self.forwarder.queued)
+        metrics.gauge('network.dropped', lambda: self.forwarder.dropped)
+        metrics.gauge('outbox.pending', lambda: self.outbox.pending if self.outbox else 0)
+        if self.serial:
+            metrics.gauge('uplink.pending', lambda: sum(self.serial.uplink.pending().values()))
+        if self.acquisition:
+            metrics.gauge('acquisition.backlog', lambda: self.acquisition.reader.backlog)
+        metrics.gauge('render.frames', lambda: self.render_scheduler.frames)
+        frame_time = metrics.histogram('render.frame_ms')
+        self.render_scheduler.frame_rendered.connect(lambda seconds: frame_time.observe(1000 * seconds))
+
+    def on_metrics_sampled(self, sample):
+        drops = sample.get('records.skipped', 0) + sample.get('network.dropped', 0)
+        lag = sample.get('loop.lag_ms.p95')
+        rss = sample.get('process.rss_mb')
+        self.metrics_label.setText(
+            f"CPU {sample.get('process.cpu_percent', 0):.0f}%  "
+            f"RSS {'—' if rss is None else f'{rss:.0f} MB'}  "
+            f"{sample.get('records.rate', 0):g} rec/s  "
+            f"lag {'—' if lag is None else f'{lag:g} ms'}  "
+            f"drops {drops}")
+        self.metrics_label.setStyleSheet("font-size: 12px; color: orange;" if drops else "font-size: 12px;")
+
+    def show_diagnostics(self):
+        if not self.metrics_sampler:
+            QMessageBox.information(self, "Diagnostics", "Metrics sampling is not running")
+            return
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self.metrics_sampler, self)
+            self.diagnostics_dialog.finished.connect(self._on_diagnostics_closed)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
+    def _on_diagnostics_closed(self):
+        self.diagnostics_dialog.deleteLater()
+        self.diagnostics_dialog = None
+
+    def on_acquisition_stopped(self, exit_code):
+        QMessageBox.critical(self, "Acquisition", f"Acquisition process stopped (exit code {exit_code})")
+
     def on_partner_connected(self):
         if hasattr(self, "connection_label") and self.connection_label is not None:
             self.logger.info("HORUS CSS connected to HORUS FAS")
@@ -1185,6 +1247,8 @@ class MainWindow(QMainWindow):
         """Zamykanie aplikacji"""
         try:
             # Zatrzymaj odczyt LoRa
+            if self.acquisition:
+                self.acquisition.stop_reading()
             if hasattr(self, 'serial_reader') and self.serial_reader:
                 self.serial_reader.stop_reading()
             elif hasattr(self, 'serial') and self.serial:
@@ -1198,6 +1262,17 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'test_timer') and self.test_timer:
                 self.test_timer.stop()
 
+            if self.outbox:
+                self.outbox.close()
+
+            if self.multicast:
+                self.multicast.close()
+
+            if self.map_page_builder:
+                self.map_page_builder.wait()
+            if self.map_scheme_handler:
+                self.map_scheme_handler.shutdown()
+
             # Odsubskrybuj eventy transmitera, jeśli istnieje
             if hasattr(self, 'transmitter') and self.transmitter:
                 self.transmitter.unsubscribe_on_partner_connected(self.on_partner_connected)
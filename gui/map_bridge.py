@@ -0,0 +1,255 @@
+import io
+import json
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QThread, QUrl, pyqtSignal, pyqtSlot
+from PyQt5.QtWebChannel import QWebChannel
+
+from core.trajectory import Trajectory
+from gui.web_assets import ASSET_URL, TILE_URL, TILE_ATTRIBUTION, localize
+
+RESPONSIVE_HEAD = '''
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        html, body {
+            width: 100%;
+            height: 100%;
+            margin: 0;
+            padding: 0;
+        }
+        #map {
+            width: 100%;
+            height: 100%;
+        }
+        .folium-map {
+            width: 100% !important;
+            height: 100% !important;
+        }
+    </style>
+    <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+'''
+
+# Wstrzykiwane za skryptami folium - mapa i znacznik już istnieją
+BRIDGE_SCRIPT = '''
+<script>
+    window.horus = (function() {
+        var map = %(map)s;
+        var marker = %(marker)s;
+        var track = L.polyline([], {color: '#ff5050', weight: 3}).addTo(map);
+        var hasTail = false;
+        var landing = L.circleMarker([0, 0], {radius: 8, color: '#ffb000', dashArray: '4 4'})
+            .bindTooltip('Predicted landing');
+        if (typeof QWebChannel !== 'undefined') {
+            new QWebChannel(qt.webChannelTransport, function(channel) {
+                var bridge = channel.objects.bridge;
+                map.on('zoomend', function() { bridge.on_zoom_changed(map.getZoom()); });
+                bridge.on_zoom_changed(map.getZoom());
+            });
+        }
+        return {
+            // Ślad to uproszczone wierzchołki + bieżąca pozycja (ogon), podmieniana przy każdej aktualizacji
+            update: function(lat, lng, reset, vertices, tail, follow) {
+                marker.setLatLng([lat, lng]);
+                marker.setPopupContent('LOTUS: ' + lat.toFixed(6) + ', ' + lng.toFixed(6));
+                var latlngs = reset ? [] : track.getLatLngs();
+                if (!reset && hasTail) {
+                    latlngs.pop();
+                }
+                for (var i = 0; i < vertices.length; i++) {
+                    latlngs.push(L.latLng(vertices[i][0], vertices[i][1]));
+                }
+                hasTail = tail !== null;
+                if (hasTail) {
+                    latlngs.push(L.latLng(tail[0], tail[1]));
+                }
+                track.setLatLngs(latlngs);
+                if (follow && !map.getBounds().contains([lat, lng])) {
+                    map.panTo([lat, lng]);
+                }
+            },
+            landing: function(lat, lng) {
+                if (lat === null) {
+                    landing.remove();
+                } else {
+                    landing.setLatLng([lat, lng]).addTo(map);
+                }
+            },
+            reset: function(lat, lng) {
+                marker.setLatLng([lat, lng]);
+                map.setView([lat, lng]);
+            },
+            invalidateSize: function() {
+                map.invalidateSize();
+            }
+        };
+    })();
+</script>
+'''
+
+
+def build_map_page(lat, lng, zoom=15, offline=False):
+    """HTML strony mapy. folium importowany jest dopiero tutaj - jego import trwa kilkaset ms."""
+    import folium
+
+    figure = folium.Figure(width="100%", height="100%")
+    if offline:
+        folium_map = folium.Map(location=[lat, lng], zoom_start=zoom, control_scale=True,
+                                tiles=TILE_URL, attr=TILE_ATTRIBUTION, max_zoom=19)
+        remote = localize(folium_map)
+        if remote:
+            # Bez tych plików mapa w terenie (bez internetu) się nie wyświetli
+            logging.getLogger('HORUS_FAS.map_bridge').warning(
+                f"{len(remote)} map assets missing from gui/resources/web, loading them from the CDN: "
+                f"{', '.join(remote)} - run python -m tools.fetch_web_assets (or tools.prefetch_tiles) "
+                f"while online")
+    else:
+        folium_map = folium.Map(location=[lat, lng], zoom_start=zoom, control_scale=True, tiles='OpenStreetMap')
+    figure.add_child(folium_map)
+    marker = folium.Marker(
+        [lat, lng],
+        popup=f"LOTUS: {lat:.6f}, {lng:.6f}",
+        icon=folium.Icon(color="green", icon="flag", prefix='fa')
+    ).add_to(folium_map)
+
+    data = io.BytesIO()
+    folium_map.save(data, close_file=False)
+    html = data.getvalue().decode()
+    html = html.replace('</head>', RESPONSIVE_HEAD + '</head>')
+    script = BRIDGE_SCRIPT % {'map': folium_map.get_name(), 'marker': marker.get_name()}
+    return html.replace('</html>', script + '</html>')
+
+
+class MapPageBuilder(QThread):
+    """Buduje stronę mapy poza wątkiem GUI, żeby okno pojawiło się bez czekania na folium."""
+    built = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, lat, lng, zoom=15, offline=False, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.map_bridge')
+        self.lat = lat
+        self.lng = lng
+        self.zoom = zoom
+        self.offline = offline
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            html = build_map_page(self.lat, self.lng, self.zoom, self.offline)
+        except Exception as e:
+            self.logger.exception("Building the map page failed")
+            self.failed.emit(str(e))
+            return
+        self.logger.debug(f"Map page built in {(time.perf_counter() - started) * 1000:.0f} ms")
+        self.built.emit(html)
+
+
+class MapBridge(QObject):
+    """Strona mapy ładowana raz, kolejne pozycje idą do niej przez runJavaScript.
+
+    update_position() dopisuje punkt do śladu (Trajectory). Do strony
+    trafiają tylko nowe wierzchołki uproszczonego śladu i bieżąca pozycja,
+    w jednym wywołaniu JS na klatkę RenderSchedulera. Do chwili
+    załadowania strony zmiany czekają. Strona zgłasza zmianę zoomu przez
+    QWebChannel, co przelicza uproszczenie dla nowej skali. Gotowy HTML
+    (z MapPageBuilder) można podać w html, inaczej strona budowana jest
+    od razu.
+    """
+
+    def __init__(self, view, lat, lng, render_scheduler=None, zoom=15, offline=False, parent=None, html=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.map_bridge')
+        self.view = view
+        self.render_scheduler = render_scheduler
+        self.follow = True
+        self._ready = False
+        self._position = (lat, lng)
+        self._track_dirty = False
+        self._reset_pending = False
+        self._landing = None
+        self._landing_dirty = False
+        self.trajectory = Trajectory(zoom=zoom)
+
+        self.channel = QWebChannel(self)
+        self.channel.registerObject('bridge', self)
+        self.view.page().setWebChannel(self.channel)
+
+        self.view.loadFinished.connect(self._on_load_finished)
+        # Przy mapie offline strona pochodzi ze schematu horus://, więc może z niego ładować zasoby
+        base_url = QUrl(ASSET_URL) if offline else QUrl('')
+        if html is None:
+            html = build_map_page(lat, lng, zoom, offline)
+        self.view.setHtml(html, base_url)
+
+    def _on_load_finished(self, ok):
+        if not ok:
+            self.logger.error("Map page failed to load")
+            return
+        self._ready = True
+        self.logger.debug("Map page loaded")
+        self.request_render()
+
+    def update_position(self, lat, lng, timestamp=None):
+        if not self.trajectory.append(time.time() if timestamp is None else timestamp, lat, lng):
+            return
+        self._position = (float(lat), float(lng))
+        self._track_dirty = True
+        self.request_render()
+
+    def reset(self, lat, lng):
+        self._position = (float(lat), float(lng))
+        self.trajectory.clear()
+        self._reset_pending = True
+        self._track_dirty = True
+        self.request_render()
+
+    def set_landing(self, lat, lng):
+        """Przewidywany punkt lądowania, None ukrywa znacznik."""
+        landing = None if lat is None else (round(float(lat), 7), round(float(lng), 7))
+        if landing == self._landing:
+            return
+        self._landing = landing
+        self._landing_dirty = True
+        self.request_render()
+
+    @pyqtSlot(int)
+    def on_zoom_changed(self, zoom):
+        self.trajectory.set_zoom(zoom)
+        self._track_dirty = True
+        self.request_render()
+
+    def invalidate_size(self):
+        if self._ready:
+            self.view.page().runJavaScript("horus.invalidateSize();")
+
+    def request_render(self):
+        if self.render_scheduler:
+            self.render_scheduler.mark_dirty(self)
+        else:
+            self.render()
+
+    def render(self):
+        if not self._ready:
+            return
+
+        script = ""
+        if self._landing_dirty:
+            self._landing_dirty = False
+            lat, lng = self._landing or (None, None)
+            script += f"horus.landing({json.dumps(lat)}, {json.dumps(lng)});"
+
+        if not self._track_dirty:
+            if script:
+                self.view.page().runJavaScript(script)
+            return
+        self._track_dirty = False
+
+        lat, lng = self._position
+        if self._reset_pending:
+            script += f"horus.reset({lat}, {lng});"
+            self._reset_pending = False
+        reset, vertices, tail = self.trajectory.take_delta()
+        script += f"horus.update({lat}, {lng}, {json.dumps(reset)}, {json.dumps(vertices)}, " \
+                  f"{json.dumps(tail)}, {json.dumps(self.follow)});"
+        self.view.page().runJavaScript(script)
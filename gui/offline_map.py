@@ -0,0 +1,103 @@
+import os
+import logging
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QBuffer, QIODevice, pyqtSignal
+from PyQt5.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+
+from gui.web_assets import local_path
+
+SCHEME = b"horus"
+
+
+def register_scheme():
+    """Rejestruje schemat horus:// - musi być wywołane przed utworzeniem QApplication."""
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalAccessAllowed |
+                    QWebEngineUrlScheme.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class OfflineMapSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Serwuje stronie mapy lokalne zasoby i kafelki.
+
+    horus://assets/<ścieżka> - pliki z gui/resources/web
+    horus://tiles/<z>/<x>/<y>.png - kafelki z TileCache
+
+    Brakujące kafelki są pobierane w tle (jeśli jest sieć) i odpowiedź
+    wraca do wątku GUI sygnałem, więc wątek interfejsu nigdy nie czeka
+    na serwer kafelków.
+    """
+    _tile_ready = pyqtSignal(object, object)
+
+    def __init__(self, tile_cache, parent=None, workers=4):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.offline_map')
+        self.tile_cache = tile_cache
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TileFetch")
+        self._pending_jobs = {}
+        self._tile_ready.connect(self._reply_tile)
+
+    def install(self, profile=None):
+        # QtWebEngineWidgets dopiero przy budowie mapy - QApplication ma ustawione AA_ShareOpenGLContexts
+        from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+        (profile or QWebEngineProfile.defaultProfile()).installUrlSchemeHandler(SCHEME, self)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        parts = [part for part in url.path().split('/') if part]
+        if url.host() == 'assets':
+            self._reply_asset(job, '/'.join(parts))
+        elif url.host() == 'tiles' and len(parts) == 3 and parts[2].endswith('.png'):
+            try:
+                z, x, y = int(parts[0]), int(parts[1]), int(parts[2][:-4])
+            except ValueError:
+                job.fail(QWebEngineUrlRequestJob.UrlInvalid)
+                return
+            data = self.tile_cache.get(z, x, y)
+            if data is not None:
+                self._reply(job, b"image/png", data)
+            elif self.tile_cache.online:
+                key = id(job)
+                self._pending_jobs[key] = job
+                # Strona może anulować żądanie zanim kafelek dotrze
+                job.destroyed.connect(lambda *_, key=key: self._pending_jobs.pop(key, None))
+                future = self._executor.submit(self.tile_cache.get_or_fetch, z, x, y)
+                future.add_done_callback(lambda f, key=key: self._tile_ready.emit(key, f))
+            else:
+                job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+        else:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+
+    def _reply_asset(self, job, relative):
+        path = local_path(relative)
+        if '..' in relative.split('/') or not os.path.isfile(path):
+            self.logger.warning(f"Missing map asset: {relative}")
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        mime = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self._reply(job, mime.encode(), data)
+
+    def _reply_tile(self, key, future):
+        job = self._pending_jobs.pop(key, None)
+        if job is None:
+            return
+        data = None if future.exception() else future.result()
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+        else:
+            self._reply(job, b"image/png", data)
+
+    @staticmethod
+    def _reply(job, mime, data):
+        buffer = QBuffer(job)
+        buffer.setData(data)
+        buffer.open(QIODevice.ReadOnly)
+        job.reply(mime, buffer)
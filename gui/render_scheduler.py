@@ -0,0 +1,52 @@
+import time
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from core.config import Config
+
+
+class RenderScheduler(QObject):
+    """Zbiera odświeżenia wykresów i rysuje je razem z ograniczoną liczbą klatek.
+
+    Nadejście danych tylko oznacza wykres jako brudny (mark_dirty). Timer
+    rysuje wszystkie brudne wykresy co najwyżej max_fps razy na sekundę i
+    zatrzymuje się, gdy nie ma nic do narysowania.
+    """
+    frame_rendered = pyqtSignal(float)
+
+    def __init__(self, max_fps=Config.DEFAULT_MAX_FPS, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger('HORUS_FAS.render_scheduler')
+        self._dirty = {}
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.render)
+        self.frames = 0
+        self.set_max_fps(max_fps)
+
+    def set_max_fps(self, max_fps):
+        self.max_fps = max_fps
+        self._timer.setInterval(max(int(1000 / max_fps), 1))
+        self.logger.info(f"Render rate capped at {max_fps} FPS")
+
+    def mark_dirty(self, target):
+        self._dirty[target] = None
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def render(self):
+        if not self._dirty:
+            self._timer.stop()
+            return
+
+        start = time.perf_counter()
+        targets = list(self._dirty)
+        self._dirty.clear()
+        for target in targets:
+            try:
+                target.render()
+            except Exception as e:
+                self.logger.error(f"Error rendering {target}: {e}")
+
+        self.frames += 1
+        self.frame_rendered.emit(time.perf_counter() - start)
@@ -0,0 +1,87 @@
+import math
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class TelemetryTableModel(QAbstractTableModel):
+    """Model tabeli bieżących wartości telemetrii.
+
+    Przechowuje same liczby i formatuje je dopiero w data(), gdy widok
+    rysuje komórkę. update() tylko zapamiętuje zmienione wiersze, a render()
+    - wywoływany przez RenderScheduler raz na klatkę - wysyła jeden wspólny
+    sygnał dataChanged.
+    """
+
+    ROWS = (
+        ("Altitude", 'altitude', "{:.2f} m"),
+        ("Velocity", 'ver_velocity', "{:.2f} m/s"),
+        ("Acceleration", 'ver_accel', "{:.2f} m/s²"),
+        ("Pitch", 'pitch', "{:.2f}°"),
+        ("Roll", 'roll', "{:.2f}°"),
+        ("Yaw", 'yaw', "{:.2f}°"),
+        ("Latitude", 'latitude', "{:.6f}° N"),
+        ("Longitude", 'longitude', "{:.6f}° E"),
+        ("Downrange", 'downrange', "{:.0f} m"),
+        ("Bearing", 'bearing', "{:.1f}°"),
+        ("Slant range", 'slant_range', "{:.0f} m"),
+        ("Elevation", 'elevation', "{:.1f}°"),
+        ("Landing range", 'landing_range', "{:.0f} m"),
+        ("Landing bearing", 'landing_bearing', "{:.1f}°"),
+    )
+    HEADERS = ("Parameter", "Value")
+
+    def __init__(self, render_scheduler=None, parent=None):
+        super().__init__(parent)
+        self.render_scheduler = render_scheduler
+        self._values = list(self._initial_values().values())
+        self._dirty_rows = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ROWS)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        label, _, fmt = self.ROWS[index.row()]
+        if index.column() == 0:
+            return label
+        value = self._values[index.row()]
+        return "—" if math.isnan(value) else fmt.format(value)
+
+    def update(self, record: dict):
+        for row, (_, key, _) in enumerate(self.ROWS):
+            if key not in record:
+                continue
+            value = float(record[key])
+            previous = self._values[row]
+            if value != previous and not (math.isnan(value) and math.isnan(previous)):
+                self._values[row] = value
+                self._dirty_rows.add(row)
+
+        if self._dirty_rows:
+            if self.render_scheduler:
+                self.render_scheduler.mark_dirty(self)
+            else:
+                self.render()
+
+    def render(self):
+        if not self._dirty_rows:
+            return
+        first, last = min(self._dirty_rows), max(self._dirty_rows)
+        self._dirty_rows.clear()
+        self.dataChanged.emit(self.index(first, 1), self.index(last, 1), [Qt.DisplayRole])
+
+    def _initial_values(self):
+        # Prognoza lądowania istnieje dopiero w fazie opadania
+        return {key: float('nan') if key.startswith('landing_') else 0.0 for _, key, _ in self.ROWS}
+
+    def clear(self):
+        self.update(self._initial_values())
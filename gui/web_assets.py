@@ -0,0 +1,67 @@
+import os
+
+WEB_ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'web')
+ASSET_URL = "horus://assets/"
+TILE_URL = "horus://tiles/{z}/{x}/{y}.png"
+TILE_ATTRIBUTION = '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+
+LEAFLET = "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/"
+AWESOME_MARKERS = "https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/"
+FONTAWESOME = "https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.2.0/"
+GLYPHICONS = "https://netdna.bootstrapcdn.com/bootstrap/3.0.0/"
+
+# Zasoby stron folium: nazwa folium -> (adres CDN, ścieżka lokalna, pliki, do których odwołuje się CSS).
+# Układ katalogów odpowiada CDN, więc względne url(...) w arkuszach CSS działają bez zmian.
+ASSETS = {
+    'leaflet': (LEAFLET + "leaflet.js", "leaflet/leaflet.js", []),
+    'jquery': ("https://code.jquery.com/jquery-3.7.1.min.js", "jquery/jquery-3.7.1.min.js", []),
+    'bootstrap': ("https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/js/bootstrap.bundle.min.js",
+                  "bootstrap/js/bootstrap.bundle.min.js", []),
+    'awesome_markers': (AWESOME_MARKERS + "leaflet.awesome-markers.js",
+                        "awesome-markers/leaflet.awesome-markers.js", []),
+    'leaflet_css': (LEAFLET + "leaflet.css", "leaflet/leaflet.css", [
+        (LEAFLET + f"images/{name}", f"leaflet/images/{name}")
+        for name in ("layers.png", "layers-2x.png", "marker-icon.png", "marker-icon-2x.png", "marker-shadow.png")
+    ]),
+    'bootstrap_css': ("https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/css/bootstrap.min.css",
+                      "bootstrap/css/bootstrap.min.css", []),
+    'glyphicons_css': (GLYPHICONS + "css/bootstrap-glyphicons.css", "glyphicons/css/bootstrap-glyphicons.css", [
+        (GLYPHICONS + f"fonts/glyphicons-halflings-regular.{ext}",
+         f"glyphicons/fonts/glyphicons-halflings-regular.{ext}")
+        for ext in ("eot", "woff", "ttf", "svg")
+    ]),
+    'awesome_markers_font_css': (FONTAWESOME + "css/all.min.css", "fontawesome/css/all.min.css", [
+        (FONTAWESOME + f"webfonts/{name}.{ext}", f"fontawesome/webfonts/{name}.{ext}")
+        for name in ("fa-solid-900", "fa-regular-400", "fa-brands-400", "fa-v4compatibility")
+        for ext in ("woff2", "ttf")
+    ]),
+    'awesome_markers_css': (AWESOME_MARKERS + "leaflet.awesome-markers.css",
+                            "awesome-markers/leaflet.awesome-markers.css", [
+        (AWESOME_MARKERS + f"images/{name}", f"awesome-markers/images/{name}")
+        for name in ("markers-soft.png", "markers-soft@2x.png", "markers-shadow.png", "markers-shadow@2x.png",
+                     "markers-matte.png", "markers-matte@2x.png", "markers-plain.png")
+    ]),
+    'awesome_rotate_css': ("https://cdn.jsdelivr.net/gh/python-visualization/folium/folium/templates/"
+                           "leaflet.awesome.rotate.min.css", "folium/leaflet.awesome.rotate.min.css", []),
+}
+
+
+def local_path(relative):
+    return os.path.join(WEB_ASSET_DIR, *relative.split('/'))
+
+
+def localize(element):
+    """Podmienia linki CDN elementu folium na lokalne kopie, o ile zostały pobrane.
+
+    Listy ustawiane są na instancji - metody add_js_link/add_css_link
+    folium zmieniłyby listy klasy dla wszystkich map. Zwraca adresy CDN,
+    które zostały w stronie, bo brak ich lokalnej kopii.
+    """
+    def resolve(name, url):
+        if name in ASSETS and os.path.exists(local_path(ASSETS[name][1])):
+            return name, ASSET_URL + ASSETS[name][1]
+        return name, url
+
+    element.default_js = [resolve(name, url) for name, url in element.default_js]
+    element.default_css = [resolve(name, url) for name, url in element.default_css]
+    return [url for _, url in element.default_js + element.default_css if not url.startswith(ASSET_URL)]
@@ -1,22 +1,25 @@
-import json
+from core.startup_profiler import StartupProfiler
+
+# Pomiar startu obejmuje już importy poniżej
+startup_profiler = StartupProfiler()
+startup_profiler.install_import_hook()
+
 import sys
+import argparse
 import logging
 import platform
 import threading
 import time
 import traceback
 from functools import partial
-from PyQt5.QtWidgets import QApplication, QDialog
-from PyQt5.QtCore import QTimer, QThread
+from PyQt5.QtCore import Qt, QTimer, QThread
 
-from core.csv_handler import CsvHandler
-from gui.main_window import MainWindow
-from core.serial_config import SerialConfigDialog
 from core.utils import Utils
 from core.config import Config
-from core.gpio_reader import GpioReader
-from core.network_handler import NetworkTransmitter
-from core.serial_reader import SerialReader
+from core.event_bus import EventBus
+from core.metrics import (MetricsRegistry, MetricsSampler, GcPauseProbe, EventLoopLagProbe, process_collector,
+                          event_bus_collector)
+from core.stall_watchdog import StallWatchdog
 import os
 
 
@@ -44,7 +47,48 @@ def thread_exception_handler(args):
 threading.excepthook = thread_exception_handler
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="HORUS Flight Analysis Station")
+    parser.add_argument('--headless', action='store_true',
+                        help='reception, logging and forwarding only - no GUI, no QApplication')
+    parser.add_argument('--acquisition-process', action='store_true',
+                        help='GUI mode: read the serial port in a separate process, records reach the GUI '
+                             'through a shared-memory ring')
+    headless = parser.add_argument_group('headless mode')
+    headless.add_argument('--port', default='', help='serial port of the LoRa receiver')
+    headless.add_argument('--baudrate', type=int, default=Config.DEFAULT_BAUD_RATE)
+    headless.add_argument('--lora', action='store_true', help='use Config.DEFAULT_LORA_CONFIG for uplink airtime')
+    headless.add_argument('--host', default=Config.DEFAULT_IP_ADDRESS, help='partner (HORUS CSS) address')
+    headless.add_argument('--net-port', type=int, default=Config.DEFAULT_IP_PORT)
+    headless.add_argument('--multicast', action='store_true', help='also publish records over UDP multicast')
+    headless.add_argument('--simulate', type=float, default=None, metavar='RATE',
+                          help='generate RATE simulated frames/s instead of reading the serial port '
+                               '(also with --acquisition-process)')
+    headless.add_argument('--status-file', default=None, help='defaults to <appdata>/HORUS_FAS/headless_status.json')
+    headless.add_argument('--duration', type=float, default=None, help='stop after this many seconds')
+    # Pozostałe argumenty (np. -style) trafiają do Qt
+    return parser.parse_known_args(argv)
+
+
+def default_config(args):
+    """Konfiguracja z linii poleceń - tryb bez GUI i anulowane okno konfiguracji."""
+    return {
+        'port': args.port,
+        'baudrate': args.baudrate,
+        'lora_config': dict(Config.DEFAULT_LORA_CONFIG) if args.lora else None,
+        'is_config_selected': True,
+        "network": {
+            'ip_address': args.host,
+            "port": args.net_port,
+            'multicast_enabled': args.multicast,
+            'multicast_group': Config.DEFAULT_MULTICAST_GROUP,
+            'multicast_port': Config.DEFAULT_MULTICAST_PORT
+        }
+    }
+
+
 def main():
+    args, qt_args = parse_args(sys.argv[1:])
     session_dir = Utils.create_session_directory()
     log_file = os.path.join(session_dir, 'app_events.log')
 
@@ -64,60 +108,74 @@ def main():
     main_thread = threading.current_thread()
     logger.debug(f"Main thread: {main_thread.name}, ID: {threading.get_ident()}, alive: {main_thread.is_alive()}")
 
-    app = QApplication(sys.argv)
+    if args.headless:
+        with startup_profiler.phase("Subsystem imports"):
+            from core.headless import run_headless
+        startup_profiler.remove_import_hook()
+        startup_profiler.report()
+        config = default_config(args)
+        logger.info(f"Headless mode, configuration: {config}")
+        sys.exit(run_headless(args, config))
+
+    from PyQt5.QtWidgets import QApplication, QDialog
+    from gui.offline_map import register_scheme
+    from core.serial_config import SerialConfigDialog
+
+    with startup_profiler.phase("QApplication"):
+        register_scheme()  # schemat horus:// mapy offline musi istnieć przed QApplication
+        # Wspólne konteksty OpenGL pozwalają zaimportować QtWebEngineWidgets dopiero przy budowie mapy
+        QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+        app = QApplication(sys.argv[:1] + qt_args)
     logger.debug("QApplication instance created")
 
-    # Enhanced thread monitoring with more details
-    def monitor_threads():
-        try:
-            active_threads = threading.enumerate()
-            thread_details = []
-            for t in active_threads:
-                thread_details.append(f"{t.name} (alive: {t.is_alive()}, daemon: {t.daemon})")
-
-            logger.debug(f"Active threads ({len(active_threads)}): {thread_details}")
-
-            # Check GUI responsiveness
-            if 'window' in locals():
-                logger.debug(f"Main window visible: {window.isVisible()}, active: {window.isActiveWindow()}")
-
-            # Check if QApplication is processing events
-            logger.debug(f"QApplication pending events: {app.hasPendingEvents()}")
-
-        except Exception as e:
-            logger.error(f"Error in thread monitor: {e}")
-
-    monitor_timer = QTimer()
-    monitor_timer.timeout.connect(monitor_threads)
-    monitor_timer.start(3000)  # Monitor every 3 seconds
-    logger.debug("Thread monitor timer started")
+    # Wspólna magistrala zdarzeń sieci, GPIO i portu szeregowego
+    bus = EventBus()
+
+    # Metryki stanu próbkowane co sekundę - pasek stanu, okno diagnostyki i metrics.jsonl w katalogu sesji
+    metrics = MetricsRegistry()
+    metrics.add_collector(process_collector())
+    metrics.add_collector(event_bus_collector(bus))
+    gc_probe = GcPauseProbe(metrics)
+    loop_lag_probe = EventLoopLagProbe(metrics)
+    metrics_sampler = MetricsSampler(metrics, os.path.join(session_dir, 'metrics.jsonl'))
+    loop_lag_probe.start()
+    metrics_sampler.start()
+    # Zawieszenia GUI trafiają do logu ze stosem wątku głównego
+    stall_watchdog = StallWatchdog(metrics)
+    stall_watchdog.start()
+    logger.debug(f"Threads at startup: {[t.name for t in threading.enumerate()]}")
 
     try:
         config_dialog = SerialConfigDialog(default_ip_address=Config.DEFAULT_IP_ADDRESS)
         logger.debug("SerialConfigDialog initialized with default IP: %s", Config.DEFAULT_IP_ADDRESS)
 
-        if config_dialog.exec_() == QDialog.Accepted:
+        startup_profiler.mark("Config dialog ready")
+        with startup_profiler.phase("Config dialog", interactive=True):
+            accepted = config_dialog.exec_() == QDialog.Accepted
+
+        if accepted:
             config = config_dialog.get_settings()
             logger.info(f"Port configuration loaded: {config}")
         else:
-            config = {
-                'port': "",
-                'baudrate': Config.DEFAULT_BAUD_RATE,
-                'lora_config': None,
-                'is_config_selected': True,
-                "network": {
-                    'ip_address': Config.DEFAULT_IP_ADDRESS,
-                    "port": Config.DEFAULT_IP_PORT
-                }
-            }
+            config = default_config(args)
             logger.warning("User canceled port selection - using default settings: %s", config)
 
+        # Podsystemy ładowane dopiero po wyborze konfiguracji - okno dialogowe pojawia się szybciej
+        with startup_profiler.phase("Subsystem imports"):
+            from core.csv_handler import CsvHandler
+            from core.gpio_reader import GpioReader
+            from core.network_handler import NetworkTransmitter
+            from core.serial_reader import SerialReader
+            from core.uplink_scheduler import UplinkPriority
+            from gui.main_window import MainWindow
+
         network_config = config['network']
         logger.debug("Initializing NetworkTransmitter with IP %s and port %s", network_config['ip_address'],
                      network_config['port'])
 
         # Add timeout and connection status tracking
-        transmitter = NetworkTransmitter(host=network_config['ip_address'], port=int(network_config['port']))
+        transmitter = NetworkTransmitter(host=network_config['ip_address'], port=int(network_config['port']),
+                                         bus=bus)
         logger.info("NetworkTransmitter initialized")
 
         # Track connection state
@@ -138,12 +196,19 @@ def main():
 
         # Only create SerialReader if we have a valid port
         serial_reader = None
-        if config['port']:
+        acquisition = None
+        if args.acquisition_process and (config['port'] or args.simulate):
+            from core.acquisition_process import AcquisitionClient
+            acquisition = AcquisitionClient(config, session_dir, simulate_rate=args.simulate)
+            acquisition.start()
+        elif config['port']:
             logger.info(f"Creating SerialReader on port {config['port']} with baudrate {config['baudrate']}")
             serial_reader = SerialReader(
                 port=config['port'],
                 baudrate=config['baudrate'],
-                transmitter=transmitter
+                transmitter=transmitter,
+                lora_config=config['lora_config'],
+                bus=bus
             )
             logger.info(f"SerialReader initialized on port {config['port']} and baudrate {config['baudrate']}")
 
@@ -160,11 +225,13 @@ def main():
         else:
             logger.warning("No serial port configured - skipping SerialReader initialization")
 
-        gpio_reader = GpioReader(Config.DEFAULT_GPIO_PIN)
+        gpio_reader = GpioReader(Config.DEFAULT_GPIO_PIN, bus=bus)
         logger.debug("GpioReader initialized on pin %s", Config.DEFAULT_GPIO_PIN)
 
-        if serial_reader:
-            gpio_reader.subscribe_button_held(partial(serial_reader.send_data, "abort"))
+        # Abort i polecenia z sieci idą do portu albo do procesu akwizycji, który go obsługuje
+        uplink = serial_reader or acquisition
+        if uplink:
+            gpio_reader.subscribe_button_held(partial(uplink.send_data, "abort", UplinkPriority.ABORT))
             logger.debug("GPIO event subscribed to send abort signal")
         else:
             logger.warning("No serial reader available - GPIO abort signal disabled")
@@ -172,9 +239,21 @@ def main():
         csv_handler = CsvHandler()
 
         logger.debug("Creating MainWindow...")
-        window = MainWindow(config, transmitter, gpio_reader, csv_handler, serial_reader)
+        with startup_profiler.phase("MainWindow"):
+            window = MainWindow(config, transmitter, gpio_reader, csv_handler, serial_reader, acquisition,
+                                metrics_sampler)
         logger.debug("MainWindow initialized")
 
+        def on_first_window():
+            startup_profiler.mark("First window shown")
+            startup_profiler.remove_import_hook()
+
+        def on_map_ready(ok):
+            startup_profiler.mark("Map ready" if ok else "Map failed")
+            startup_profiler.report()
+
+        window.map_ready.connect(on_map_ready)
+
         # Enhanced callback logging
         def logged_partner_connected():
             logger.info("Partner connected callback triggered")
@@ -186,13 +265,14 @@ def main():
 
         def logged_data_received(data):
             logger.debug(f"Data received from network: {data}")
-            if serial_reader:
-                serial_reader.send_data(json.dumps(data))
+            if uplink:
+                uplink.relay_command(data)
             else:
                 logger.warning("No serial reader available to send data")
 
-        transmitter.subscribe_on_partner_connected(logged_partner_connected)
-        transmitter.subscribe_on_partner_disconnected(logged_partner_disconnected)
+        # Okno aktualizowane tylko z wątku GUI
+        transmitter.subscribe_on_partner_connected(logged_partner_connected, mode='qt')
+        transmitter.subscribe_on_partner_disconnected(logged_partner_disconnected, mode='qt')
         transmitter.subscribe_on_data_received(logged_data_received)
         logger.debug("NetworkTransmitter callbacks subscribed")
 
@@ -210,9 +290,8 @@ def main():
         logger.debug("Main window resized to 800x600")
         window.show()
         logger.debug("Main window shown")
-
-        # Initial thread state
-        monitor_threads()
+        # Zdarzenia z kolejki (w tym pierwsze rysowanie okna) obsłużone przed tym wywołaniem
+        QTimer.singleShot(0, on_first_window)
 
         logger.info("Entering main application event loop")
         exit_code = app.exec_()
@@ -225,8 +304,11 @@ def main():
         logger.info("Starting cleanup process...")
 
         # Stop monitoring first
-        monitor_timer.stop()
-        logger.debug("Thread monitor timer stopped")
+        stall_watchdog.stop()
+        metrics_sampler.stop()
+        loop_lag_probe.stop()
+        gc_probe.close()
+        logger.debug("Metrics sampling stopped")
 
         # Cleanup in reverse order of creation
         cleanup_timeout = 5  # seconds
@@ -241,11 +323,14 @@ def main():
             except Exception as e:
                 logger.error(f"Error stopping serial reader: {e}")
 
+        if 'acquisition' in locals() and acquisition:
+            acquisition.stop_reading()
+
         # Close network connection
         if 'transmitter' in locals():
             logger.debug("Closing network connection...")
             try:
-                transmitter.close_connection()
+                transmitter.shutdown()
                 logger.info("Network connection closed")
             except Exception as e:
                 logger.error(f"Error closing network connection: {e}")
@@ -259,6 +344,9 @@ def main():
             else:
                 logger.debug("Connection thread finished successfully")
 
+        bus.close()
+        logger.debug("Event bus closed")
+
         cleanup_duration = time.time() - start_cleanup_time
         logger.info(f"Cleanup completed in {cleanup_duration:.2f} seconds")
 
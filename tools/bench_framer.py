@@ -0,0 +1,95 @@
+"""Stress test for LineFramer with multi-megabyte bursts.
+
+Run from the repository root:
+    python -m tools.bench_framer
+
+For every burst size the same payload is pushed through a socketpair and
+framed twice: once with LineFramer and once with the previous
+``buffer += chunk`` / ``split`` approach. With linear framing the time per MB
+stays flat as bursts grow.
+"""
+import argparse
+import json
+import socket
+import threading
+import time
+
+from core.network_handler import LineFramer
+
+
+def build_payload(size, message_size):
+    if message_size:
+        record = json.dumps({'command': 'x' * max(message_size - 20, 1)}).encode() + b"\n"
+    else:
+        # Jedna wiadomość rozciągnięta na cały burst
+        record = json.dumps({'command': 'x' * size}).encode() + b"\n"
+    count = max(size // len(record), 1)
+    return record * count, count
+
+
+def _send_all(sock, payload):
+    sock.sendall(payload)
+    sock.shutdown(socket.SHUT_WR)
+
+
+def frame_with_framer(payload):
+    rx, tx = socket.socketpair()
+    sender = threading.Thread(target=_send_all, args=(tx, payload), daemon=True)
+    framer = LineFramer()
+    frames = 0
+    start = time.perf_counter()
+    sender.start()
+    while framer.receive_from(rx):
+        for _ in framer.frames():
+            frames += 1
+    elapsed = time.perf_counter() - start
+    sender.join()
+    rx.close()
+    tx.close()
+    return elapsed, frames
+
+
+def frame_legacy(payload):
+    rx, tx = socket.socketpair()
+    sender = threading.Thread(target=_send_all, args=(tx, payload), daemon=True)
+    buffer = b""
+    frames = 0
+    start = time.perf_counter()
+    sender.start()
+    while True:
+        chunk = rx.recv(4096)
+        if not chunk:
+            break
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            line.decode("utf-8")
+            frames += 1
+    elapsed = time.perf_counter() - start
+    sender.join()
+    rx.close()
+    tx.close()
+    return elapsed, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,2,4,8,16', help='burst sizes in MB')
+    parser.add_argument('--message-size', type=int, default=200,
+                        help='bytes per message, 0 = one message spanning the whole burst')
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    print(f"{'burst MB':>9} {'frames':>9} {'framer s':>10} {'framer s/MB':>12} {'legacy s':>10} {'legacy s/MB':>12}")
+    for size_mb in (int(s) for s in args.sizes.split(',')):
+        payload, _ = build_payload(size_mb * 1024 * 1024, args.message_size)
+        framer_time, frames = frame_with_framer(payload)
+        line = f"{size_mb:>9} {frames:>9} {framer_time:>10.3f} {framer_time / size_mb:>12.4f}"
+        if not args.skip_legacy:
+            legacy_time, _ = frame_legacy(payload)
+            line += f" {legacy_time:>10.3f} {legacy_time / size_mb:>12.4f}"
+        print(line, flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""Headless GUI rendering benchmark at stepped telemetry rates.
+
+Run from the repository root:
+    python -m tools.bench_gui --rates 50,100,200,500,1000 --step-seconds 5 --json gui_bench.json
+
+Synthetic records are pushed through MainWindow.handle_processed_data under
+the offscreen Qt platform, one step per rate. Every step reports the
+achieved ingest rate, render frame times, event-loop latency, CPU usage and
+memory. A step counts as sustained when at least 95% of the records were
+ingested and the event-loop latency stayed below --max-lag-ms.
+
+When MainWindow cannot be created (e.g. QtWebEngine is missing) the
+benchmark falls back to the six LivePlots on a shared TelemetryStore; the
+report names the target that was measured. Pass --baseline with an earlier
+report to fail on rendering regressions.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QT_VERSION_STR, QTimer, Qt
+from PyQt5.QtWidgets import QApplication, QGridLayout, QWidget
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from core.config import Config
+from core.telemetry_store import TelemetryStore
+from gui.live_plot import LivePlot
+from gui.render_scheduler import RenderScheduler
+
+PROBE_INTERVAL_MS = 10
+
+
+def percentiles(samples, scale=1000):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)] * scale
+
+    return {
+        'mean_ms': statistics.fmean(ordered) * scale,
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'p99_ms': pick(0.99),
+        'max_ms': ordered[-1] * scale,
+    }
+
+
+def make_record(index):
+    t = index * 0.01
+    return {
+        'ver_velocity': 50.0 * math.sin(t * 0.3),
+        'altitude': 1500.0 + 1000.0 * math.sin(t * 0.05),
+        'pitch': 10.0 * math.sin(t),
+        'roll': 5.0 * math.cos(t),
+        'yaw': (t * 20.0) % 360.0,
+        'status': 2,
+        'latitude': 52.2549 + 0.001 * math.sin(t * 0.01),
+        'longitude': 20.9004 + 0.001 * math.cos(t * 0.01),
+        'rbs': 0,
+    }
+
+
+class PlotHarness(QWidget):
+    """The six MainWindow plots on a shared store, without the rest of the window."""
+
+    def __init__(self, max_fps):
+        super().__init__()
+        self.render_scheduler = RenderScheduler(max_fps, self)
+        self.store = TelemetryStore()
+        layout = QGridLayout(self)
+        for i, channel in enumerate(self.store.all_channels):
+            plot = LivePlot(title=channel, timespan=30, render_scheduler=self.render_scheduler,
+                            store=self.store, channel=channel)
+            layout.addWidget(plot, i // 2, i % 2)
+        self.resize(1600, 900)
+        self.show()
+
+    def handle_processed_data(self, data):
+        self.store.append(time.time(), data)
+
+
+def create_target(name, max_fps):
+    if name in ('auto', 'window'):
+        try:
+            from core.csv_handler import CsvHandler
+            from core.utils import Utils
+            from gui.main_window import MainWindow
+
+            Utils.create_session_directory()  # CsvHandler zapisuje do katalogu sesji
+            config = {'port': None, 'baudrate': Config.DEFAULT_BAUD_RATE, 'multicast_enabled': False}
+            window = MainWindow(config, None, None, CsvHandler(), None)
+            window.render_scheduler.set_max_fps(max_fps)
+            return 'window', window
+        except Exception as e:
+            if name == 'window':
+                raise
+            print(f"MainWindow unavailable ({e}) - measuring plots only", file=sys.stderr)
+    return 'plots', PlotHarness(max_fps)
+
+
+class ResourceSampler:
+    def __init__(self):
+        self.process = psutil.Process() if psutil else None
+        if self.process:
+            self.process.cpu_percent(None)
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+
+    def sample(self):
+        wall = time.perf_counter() - self._wall_start
+        result = {'cpu_percent': (time.process_time() - self._cpu_start) / wall * 100 if wall else 0.0}
+        if self.process:
+            result['rss_mb'] = self.process.memory_info().rss / 2 ** 20
+        else:
+            # ru_maxrss jest w KiB na Linuksie - to szczyt, nie bieżące zużycie
+            result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return result
+
+
+def run_step(app, target, rate, duration, start_index):
+    frame_times = []
+    loop_lags = []
+    scheduler = target.render_scheduler
+    frames_before = scheduler.frames
+    on_frame = frame_times.append
+    scheduler.frame_rendered.connect(on_frame)
+
+    state = {'index': start_index, 'sent': 0, 'last_probe': time.perf_counter()}
+    start = time.perf_counter()
+
+    def feed():
+        # Zaległe rekordy są dosyłane paczką, więc tempo nie zależy od rozdzielczości timera
+        due = int((time.perf_counter() - start) * rate)
+        while state['sent'] < due:
+            target.handle_processed_data(make_record(state['index']))
+            state['index'] += 1
+            state['sent'] += 1
+
+    def probe():
+        now = time.perf_counter()
+        loop_lags.append(max(now - state['last_probe'] - PROBE_INTERVAL_MS / 1000, 0.0))
+        state['last_probe'] = now
+
+    feeder = QTimer()
+    feeder.setTimerType(Qt.PreciseTimer)
+    feeder.timeout.connect(feed)
+    feeder.start(max(int(1000 / rate), 1))
+
+    prober = QTimer()
+    prober.setTimerType(Qt.PreciseTimer)
+    prober.timeout.connect(probe)
+    prober.start(PROBE_INTERVAL_MS)
+
+    sampler = ResourceSampler()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.0005)
+
+    feeder.stop()
+    prober.stop()
+    elapsed = time.perf_counter() - start
+    scheduler.frame_rendered.disconnect(on_frame)
+
+    return {
+        'target_rate': rate,
+        'achieved_rate': state['sent'] / elapsed,
+        'records': state['sent'],
+        'frames': scheduler.frames - frames_before,
+        'fps': (scheduler.frames - frames_before) / elapsed,
+        'frame_time': percentiles(frame_times),
+        'event_loop_latency': percentiles(loop_lags),
+        **sampler.sample(),
+    }, state['index']
+
+
+def compare(report, baseline, tolerance):
+    """Lista regresji względem wcześniejszego raportu."""
+    regressions = []
+    if report['max_sustained_rate'] < baseline.get('max_sustained_rate', 0) * (1 - tolerance):
+        regressions.append(
+            f"max sustained rate {report['max_sustained_rate']} < baseline {baseline['max_sustained_rate']}")
+
+    baseline_steps = {step['target_rate']: step for step in baseline.get('steps', [])}
+    for step in report['steps']:
+        previous = baseline_steps.get(step['target_rate'])
+        if not previous or not previous['frame_time'] or not step['frame_time']:
+            continue
+        if step['frame_time']['p95_ms'] > previous['frame_time']['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{step['target_rate']} rec/s: frame p95 {step['frame_time']['p95_ms']:.2f} ms "
+                f"> baseline {previous['frame_time']['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=('auto', 'window', 'plots'), default='auto')
+    parser.add_argument('--rates', default='50,100,200,500,1000,2000', help='records/s per step')
+    parser.add_argument('--step-seconds', type=float, default=5.0)
+    parser.add_argument('--max-fps', type=int, default=Config.DEFAULT_MAX_FPS)
+    parser.add_argument('--max-lag-ms', type=float, default=100.0,
+                        help='event-loop latency (p95) above which the UI counts as lagging')
+    parser.add_argument('--json', default=None, help='also write the report to this file')
+    parser.add_argument('--baseline', default=None, help='earlier report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression')
+    args = parser.parse_args()
+
+    # Brak partnera i portu szeregowego daje błąd w logu na każdy rekord
+    logging.disable(logging.ERROR)
+    app = QApplication.instance() or QApplication(sys.argv)
+    target_name, target = create_target(args.target, args.max_fps)
+    app.processEvents()
+
+    steps = []
+    index = 0
+    max_sustained_rate = 0
+    for rate in (int(r) for r in args.rates.split(',')):
+        step, index = run_step(app, target, rate, args.step_seconds, index)
+        lag = step['event_loop_latency'].get('p95_ms', 0.0)
+        step['sustained'] = step['achieved_rate'] >= 0.95 * rate and lag <= args.max_lag_ms
+        steps.append(step)
+        print(f"{rate:>6} rec/s: achieved {step['achieved_rate']:8.1f}, {step['fps']:5.1f} FPS, "
+              f"frame p95 {step['frame_time'].get('p95_ms', 0.0):6.2f} ms, loop lag p95 {lag:7.2f} ms, "
+              f"CPU {step['cpu_percent']:5.1f}%", file=sys.stderr, flush=True)
+        if step['sustained']:
+            max_sustained_rate = rate
+
+    report = {
+        'target': target_name,
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'max_fps': args.max_fps,
+        'step_seconds': args.step_seconds,
+        'max_lag_ms': args.max_lag_ms,
+        'max_sustained_rate': max_sustained_rate,
+        'steps': steps,
+    }
+    target.close()
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
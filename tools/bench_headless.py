@@ -0,0 +1,131 @@
+"""CPU and memory of the headless station compared with the GUI build.
+
+Run from the repository root:
+    python -m tools.bench_headless --rate 100 --seconds 20 --json headless_bench.json
+
+Both variants run as child processes fed with the same record rate and are
+measured from the outside the same way: CPU time over the measurement
+window (after --warmup seconds, so startup is excluded) and resident
+memory sampled every 0.25 s.
+
+- headless: `main.py --headless --simulate` - simulated radio, ProcessData,
+  CSV logging and forwarding (partner unreachable, so records go to the
+  outbox journal)
+- gui: `tools.bench_gui --target window` under the offscreen platform -
+  MainWindow with plots, table and statistics
+
+Session files of the children go to a temporary APPDATA directory.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SAMPLE_INTERVAL = 0.25
+
+
+def read_usage(pid):
+    """(czas CPU w s, RSS w MB) procesu - psutil albo /proc."""
+    if psutil:
+        process = psutil.Process(pid)
+        times = process.cpu_times()
+        return times.user + times.system, process.memory_info().rss / 2 ** 20
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    with open(f"/proc/{pid}/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return (int(fields[11]) + int(fields[12])) / ticks, resident_pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def measure(name, command, env, warmup, seconds):
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    started = time.monotonic()
+    rss = []
+    cpu_start = cpu_end = None
+    try:
+        while process.poll() is None:
+            elapsed = time.monotonic() - started
+            if elapsed >= warmup + seconds:
+                break
+            try:
+                cpu, resident = read_usage(process.pid)
+            except (OSError, ProcessLookupError):
+                break
+            if elapsed >= warmup:
+                if cpu_start is None:
+                    cpu_start = (elapsed, cpu)
+                cpu_end = (elapsed, cpu)
+                rss.append(resident)
+            time.sleep(SAMPLE_INTERVAL)
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    if cpu_start is None or cpu_end[0] <= cpu_start[0]:
+        return {'variant': name, 'error': f"process exited early with code {process.returncode}"}
+    return {
+        'variant': name,
+        'cpu_percent': 100.0 * (cpu_end[1] - cpu_start[1]) / (cpu_end[0] - cpu_start[0]),
+        'rss_mean_mb': sum(rss) / len(rss),
+        'rss_peak_mb': max(rss),
+        'window_s': cpu_end[0] - cpu_start[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=50.0, help='records/s fed to both variants')
+    parser.add_argument('--seconds', type=float, default=15.0, help='measurement window')
+    parser.add_argument('--warmup', type=float, default=5.0, help='seconds skipped after start')
+    parser.add_argument('--variants', default='headless,gui')
+    parser.add_argument('--json', default=None, help='also write the report to this file')
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    total = args.warmup + args.seconds + 5
+    commands = {
+        # Symulowane radio wysyła parę ramek A+B, każda daje jeden rekord
+        'headless': [sys.executable, os.path.join(root, 'main.py'), '--headless', '--simulate', str(args.rate / 2),
+                     '--host', '127.0.0.1', '--net-port', '9', '--duration', str(total)],
+        'gui': [sys.executable, '-m', 'tools.bench_gui', '--target', 'window', '--rates', str(int(args.rate)),
+                '--step-seconds', str(total)],
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='horus_bench_') as appdata:
+        env = dict(os.environ, APPDATA=appdata, QT_QPA_PLATFORM='offscreen',
+                   PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+        for name in args.variants.split(','):
+            print(f"Measuring {name} at {args.rate:g} records/s...", flush=True)
+            results.append(measure(name, commands[name], env, args.warmup, args.seconds))
+
+    print(f"{'variant':>10} {'CPU %':>8} {'RSS mean':>10} {'RSS peak':>10}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['variant']:>10}  {result['error']}")
+            continue
+        print(f"{result['variant']:>10} {result['cpu_percent']:8.1f} {result['rss_mean_mb']:8.1f} MB "
+              f"{result['rss_peak_mb']:8.1f} MB")
+
+    report = {'rate': args.rate, 'seconds': args.seconds, 'warmup': args.warmup, 'results': results}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    raise SystemExit(1 if any('error' in result for result in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Points/s benchmark of LivePlot at history sizes from 1k to 1M.
+
+Run from the repository root:
+    python -m tools.bench_live_plot
+
+Each plot is prefilled with the given number of points before measuring.
+Two rates are reported per size: appending full telemetry rows to a
+TelemetryStore alone and the full add_point path including the curve
+update.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from core.telemetry_store import TelemetryStore
+from gui.live_plot import LivePlot
+
+
+def bench_store(size, points):
+    store = TelemetryStore()
+    times = np.arange(size) * 0.01
+    store.set_data(times, {name: np.sin(times) for name in store.channels})
+    start_ts = size * 0.01
+    record = {name: 0.0 for name in store.channels}
+    start = time.perf_counter()
+    for i in range(points):
+        record['ver_velocity'] = float(i)
+        store.append(start_ts + i * 0.01, record)
+    return points / (time.perf_counter() - start)
+
+
+def bench_add_point(plot, points, app):
+    start_ts = plot.timestamps[-1] if len(plot.timestamps) else 0.0
+    start = time.perf_counter()
+    for i in range(points):
+        plot.add_point(start_ts + i * 0.01, float(i % 100))
+    app.processEvents()
+    return points / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000')
+    parser.add_argument('--points', type=int, default=2000, help='points appended per measurement')
+    parser.add_argument('--max-seconds', type=float, default=20.0,
+                        help='cap on the add_point measurement per size')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'size':>10} {'store rows/s':>14} {'add_point pts/s':>16}")
+    for size in (int(c) for c in args.sizes.split(',')):
+        plot = LivePlot(title=f"bench {size}")
+        plot.resize(800, 300)
+        plot.show()
+        now = time.time()
+        plot.set_data(now - np.arange(size)[::-1] * 0.01, np.sin(np.arange(size) * 0.01))
+        app.processEvents()
+
+        store_rate = bench_store(size, args.points * 10)
+
+        # Przy dużych pojemnościach ogranicz liczbę punktów do budżetu czasu
+        probe = bench_add_point(plot, 10, app)
+        points = max(10, min(args.points, int(probe * args.max_seconds)))
+        add_point_rate = bench_add_point(plot, points, app)
+
+        print(f"{size:>10} {store_rate:>14.0f} {add_point_rate:>16.1f}", flush=True)
+        plot.close()
+        plot.deleteLater()
+        app.processEvents()
+
+
+if __name__ == '__main__':
+    main()
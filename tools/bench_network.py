@@ -0,0 +1,124 @@
+"""Throughput benchmark of NetworkTransmitter against the local partner server.
+
+Run from the repository root:
+    python -m tools.bench_network --records 20000 --reconnects 5
+
+Reports sustained records/s, send_data latency (call duration and
+end-to-end arrival at the server) and the time NetworkTransmitter needs to
+reconnect after the server drops the connection.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+
+from core.network_handler import NetworkTransmitter
+from tools.partner_server import PartnerServer
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p50_ms': pick(0.50) * 1000,
+        'p95_ms': pick(0.95) * 1000,
+        'p99_ms': pick(0.99) * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def make_record(index):
+    return {
+        'timestamp': time.time(),
+        'sent_at': time.perf_counter(),
+        'sequence': index,
+        'telemetry': {
+            'velocity': 12.5, 'altitude': 1500.0, 'latitude': 52.2549, 'longitude': 20.9004,
+            'pitch': 1.5, 'roll': -0.5, 'yaw': 180.0, 'status': 2, 'rbs': 0
+        },
+        'transmission': {'rssi': -80, 'snr': 7},
+    }
+
+
+def wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def run(records, reconnects, latency):
+    server = PartnerServer(latency=latency, max_records=records).start()
+    host, port = server.address
+    transmitter = NetworkTransmitter(host=host, port=port)
+
+    connected = threading.Event()
+    transmitter.subscribe_on_partner_connected(connected.set)
+    threading.Thread(target=transmitter.connect, daemon=True).start()
+    if not connected.wait(10):
+        raise RuntimeError("NetworkTransmitter did not connect to the partner server")
+
+    # Przepustowość i opóźnienie wywołania send_data
+    call_latencies = []
+    start = time.perf_counter()
+    for index in range(records):
+        before = time.perf_counter()
+        transmitter.send_data(make_record(index))
+        call_latencies.append(time.perf_counter() - before)
+    send_duration = time.perf_counter() - start
+
+    wait_for(lambda: server.received_count >= records, timeout=60)
+    delivery_duration = time.perf_counter() - start
+    end_to_end = [arrival - record['sent_at'] for arrival, record in server.received]
+
+    # Czas ponownego połączenia po zerwaniu przez serwer
+    reconnect_times = []
+    for _ in range(reconnects):
+        connected.clear()
+        dropped_at = time.perf_counter()
+        server.inject_disconnect()
+        if not connected.wait(15):
+            break
+        reconnect_times.append(time.perf_counter() - dropped_at)
+
+    transmitter.shutdown()
+    server.stop()
+
+    return {
+        'records': records,
+        'delivered': server.received_count,
+        'send_records_per_s': records / send_duration,
+        'delivered_records_per_s': server.received_count / delivery_duration,
+        'send_call_latency': percentiles(call_latencies),
+        'end_to_end_latency': percentiles(end_to_end),
+        'reconnect_time': percentiles(reconnect_times),
+        'reconnects': len(reconnect_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--reconnects', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.0, help='server processing delay per record [s]')
+    parser.add_argument('--json', default=None, help='also write the report to this file')
+    args = parser.parse_args()
+
+    report = run(args.records, args.reconnects, args.latency)
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
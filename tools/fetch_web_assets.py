@@ -0,0 +1,54 @@
+"""Downloads the JS/CSS assets of the folium map page into gui/resources/web.
+
+Run once from the repository root on a machine with internet access:
+    python -m tools.fetch_web_assets
+
+The map page then loads Leaflet, jQuery, Bootstrap, Font Awesome and the
+marker plugin from horus://assets/ instead of the CDNs. Files that are
+already present are skipped unless --force is given.
+"""
+import argparse
+import os
+import urllib.request
+
+from core.config import Config
+from gui.web_assets import ASSETS, WEB_ASSET_DIR, local_path
+
+
+def download(url, path, force=False):
+    if os.path.exists(path) and not force:
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    request = urllib.request.Request(url, headers={'User-Agent': Config.TILE_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = response.read()
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def fetch_assets(force=False):
+    """Pobiera brakujące zasoby strony mapy, zwraca liczbę nieudanych plików."""
+    failed = 0
+    for name, (url, relative, extras) in ASSETS.items():
+        for file_url, file_relative in [(url, relative)] + extras:
+            try:
+                fetched = download(file_url, local_path(file_relative), force)
+                print(f"{'fetched' if fetched else 'present':>8}  {file_relative}")
+            except OSError as e:
+                failed += 1
+                print(f"{'FAILED':>8}  {file_relative}: {e}")
+
+    print(f"Assets in {WEB_ASSET_DIR}, {failed} failed")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--force', action='store_true', help='download again even if the file exists')
+    args = parser.parse_args()
+    raise SystemExit(1 if fetch_assets(args.force) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""Local stand-in for the partner machine (HORUS CSS).
+
+Accepts the NetworkTransmitter connection, records every received JSON
+line, sends configurable uplink commands and can inject latency, stalls and
+disconnects. Run from the repository root:
+
+    python -m tools.partner_server --port 65432 --command '{"command": "abort"}' --command-interval 10
+
+and point the configuration dialog at 127.0.0.1:65432.
+"""
+import argparse
+import json
+import logging
+import socket
+import threading
+import time
+from collections import deque
+
+from core.network_handler import LineFramer
+
+
+class PartnerServer:
+    def __init__(self, host='127.0.0.1', port=0, commands=None, command_interval=None,
+                 latency=0.0, stall_every=None, stall_duration=0.0, disconnect_every=None,
+                 record_file=None, max_records=100000):
+        self.logger = logging.getLogger('HORUS_FAS.partner_server')
+        self.commands = list(commands or [])
+        self.command_interval = command_interval
+        self.latency = latency
+        self.stall_every = stall_every
+        self.stall_duration = stall_duration
+        self.disconnect_every = disconnect_every
+        self.record_file = record_file
+
+        self.received = deque(maxlen=max_records)
+        self.received_count = 0
+        self.connections = 0
+        self.connected_event = threading.Event()
+        self.disconnected_event = threading.Event()
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stall_until = 0.0
+        self._stop_event = threading.Event()
+        self._threads = []
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(1)
+        self._server.settimeout(0.2)
+
+    @property
+    def address(self):
+        return self._server.getsockname()
+
+    def start(self):
+        self._spawn(self._accept_loop, "PartnerServer-Accept")
+        if self.commands and self.command_interval:
+            self._spawn(self._command_loop, "PartnerServer-Commands")
+        self.logger.info(f"Partner server listening on {self.address[0]}:{self.address[1]}")
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self.inject_disconnect()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._server.close()
+
+    def send_command(self, command):
+        line = json.dumps(command).encode('utf-8') + b"\n"
+        with self._client_lock:
+            if not self._client:
+                return False
+            try:
+                self._client.sendall(line)
+                return True
+            except OSError as e:
+                self.logger.warning(f"Failed to send uplink command: {e}")
+                return False
+
+    def inject_stall(self, duration):
+        """Stops reading from the client for the given number of seconds."""
+        self._stall_until = time.monotonic() + duration
+
+    def inject_disconnect(self):
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.close()
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _accept_loop(self):
+        record_file = open(self.record_file, 'a', encoding='utf-8') if self.record_file else None
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    client, address = self._server.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                self.logger.info(f"Partner client connected from {address[0]}:{address[1]}")
+                with self._client_lock:
+                    self._client = client
+                self.connections += 1
+                self.disconnected_event.clear()
+                self.connected_event.set()
+                self._serve(client, record_file)
+                self.connected_event.clear()
+                self.disconnected_event.set()
+        finally:
+            if record_file:
+                record_file.close()
+
+    def _serve(self, client, record_file):
+        framer = LineFramer()
+        client.settimeout(0.2)
+        connected_at = time.monotonic()
+        last_stall = connected_at
+
+        while not self._stop_event.is_set() and self._client is client:
+            now = time.monotonic()
+            if self.disconnect_every and now - connected_at >= self.disconnect_every:
+                self.logger.info("Injecting disconnect")
+                self.inject_disconnect()
+                break
+            if self.stall_every and now - last_stall >= self.stall_every:
+                last_stall = now
+                self.inject_stall(self.stall_duration)
+            if now < self._stall_until:
+                time.sleep(min(self._stall_until - now, 0.05))
+                continue
+
+            try:
+                if not framer.receive_from(client):
+                    break
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            for line in framer.frames():
+                if not line.strip():
+                    continue
+                arrival = time.perf_counter()
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Invalid JSON from client: {e}")
+                    continue
+                if self.latency:
+                    time.sleep(self.latency)
+                self.received.append((arrival, record))
+                self.received_count += 1
+                if record_file:
+                    record_file.write(line + "\n")
+
+        if self._client is client:
+            self.inject_disconnect()
+        self.logger.info("Partner client disconnected")
+
+    def _command_loop(self):
+        index = 0
+        while not self._stop_event.wait(self.command_interval):
+            if self.send_command(self.commands[index % len(self.commands)]):
+                index += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=65432)
+    parser.add_argument('--command', action='append', default=[], help='uplink command as JSON, repeatable')
+    parser.add_argument('--command-interval', type=float, default=None, help='seconds between uplink commands')
+    parser.add_argument('--latency', type=float, default=0.0, help='processing delay per record [s]')
+    parser.add_argument('--stall-every', type=float, default=None, help='stop reading every N seconds')
+    parser.add_argument('--stall-duration', type=float, default=1.0, help='length of each stall [s]')
+    parser.add_argument('--disconnect-every', type=float, default=None, help='drop the client every N seconds')
+    parser.add_argument('--record-file', default=None, help='append received JSON lines to this file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)-8s %(name)s - %(message)s')
+    server = PartnerServer(
+        host=args.host,
+        port=args.port,
+        commands=[json.loads(command) for command in args.command],
+        command_interval=args.command_interval,
+        latency=args.latency,
+        stall_every=args.stall_every,
+        stall_duration=args.stall_duration,
+        disconnect_every=args.disconnect_every,
+        record_file=args.record_file,
+    ).start()
+
+    try:
+        while True:
+            time.sleep(5)
+            logging.getLogger('HORUS_FAS.partner_server').info(
+                f"Received {server.received_count} records over {server.connections} connections")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
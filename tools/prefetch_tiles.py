@@ -0,0 +1,80 @@
+"""Fills the offline map tile cache around the launch site.
+
+Run from the repository root before leaving for the launch site:
+    python -m tools.prefetch_tiles --lat 52.2549 --lon 20.9004 --radius-km 10 --zoom 10-17
+
+or with an explicit bounding box (south,west,north,east):
+    python -m tools.prefetch_tiles --bbox 52.1,20.7,52.4,21.1 --zoom 12-16
+
+Tiles already in the cache are skipped. The default rate limit and the
+identifying User-Agent follow the OpenStreetMap tile usage policy - for
+large areas point --url at a tile server that allows bulk downloads.
+
+The JS/CSS assets of the map page (tools.fetch_web_assets) are fetched
+first, so one run prepares the whole map for use without internet;
+--skip-assets leaves them alone.
+"""
+import argparse
+import time
+
+from core.config import Config
+from core.tile_cache import TileCache, bbox_around, tiles_in_bbox
+from tools.fetch_web_assets import fetch_assets
+
+
+def parse_zoom(text):
+    if '-' in text:
+        low, high = text.split('-')
+        return range(int(low), int(high) + 1)
+    return range(int(text), int(text) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lat', type=float, default=52.2549)
+    parser.add_argument('--lon', type=float, default=20.9004)
+    parser.add_argument('--radius-km', type=float, default=5.0)
+    parser.add_argument('--bbox', default=None, help='south,west,north,east - overrides --lat/--lon/--radius-km')
+    parser.add_argument('--zoom', default='10-16', help='zoom level or range, e.g. 10-16')
+    parser.add_argument('--cache-dir', default=None, help='defaults to the HORUS_FAS application data directory')
+    parser.add_argument('--max-mb', type=int, default=Config.TILE_CACHE_MAX_MB)
+    parser.add_argument('--url', default=Config.TILE_URL_TEMPLATE)
+    parser.add_argument('--rate', type=float, default=2.0, help='maximum downloads per second')
+    parser.add_argument('--max-tiles', type=int, default=20000, help='refuse to run above this many tiles')
+    parser.add_argument('--skip-assets', action='store_true', help='do not fetch the map page JS/CSS assets')
+    args = parser.parse_args()
+
+    if args.bbox:
+        south, west, north, east = (float(v) for v in args.bbox.split(','))
+    else:
+        south, west, north, east = bbox_around(args.lat, args.lon, args.radius_km)
+
+    tiles = [tile for zoom in parse_zoom(args.zoom) for tile in tiles_in_bbox(south, west, north, east, zoom)]
+    if len(tiles) > args.max_tiles:
+        parser.error(f"{len(tiles)} tiles requested, above --max-tiles {args.max_tiles}")
+
+    assets_failed = 0 if args.skip_assets else fetch_assets()
+
+    cache = TileCache(args.cache_dir, max_bytes=args.max_mb * 2 ** 20, url_template=args.url)
+    missing = [tile for tile in tiles if tile not in cache]
+    print(f"{len(tiles)} tiles in area, {len(tiles) - len(missing)} cached, {len(missing)} to download")
+
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    failed = 0
+    for number, (z, x, y) in enumerate(missing, 1):
+        started = time.monotonic()
+        try:
+            cache.fetch(z, x, y)
+        except OSError as e:
+            failed += 1
+            print(f"Tile {z}/{x}/{y} failed: {e}")
+        if number % 50 == 0 or number == len(missing):
+            print(f"{number}/{len(missing)} tiles, cache {cache.size_bytes / 2 ** 20:.1f} MB", flush=True)
+        time.sleep(max(interval - (time.monotonic() - started), 0.0))
+
+    print(f"Done: {len(missing) - failed} downloaded, {failed} failed, cache {cache.directory}")
+    raise SystemExit(1 if failed or assets_failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Shows the status of a station running with `python main.py --headless`.
+
+Run from the repository root:
+    python -m tools.station_status
+    python -m tools.station_status --watch 2
+    python -m tools.station_status --json
+
+The headless station rewrites its status file every second. The exit code
+is 0 while the station is running, 1 when it has stopped, and 2 when the
+file is missing or has not been updated for several intervals.
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+from core.utils import Utils
+
+STALE_INTERVALS = 5
+
+
+def load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def describe(status, path):
+    if status is None:
+        return f"No status at {path} - is the headless station running?", 2
+
+    age = time.time() - status['updated']
+    state = status['state']
+    code = 0
+    if state == 'running' and age > STALE_INTERVALS * status.get('interval_s', 1.0):
+        state = f"not responding (last update {age:.0f} s ago)"
+        code = 2
+    elif state != 'running':
+        code = 1
+
+    last_record = status['last_record_age_s']
+    memory = f"{status['rss_mb']} MB" if 'rss_mb' in status else f"{status.get('peak_rss_mb', '?')} MB peak"
+    lines = [
+        f"State:        {state} (pid {status['pid']}, up {status['uptime_s']:.0f} s, "
+        f"updated {datetime.fromtimestamp(status['updated']):%H:%M:%S})",
+        f"Session:      {status['session_dir']}",
+        f"Source:       {status['source'] or 'none'}{' (port open)' if status['serial_open'] else ''}",
+        f"Records:      {status['records']} ({status['records_per_s']}/s, "
+        f"last {'never' if last_record is None else f'{last_record} s ago'})",
+        f"Partner:      {'connected' if status['partner_connected'] else 'disconnected'}, "
+        f"sent {status['sent']}, queued {status['queued']}, outbox {status['outbox_pending']} pending",
+        f"Multicast:    {'on' if status['multicast'] else 'off'}",
+        f"Aborts:       {status['aborts']}",
+        f"Process:      CPU {status['cpu_percent']}% ({status['cpu_seconds']} s total), memory {memory}",
+    ]
+    for topic, metrics in status.get('event_bus', {}).items():
+        for subscriber in metrics['subscribers']:
+            lines.append(f"Bus:          {topic} -> {subscriber['name']}: {metrics['rate_per_s']}/s, "
+                         f"backlog {subscriber['backlog']}, dropped {subscriber['dropped']}, "
+                         f"lag {subscriber['lag_mean_ms']:.1f} ms mean / {subscriber['lag_max_ms']:.1f} ms max")
+    return "\n".join(lines), code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--status-file', default=None, help='defaults to <appdata>/HORUS_FAS/headless_status.json')
+    parser.add_argument('--json', action='store_true', help='print the raw status')
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS', help='refresh every SECONDS')
+    args = parser.parse_args()
+    path = args.status_file or Utils.get_headless_status_path()
+
+    while True:
+        status = load(path)
+        text, code = describe(status, path)
+        if args.json and status is not None:
+            text = json.dumps(status, indent=2)
+        if args.watch:
+            print("\033[2J\033[H", end="")
+        print(text, flush=True)
+        if not args.watch:
+            raise SystemExit(code)
+        try:
+            time.sleep(args.watch)
+        except KeyboardInterrupt:
+            raise SystemExit(code)
+
+
+if __name__ == '__main__':
+    main()